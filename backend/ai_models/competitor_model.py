@@ -1,7 +1,10 @@
+import hashlib
 import json
 import math
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+import numpy as np
 
 # Lightweight competitor analysis model with JSON-configured weights
 # Avoids heavy ML dependencies; suitable for t2.micro
@@ -32,6 +35,11 @@ LOCATION_FACTOR = {
     "Hyderabad": 0.2
 }
 
+# Column order of the batch feature matrix
+FEATURE_NAMES = ("estimated_value_log", "emd_ratio", "category_risk", "location_factor", "deadline_urgency")
+
+THREAT_LEVELS = np.array(["low", "medium", "high"])
+
 DEFAULT_COMPETITORS = [
     {"name": "TechCorp Solutions", "base_win_rate": 0.65, "avg_margin": 0.125},
     {"name": "Global Vendors Ltd", "base_win_rate": 0.55, "avg_margin": 0.15},
@@ -46,9 +54,25 @@ def sigmoid(x: float) -> float:
         return 0.0 if x < 0 else 1.0
 
 
+def _window_days(tender: Dict[str, Any]) -> float:
+    # Same rule as _featureize: whole days between publication and deadline
+    deadline = tender.get("submission_deadline")
+    published = tender.get("published_date")
+    try:
+        if deadline and published:
+            return float((deadline - published).days)
+    except Exception:
+        pass
+    return math.nan
+
+
 class SimpleCompetitorModel:
-    def __init__(self, weights_path: Optional[Path] = None, competitors_path: Optional[Path] = None):
-        self.weights = DEFAULT_WEIGHTS.copy()
+    # Base weights that a weights file or ``weights`` argument is layered over
+    default_weights = DEFAULT_WEIGHTS
+
+    def __init__(self, weights_path: Optional[Path] = None, competitors_path: Optional[Path] = None,
+                 weights: Optional[Dict[str, Any]] = None, competitors: Optional[List[Dict[str, Any]]] = None):
+        self.weights = dict(self.default_weights)
         self.competitors = DEFAULT_COMPETITORS.copy()
         if weights_path and weights_path.exists():
             try:
@@ -60,6 +84,42 @@ class SimpleCompetitorModel:
                 self.competitors = json.loads(competitors_path.read_text())
             except Exception:
                 pass
+        if weights:
+            self.weights.update(weights)
+        if competitors is not None:
+            self.competitors = list(competitors)
+        self._compile()
+
+    def _compile(self) -> None:
+        # Optional per-model lookup tables travel in the weights file
+        self.category_risk = {**CATEGORY_RISK, **(self.weights.pop("category_risk_table", None) or {})}
+        self.location_factor = {**LOCATION_FACTOR, **(self.weights.pop("location_factor_table", None) or {})}
+
+        self._weight_vector = np.array([float(self.weights.get(k, 0.0)) for k in FEATURE_NAMES])
+        self._intercept = float(self.weights.get("intercept", 0.0))
+
+        # name, win rate %, margin %, score multiplier per competitor
+        self._competitor_params = []
+        for comp in self.competitors:
+            win_rate = float(comp.get("base_win_rate", 0.5))
+            margin = float(comp.get("avg_margin", 0.15))
+            # Adjust score: aggressive pricing gets higher threat when base is high
+            pricing_factor = 1.0 - min(max(margin, 0.0), 0.4)  # 0.0..0.4 -> 1.0..0.6
+            self._competitor_params.append((
+                comp.get("name", "Unknown"),
+                round(win_rate * 100, 1),
+                round(margin * 100, 1),
+                (0.5 + 0.5 * win_rate) * (0.7 + 0.3 * pricing_factor),
+            ))
+        self._competitor_factor = np.array([p[3] for p in self._competitor_params])
+
+        config = {
+            "weights": self.weights,
+            "competitors": self.competitors,
+            "category_risk": self.category_risk,
+            "location_factor": self.location_factor,
+        }
+        self.version = hashlib.sha1(json.dumps(config, sort_keys=True, default=str).encode()).hexdigest()[:12]
 
     def _featureize(self, tender: Dict[str, Any]) -> Dict[str, float]:
         est_val = float(tender.get("estimated_value", 0.0))
@@ -83,32 +143,91 @@ class SimpleCompetitorModel:
         features = {
             "estimated_value_log": math.log10(max(est_val, 1.0)),
             "emd_ratio": (emd / est_val) if est_val > 0 else 0.0,
-            "category_risk": CATEGORY_RISK.get(category, 0.4),
-            "location_factor": LOCATION_FACTOR.get(location, 0.15),
+            "category_risk": self.category_risk.get(category, 0.4),
+            "location_factor": self.location_factor.get(location, 0.15),
             "deadline_urgency": urgency,
         }
         return features
 
+    def feature_hash(self, tender: Dict[str, Any]) -> str:
+        # Fingerprint of exactly what the model sees; analyses are reusable while it is unchanged
+        feats = self._featureize(tender)
+        payload = json.dumps([round(feats[k], 9) for k in FEATURE_NAMES])
+        return hashlib.sha1(payload.encode()).hexdigest()[:16]
+
     def _base_score(self, features: Dict[str, float]) -> float:
-        s = self.weights.get("intercept", 0.0)
+        s = self._intercept
         for k, v in features.items():
             s += self.weights.get(k, 0.0) * v
         return sigmoid(s)
 
+    def featurize_batch(self, tenders: Sequence[Dict[str, Any]]) -> np.ndarray:
+        """Feature matrix (N x len(FEATURE_NAMES)) matching _featureize row for row"""
+        n = len(tenders)
+        est_val = np.fromiter((float(t.get("estimated_value", 0.0)) for t in tenders), dtype=np.float64, count=n)
+        emd = np.fromiter((float(t.get("emd_amount", 0.0)) for t in tenders), dtype=np.float64, count=n)
+        category_table = self.category_risk
+        location_table = self.location_factor
+        category_risk = np.fromiter(
+            (category_table.get(t.get("category", "IT Services"), 0.4) for t in tenders), dtype=np.float64, count=n)
+        location_factor = np.fromiter(
+            (location_table.get(t.get("location", "New Delhi"), 0.15) for t in tenders), dtype=np.float64, count=n)
+        window = np.fromiter((_window_days(t) for t in tenders), dtype=np.float64, count=n)
+
+        days_window = 30.0
+        urgency = np.clip((days_window - np.maximum(window, 1.0)) / days_window, 0.0, 1.0)
+        urgency[np.isnan(window)] = 0.5
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            emd_ratio = np.where(est_val > 0, emd / est_val, 0.0)
+
+        return np.column_stack([
+            np.log10(np.maximum(est_val, 1.0)),
+            emd_ratio,
+            category_risk,
+            location_factor,
+            urgency,
+        ])
+
+    def score_batch(self, features: np.ndarray) -> np.ndarray:
+        """Threat matrix (N x competitors) for a feature matrix from featurize_batch"""
+        with np.errstate(over="ignore"):
+            base = 1.0 / (1.0 + np.exp(-(features @ self._weight_vector + self._intercept)))
+        return np.clip(np.outer(base, self._competitor_factor), 0.0, 1.0)
+
+    def predict_batch(self, tenders: Sequence[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """predict() for many tenders, scored in one vectorized pass"""
+        if not tenders:
+            return []
+        scores = self.score_batch(self.featurize_batch(tenders))
+        threats = THREAT_LEVELS[(scores >= 0.4).astype(np.intp) + (scores >= 0.66)]
+        rounded = np.round(scores, 3)
+
+        return [
+            [
+                {"name": name, "win_rate": win_rate, "avg_margin": avg_margin,
+                 "threat": threat, "threat_score": score}
+                for (name, win_rate, avg_margin, _), threat, score in zip(self._competitor_params, row_threats, row_scores)
+            ]
+            for row_threats, row_scores in zip(threats.tolist(), rounded.tolist())
+        ]
+
+    def rank_batch(self, tenders: Sequence[Dict[str, Any]],
+                   limit: int) -> List[Tuple[int, float, List[Dict[str, Any]]]]:
+        """(index, highest threat score, predict() output) for the ``limit`` most threatened tenders"""
+        if not tenders or limit <= 0:
+            return []
+        top_scores = self.score_batch(self.featurize_batch(tenders)).max(axis=1)
+        order = np.argsort(-top_scores, kind="stable")[:limit].tolist()
+        return list(zip(order, top_scores[order].tolist(), self.predict_batch([tenders[i] for i in order])))
+
     def predict(self, tender: Dict[str, Any]) -> List[Dict[str, Any]]:
         feats = self._featureize(tender)
         base = self._base_score(feats)
 
         out: List[Dict[str, Any]] = []
-        for comp in self.competitors:
-            name = comp.get("name", "Unknown")
-            win_rate = float(comp.get("base_win_rate", 0.5))
-            margin = float(comp.get("avg_margin", 0.15))
-
-            # Adjust score: aggressive pricing gets higher threat when base is high
-            pricing_factor = 1.0 - min(max(margin, 0.0), 0.4)  # 0.0..0.4 -> 1.0..0.6
-            score = base * (0.5 + 0.5 * win_rate) * (0.7 + 0.3 * pricing_factor)
-            score = max(0.0, min(1.0, score))
+        for name, win_rate, avg_margin, factor in self._competitor_params:
+            score = max(0.0, min(1.0, base * factor))
 
             if score >= 0.66:
                 threat = "high"
@@ -119,8 +238,8 @@ class SimpleCompetitorModel:
 
             out.append({
                 "name": name,
-                "win_rate": round(win_rate*100, 1),
-                "avg_margin": round(margin*100, 1),
+                "win_rate": win_rate,
+                "avg_margin": avg_margin,
                 "threat": threat,
                 "threat_score": round(score, 3)
             })
@@ -0,0 +1,110 @@
+"""Model Registry - Load-once, hot-reloaded holder for JSON-configured models"""
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Type
+
+from ai_models.competitor_model import SimpleCompetitorModel
+
+logger = logging.getLogger(__name__)
+
+
+class CompetitorModelRegistry:
+    """Process-wide holder for a JSON-configured model
+
+    Serves the competitor model, or the win model via ``model_cls``. The
+    configs are read and compiled once, then re-read only when their mtime
+    changes (checked at most every ``check_interval`` seconds). A reload
+    builds a complete new model and swaps the reference, so requests never
+    see a half-loaded model; a broken file keeps the previous model in
+    service.
+    """
+
+    def __init__(self, weights_path: Optional[Path] = None, competitors_path: Optional[Path] = None,
+                 check_interval: float = 5.0, model_cls: Type[SimpleCompetitorModel] = SimpleCompetitorModel):
+        self.model_cls = model_cls
+        self.weights_path = Path(weights_path) if weights_path else None
+        self.competitors_path = Path(competitors_path) if competitors_path else None
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._model: Optional[SimpleCompetitorModel] = None
+        self._mtimes: Dict[str, Optional[float]] = {}
+        self._next_check = 0.0
+        self.loaded_at: Optional[float] = None
+        self.reloads = 0
+        self.reload_errors = 0
+
+    def _current_mtimes(self) -> Dict[str, Optional[float]]:
+        mtimes = {}
+        for path in (self.weights_path, self.competitors_path):
+            if path is not None:
+                try:
+                    mtimes[str(path)] = os.stat(path).st_mtime
+                except FileNotFoundError:
+                    mtimes[str(path)] = None
+        return mtimes
+
+    @staticmethod
+    def _read_json(path: Optional[Path]) -> Any:
+        if path is None or not path.exists():
+            return None
+        return json.loads(path.read_text())
+
+    def _load(self, mtimes: Dict[str, Optional[float]]) -> None:
+        try:
+            model = self.model_cls(
+                weights=self._read_json(self.weights_path),
+                competitors=self._read_json(self.competitors_path),
+            )
+        except Exception as e:
+            self.reload_errors += 1
+            if self._model is None:
+                logger.error(f"{self.model_cls.__name__} config unreadable, using built-in defaults: {e}")
+                self._model = self.model_cls()
+                self.loaded_at = time.time()
+            else:
+                logger.error(f"{self.model_cls.__name__} reload failed, keeping version {self._model.version}: {e}")
+        else:
+            previous = self._model.version if self._model else None
+            self._model = model
+            self.loaded_at = time.time()
+            if previous is not None:
+                self.reloads += 1
+                logger.info(f"{self.model_cls.__name__} reloaded: {previous} -> {model.version}")
+        # Remember the mtimes either way so a broken file isn't re-parsed on every call
+        self._mtimes = mtimes
+
+    def get(self) -> SimpleCompetitorModel:
+        """Current model, reloading first if a config file changed"""
+        now = time.monotonic()
+        if self._model is not None and now < self._next_check:
+            return self._model
+        with self._lock:
+            if self._model is None or now >= self._next_check:
+                self._next_check = now + self.check_interval
+                mtimes = self._current_mtimes()
+                if self._model is None or mtimes != self._mtimes:
+                    self._load(mtimes)
+            return self._model
+
+    def reload(self) -> SimpleCompetitorModel:
+        """Reload the configs now, regardless of mtimes"""
+        with self._lock:
+            self._next_check = time.monotonic() + self.check_interval
+            self._load(self._current_mtimes())
+            return self._model
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the loaded version and reload counters"""
+        model = self._model
+        return {
+            "version": model.version if model else None,
+            "weights_path": str(self.weights_path) if self.weights_path else None,
+            "competitors_path": str(self.competitors_path) if self.competitors_path else None,
+            "loaded_at": self.loaded_at,
+            "reloads": self.reloads,
+            "reload_errors": self.reload_errors,
+        }
@@ -0,0 +1,234 @@
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+
+from ai_models.competitor_model import FEATURE_NAMES, SimpleCompetitorModel, sigmoid
+
+# Win-probability model: logistic regression over the competitor model's
+# features, with weights fitted offline by train_win_model.py. The weights file
+# has the same shape as competitor_weights.json (intercept plus one weight per
+# feature, optional lookup tables), so the same loader and registry serve it.
+
+# Used until a trained weights file is deployed: a cautious prior of roughly 30-50%
+DEFAULT_WIN_WEIGHTS = {
+    "intercept": 0.6,
+    "estimated_value_log": -0.1,
+    "emd_ratio": -2.0,
+    "category_risk": -0.6,
+    "location_factor": 0.5,
+    "deadline_urgency": -0.3,
+}
+
+# Typical feature values; factor explanations are contributions relative to these
+DEFAULT_FEATURE_MEANS = {
+    "estimated_value_log": 6.5,
+    "emd_ratio": 0.02,
+    "category_risk": 0.5,
+    "location_factor": 0.18,
+    "deadline_urgency": 0.4,
+}
+
+# Factor labels shown on the tender page, one per feature
+FACTOR_LABELS = {
+    "estimated_value_log": "tender_value",
+    "emd_ratio": "emd_burden",
+    "category_risk": "category_competition",
+    "location_factor": "location_fit",
+    "deadline_urgency": "deadline_pressure",
+}
+
+
+def _impact(contribution: float) -> str:
+    if contribution >= 0.25:
+        return "Strong positive"
+    if contribution >= 0.05:
+        return "Positive"
+    if contribution <= -0.25:
+        return "Strong negative"
+    if contribution <= -0.05:
+        return "Negative"
+    return "Neutral"
+
+
+class WinProbabilityModel(SimpleCompetitorModel):
+    default_weights = DEFAULT_WIN_WEIGHTS
+
+    def _compile(self) -> None:
+        self.feature_means = {**DEFAULT_FEATURE_MEANS, **(self.weights.pop("feature_means", None) or {})}
+        super()._compile()
+        # Plain tuples for the single-tender path; a dot product over five
+        # Python floats is faster than any NumPy call at this size
+        self._weights_tuple = tuple(float(self.weights.get(k, 0.0)) for k in FEATURE_NAMES)
+        self._means_tuple = tuple(float(self.feature_means.get(k, 0.0)) for k in FEATURE_NAMES)
+        self.version = f"win-{self.version}"
+
+    def _logit(self, features: Dict[str, float]) -> float:
+        s = self._intercept
+        for name, weight in zip(FEATURE_NAMES, self._weights_tuple):
+            s += weight * features[name]
+        return s
+
+    def predict_proba(self, tender: Dict[str, Any]) -> float:
+        """Win probability (0..1) for one tender"""
+        return sigmoid(self._logit(self._featureize(tender)))
+
+    def score_proba(self, features: np.ndarray) -> np.ndarray:
+        """Win probabilities for a feature matrix from featurize_batch"""
+        with np.errstate(over="ignore"):
+            return 1.0 / (1.0 + np.exp(-(features @ self._weight_vector + self._intercept)))
+
+    def predict_proba_batch(self, tenders: Sequence[Dict[str, Any]]) -> np.ndarray:
+        """Win probabilities for many tenders in one vectorized pass"""
+        if not tenders:
+            return np.empty(0)
+        return self.score_proba(self.featurize_batch(tenders))
+
+    def explain(self, tender: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Probability plus per-feature impact for one tender
+
+        Each factor is the feature's contribution to the log-odds relative to
+        a typical tender, bucketed into a display label.
+
+        Args:
+            tender: Tender with dates as datetimes
+
+        Returns:
+            Dictionary with probability and factors
+        """
+        features = self._featureize(tender)
+        s = self._logit(features)
+        factors = {
+            FACTOR_LABELS[name]: _impact(weight * (features[name] - mean))
+            for name, weight, mean in zip(FEATURE_NAMES, self._weights_tuple, self._means_tuple)
+        }
+        return {"probability": sigmoid(s), "factors": factors}
+
+
+def fit_logistic_regression(features: np.ndarray, labels: np.ndarray, l2: float = 1.0,
+                            max_iter: int = 50, tol: float = 1e-8) -> Dict[str, Any]:
+    """
+    Fit L2-regularized logistic regression with Newton's method (IRLS)
+
+    Features are standardized for the fit and the coefficients mapped back to
+    raw feature units, so the result plugs straight into the weights file.
+    The intercept is not penalized; constant columns get a zero weight.
+
+    Args:
+        features: N x len(FEATURE_NAMES) matrix from featurize_batch
+        labels: N outcomes, 1 = won
+        l2: Ridge penalty on the standardized coefficients
+        max_iter: Newton iterations at most
+        tol: Stop when the largest coefficient step is below this
+
+    Returns:
+        Dictionary with weights (intercept plus one key per feature),
+        feature_means, iterations and converged
+    """
+    x = np.asarray(features, dtype=np.float64)
+    y = np.asarray(labels, dtype=np.float64)
+    n, k = x.shape
+    mean = x.mean(axis=0)
+    std = x.std(axis=0)
+    varying = std > 1e-12
+    z = np.zeros_like(x)
+    z[:, varying] = (x[:, varying] - mean[varying]) / std[varying]
+    design = np.column_stack([np.ones(n), z])
+
+    penalty = np.full(k + 1, l2)
+    penalty[0] = 0.0
+    penalty[1:][~varying] = 1e6  # pin constant columns at zero
+    beta = np.zeros(k + 1)
+    prevalence = min(max(y.mean(), 1e-6), 1 - 1e-6)
+    beta[0] = np.log(prevalence / (1 - prevalence))
+
+    converged = False
+    iterations = 0
+    for iterations in range(1, max_iter + 1):
+        p = 1.0 / (1.0 + np.exp(-(design @ beta)))
+        w = p * (1.0 - p)
+        gradient = design.T @ (p - y) + penalty * beta
+        hessian = (design * w[:, None]).T @ design + np.diag(penalty)
+        step = np.linalg.solve(hessian, gradient)
+        beta -= step
+        if np.max(np.abs(step)) < tol:
+            converged = True
+            break
+
+    coef = np.zeros(k)
+    coef[varying] = beta[1:][varying] / std[varying]
+    intercept = beta[0] - float(coef @ mean)
+    return {
+        "weights": {"intercept": round(float(intercept), 6),
+                    **{name: round(float(c), 6) for name, c in zip(FEATURE_NAMES, coef)}},
+        "feature_means": {name: round(float(m), 6) for name, m in zip(FEATURE_NAMES, mean)},
+        "iterations": iterations,
+        "converged": converged,
+    }
+
+
+def _auc(probabilities: np.ndarray, labels: np.ndarray) -> Optional[float]:
+    # Mann-Whitney U with average ranks for ties
+    positives = int(labels.sum())
+    negatives = len(labels) - positives
+    if positives == 0 or negatives == 0:
+        return None
+    order = np.argsort(probabilities, kind="mergesort")
+    ranks = np.empty(len(labels))
+    sorted_p = probabilities[order]
+    start = 0
+    while start < len(sorted_p):
+        end = start
+        while end + 1 < len(sorted_p) and sorted_p[end + 1] == sorted_p[start]:
+            end += 1
+        ranks[order[start:end + 1]] = (start + end) / 2.0 + 1.0
+        start = end + 1
+    return float((ranks[labels == 1].sum() - positives * (positives + 1) / 2.0) / (positives * negatives))
+
+
+def calibration_report(probabilities: np.ndarray, labels: np.ndarray, bins: int = 10) -> Dict[str, Any]:
+    """
+    Discrimination and calibration metrics for predicted win probabilities
+
+    Args:
+        probabilities: Predicted probabilities
+        labels: Observed outcomes, 1 = won
+        bins: Equal-width probability bins for the reliability table
+
+    Returns:
+        Dictionary with samples, win_rate, log_loss, baseline_log_loss (always
+        predicting the win rate), brier, auc, ece and the per-bin table
+    """
+    p = np.clip(np.asarray(probabilities, dtype=np.float64), 1e-12, 1 - 1e-12)
+    y = np.asarray(labels, dtype=np.float64)
+    n = len(y)
+    if n == 0:
+        return {"samples": 0}
+    rate = min(max(y.mean(), 1e-12), 1 - 1e-12)
+
+    edges = np.linspace(0.0, 1.0, bins + 1)
+    index = np.clip(np.digitize(p, edges[1:-1]), 0, bins - 1)
+    table = []
+    ece = 0.0
+    for b in range(bins):
+        mask = index == b
+        count = int(mask.sum())
+        if not count:
+            continue
+        predicted = float(p[mask].mean())
+        observed = float(y[mask].mean())
+        ece += count / n * abs(predicted - observed)
+        table.append({"bin": f"{edges[b]:.1f}-{edges[b + 1]:.1f}", "count": count,
+                      "predicted": round(predicted, 4), "observed": round(observed, 4)})
+
+    auc = _auc(p, y)
+    return {
+        "samples": n,
+        "win_rate": round(float(y.mean()), 4),
+        "log_loss": round(float(-np.mean(y * np.log(p) + (1 - y) * np.log(1 - p))), 4),
+        "baseline_log_loss": round(float(-(rate * np.log(rate) + (1 - rate) * np.log(1 - rate))), 4),
+        "brier": round(float(np.mean((p - y) ** 2)), 4),
+        "auc": None if auc is None else round(auc, 4),
+        "ece": round(ece, 4),
+        "calibration": table,
+    }
@@ -0,0 +1,107 @@
+"""Analysis Cache - Memoized competitor analyses keyed by feature fingerprint"""
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from cachetools import LRUCache
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+
+class CompetitorAnalysisCache:
+    """LRU of competitor analyses in front of the ``competitor_analyses`` collection
+
+    An analysis is fully determined by the tender, the model's input features
+    and the model version, so it is stored once per
+    (tender_id, feature_hash, model_version). Repeat requests are answered
+    from memory or, after a restart or on another process, from Mongo; a new
+    document is written only when the tender's features or the model change.
+    """
+
+    def __init__(self, db, maxsize: int = 5000):
+        self.collection = db.competitor_analyses
+        self.maxsize = maxsize
+        self._cache: LRUCache = LRUCache(maxsize=maxsize)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.store_hits = 0
+        self.misses = 0
+        self.writes = 0
+
+    @staticmethod
+    def _key(tender_id: str, feature_hash: str, model_version: str) -> Tuple[str, str, str]:
+        return tender_id, feature_hash, model_version
+
+    async def get(self, tender_id: str, feature_hash: str, model_version: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a stored analysis
+
+        Args:
+            tender_id: Tender identifier
+            feature_hash: SimpleCompetitorModel.feature_hash of the tender
+            model_version: Version of the model that would score it
+
+        Returns:
+            Analysis document or None on miss
+        """
+        key = self._key(tender_id, feature_hash, model_version)
+        with self._lock:
+            doc = self._cache.get(key)
+        if doc is not None:
+            self.hits += 1
+            return doc
+
+        doc = await self.collection.find_one(
+            {"tender_id": tender_id, "feature_hash": feature_hash, "model_version": model_version},
+            {"_id": 0},
+        )
+        if doc is None:
+            self.misses += 1
+            return None
+        self.store_hits += 1
+        with self._lock:
+            self._cache[key] = doc
+        return doc
+
+    async def put(self, doc: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Store an analysis unless an identical one already exists
+
+        Args:
+            doc: Analysis document with tender_id, feature_hash and model_version
+
+        Returns:
+            The stored document (the existing one if another request won the race)
+        """
+        query = {"tender_id": doc["tender_id"], "feature_hash": doc["feature_hash"],
+                 "model_version": doc["model_version"]}
+        try:
+            stored = await self.collection.find_one_and_update(
+                query,
+                {"$setOnInsert": doc},
+                upsert=True,
+                projection={"_id": 0},
+                return_document=ReturnDocument.AFTER,
+            )
+        except DuplicateKeyError:
+            stored = await self.collection.find_one(query, {"_id": 0})
+        stored = stored or doc
+        if stored.get("id") == doc.get("id"):
+            self.writes += 1
+        with self._lock:
+            self._cache[self._key(doc["tender_id"], doc["feature_hash"], doc["model_version"])] = stored
+        return stored
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache counters"""
+        with self._lock:
+            size = len(self._cache)
+        lookups = self.hits + self.store_hits + self.misses
+        return {
+            "size": size,
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "store_hits": self.store_hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "hit_ratio": round((self.hits + self.store_hits) / lookups, 3) if lookups else None,
+        }
@@ -0,0 +1,128 @@
+"""Auth Cache - In-process user cache for authenticated requests"""
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from cachetools import TTLCache
+
+
+class UserCache:
+    """TTL/LRU cache of user documents keyed by user id
+
+    Every authenticated route resolves the bearer token to a user. Caching the
+    user document for a short TTL saves the Mongo round trip on repeat
+    requests; entries are dropped explicitly whenever a user's role, KYC or
+    activation status changes.
+
+    Revocations (the time of a user's last privilege change) are kept for
+    ``revocation_ttl`` seconds, the access token lifetime: any token issued
+    before an older revocation has expired anyway. Changes made by other
+    worker processes arrive through revoke() from the server's periodic
+    ``auth_changed_at`` sync.
+    """
+
+    def __init__(self, maxsize: int = 10000, ttl: float = 60.0, revocation_ttl: float = 30 * 24 * 3600.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.revocation_ttl = revocation_ttl
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        # user_id -> epoch seconds of the last privilege change, used to
+        # reject signed claims that were issued before it
+        self._revoked_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached user document
+
+        Args:
+            user_id: User identifier (JWT ``sub``)
+
+        Returns:
+            Cached user document or None on miss
+        """
+        with self._lock:
+            user_doc = self._cache.get(user_id)
+            if user_doc is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return user_doc
+
+    def set(self, user_id: str, user_doc: Dict[str, Any]) -> None:
+        """Store a user document"""
+        with self._lock:
+            self._cache[user_id] = user_doc
+
+    def invalidate(self, user_id: str) -> None:
+        """
+        Drop a user from the cache and revoke previously issued claims
+
+        Args:
+            user_id: User identifier
+        """
+        self.revoke(user_id, time.time())
+        with self._lock:
+            self.invalidations += 1
+
+    def revoke(self, user_id: str, changed_at: float) -> None:
+        """
+        Record a privilege change, e.g. one made on another worker
+
+        Args:
+            user_id: User identifier
+            changed_at: Epoch seconds of the change; claims issued earlier are rejected
+        """
+        with self._lock:
+            self._cache.pop(user_id, None)
+            self._revoked_at[user_id] = max(changed_at, self._revoked_at.get(user_id, 0.0))
+            self._prune_revocations()
+
+    def _prune_revocations(self) -> None:
+        # Caller holds the lock
+        cutoff = time.time() - self.revocation_ttl
+        expired = [user_id for user_id, revoked_at in self._revoked_at.items() if revoked_at < cutoff]
+        for user_id in expired:
+            del self._revoked_at[user_id]
+
+    def claims_valid(self, user_id: str, issued_at: Optional[float]) -> bool:
+        """
+        Check whether signed claims may still be trusted
+
+        Args:
+            user_id: User identifier
+            issued_at: Token ``iat`` claim (epoch seconds)
+
+        Returns:
+            False if the user was invalidated after the token was issued
+        """
+        revoked_at = self._revoked_at.get(user_id)
+        if revoked_at is None:
+            return True
+        if issued_at is None:
+            return False
+        return float(issued_at) > revoked_at
+
+    def clear(self) -> None:
+        """Drop every cached entry"""
+        with self._lock:
+            self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._cache),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "invalidations": self.invalidations,
+                "revocations": len(self._revoked_at),
+                "saved_db_round_trips": self.hits,
+            }
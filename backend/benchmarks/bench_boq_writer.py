@@ -0,0 +1,112 @@
+"""Benchmark - BOQ spreadsheet rendering, write-only streaming vs in-memory workbook
+
+Renders synthetic BOQs with DocumentGenerator.render_boq (write-only sheet,
+named styles, formula totals) and with the previous approach (a regular
+in-memory Workbook with per-cell Font/number_format objects and totals
+computed in Python), reporting rows/second and the peak RSS growth of the
+render. Each run happens in a fresh process so peaks don't carry over.
+
+Usage:
+    cd backend && python benchmarks/bench_boq_writer.py [--sizes 1000 10000 100000]
+"""
+import argparse
+import io
+import multiprocessing
+import resource
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+TENDER = {"tender_id": "GEM/2025/B/1234567", "title": "Construction of district hospital block",
+          "organization": "Public Works Department"}
+
+
+def make_items(n):
+    return [
+        {"description": f"Item {i}: RCC M25 grade concrete work incl. shuttering", "unit": "Cum",
+         "quantity": (i % 97) + 1, "rate": 4250.0 + (i % 13) * 10}
+        for i in range(n)
+    ]
+
+
+def render_in_memory(tender_data, items):
+    # The per-cell approach render_boq used before the write-only writer
+    import openpyxl
+    from openpyxl.styles import Alignment, Font, PatternFill
+
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "BOQ"
+    ws['A1'] = f"Bill of Quantities - {tender_data.get('tender_id', 'BOQ')}"
+    ws['A1'].font = Font(bold=True, size=14)
+    ws.merge_cells('A1:F1')
+    header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+    for col, header in enumerate(['S.No', 'Description', 'Unit', 'Quantity', 'Rate (₹)', 'Amount (₹)'], start=1):
+        cell = ws.cell(row=6, column=col, value=header)
+        cell.fill = header_fill
+        cell.font = Font(color="FFFFFF", bold=True, size=12)
+        cell.alignment = Alignment(horizontal='center', vertical='center')
+    row = 7
+    total = 0
+    for idx, item in enumerate(items, start=1):
+        ws.cell(row=row, column=1, value=idx)
+        ws.cell(row=row, column=2, value=item['description'])
+        ws.cell(row=row, column=3, value=item['unit'])
+        ws.cell(row=row, column=4, value=item['quantity'])
+        ws.cell(row=row, column=5, value=item['rate'])
+        amount = item['quantity'] * item['rate']
+        ws.cell(row=row, column=6, value=amount).number_format = '₹#,##0.00'
+        total += amount
+        row += 1
+    for label, value in (("Total:", total), ("GST @ 18%:", total * 0.18), ("Grand Total:", total * 1.18)):
+        ws.cell(row=row, column=5, value=label).font = Font(bold=True)
+        cell = ws.cell(row=row, column=6, value=value)
+        cell.font = Font(bold=True)
+        cell.number_format = '₹#,##0.00'
+        row += 1
+    buffer = io.BytesIO()
+    wb.save(buffer)
+    return buffer.getvalue()
+
+
+def run(mode, n, results):
+    from document_generator import DocumentGenerator
+
+    items = make_items(n)
+    before_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    if mode == "streaming":
+        content = DocumentGenerator().render_boq(TENDER, items)["content"]
+    else:
+        content = render_in_memory(TENDER, items)
+    elapsed = time.perf_counter() - start
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    results.put((elapsed, (peak_kb - before_kb) / 1024, len(content) / 1024 / 1024))
+
+
+def measure(mode, n):
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue()
+    process = ctx.Process(target=run, args=(mode, n, results))
+    process.start()
+    result = results.get()
+    process.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", nargs="*", type=int, default=[1_000, 10_000, 100_000])
+    args = parser.parse_args()
+
+    print(f"{'items':>8} {'mode':>10} {'seconds':>8} {'rows/s':>9} {'peak RSS +':>11} {'file':>8}")
+    for n in args.sizes:
+        for mode in ("in-memory", "streaming"):
+            elapsed, rss_mb, size_mb = measure(mode, n)
+            print(f"{n:>8} {mode:>10} {elapsed:>8.2f} {n / elapsed:>9,.0f} {rss_mb:>9.1f}MB {size_mb:>6.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Benchmark - Competitor model scoring, per-tender loop vs vectorized batch
+
+Scores synthetic tenders with SimpleCompetitorModel.predict in a loop and
+with predict_batch (plus the raw featurize_batch/score_batch arrays), and
+checks that both paths agree. predict_batch still builds one dict per
+competitor per tender, so the "arrays" column is the ceiling for callers
+that can consume the threat matrix directly.
+
+Usage:
+    cd backend && python benchmarks/bench_competitor_batch.py [--sizes 10000 100000]
+"""
+import argparse
+import gc
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from ai_models.competitor_model import CATEGORY_RISK, LOCATION_FACTOR, SimpleCompetitorModel  # noqa: E402
+
+CATEGORIES = list(CATEGORY_RISK) + ["General"]
+LOCATIONS = list(LOCATION_FACTOR) + ["Pune", "Jaipur"]
+
+
+def make_tenders(n, seed=7):
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    tenders = []
+    for _ in range(n):
+        value = rng.uniform(1e5, 5e8)
+        published = now - timedelta(days=rng.randint(0, 30))
+        tenders.append({
+            "estimated_value": value,
+            "emd_amount": value * rng.uniform(0.005, 0.03),
+            "category": rng.choice(CATEGORIES),
+            "location": rng.choice(LOCATIONS),
+            "published_date": published,
+            "submission_deadline": published + timedelta(days=rng.randint(1, 60)),
+        })
+    return tenders
+
+
+def timed(func, *args):
+    gc.collect()
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", nargs="*", type=int, default=[10_000, 100_000])
+    args = parser.parse_args()
+
+    model = SimpleCompetitorModel()
+    print(f"{'tenders':>8} {'loop':>9} {'batch':>9} {'arrays':>9} {'batch x':>8} {'arrays x':>9} {'arrays/s':>12}")
+    for n in args.sizes:
+        tenders = make_tenders(n)
+
+        looped, loop_s = timed(lambda: [model.predict(t) for t in tenders])
+        batched, batch_s = timed(model.predict_batch, tenders)
+        _, arrays_s = timed(lambda: model.score_batch(model.featurize_batch(tenders)))
+
+        for a, b in zip(looped, batched):
+            assert [c["threat"] for c in a] == [c["threat"] for c in b]
+            assert all(abs(x["threat_score"] - y["threat_score"]) <= 1e-3 for x, y in zip(a, b))
+
+        print(f"{n:>8} {loop_s:>8.3f}s {batch_s:>8.3f}s {arrays_s:>8.3f}s "
+              f"{loop_s / batch_s:>7.1f}x {loop_s / arrays_s:>8.1f}x {n / arrays_s:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
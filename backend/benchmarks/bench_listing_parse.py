@@ -0,0 +1,76 @@
+"""Benchmark - GeM bid listing parsing, cards per second
+
+Parses saved listing pages with the previous approach (BeautifulSoup
+html.parser plus a card.find per field) and with the single-pass lxml
+parser in gem_fetch.
+
+Usage:
+    cd backend && python benchmarks/bench_listing_parse.py [page.html ...] [--rounds 50]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+from gem_fetch import parse_listing_html  # noqa: E402
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+
+def legacy_parse(page_html):
+    """Field extraction as done by the original parse_tender_card"""
+    soup = BeautifulSoup(page_html, 'html.parser')
+    out = []
+    for card in soup.find_all('div', class_='bid-card'):
+        eligibility_div = card.find('div', class_='eligibility')
+        out.append({
+            'tender_id': card.find('span', class_='bid-number').text.strip(),
+            'title': card.find('h3', class_='bid-title').text.strip(),
+            'organization': card.find('span', class_='organization').text.strip(),
+            'published_date': card.find('span', class_='published-date').text.strip(),
+            'submission_deadline': card.find('span', class_='closing-date').text.strip(),
+            'estimated_value': card.find('span', class_='estimated-value').text.strip(),
+            'emd_amount': card.find('span', class_='emd-amount').text.strip(),
+            'description': card.find('p', class_='description').text.strip() if card.find('p', class_='description') else "",
+            'location': card.find('span', class_='location').text.strip() if card.find('span', class_='location') else "India",
+            'eligibility_criteria': [li.text.strip() for li in eligibility_div.find_all('li')] if eligibility_div else [],
+            'document_url': card.find('a', class_='download-doc')['href'] if card.find('a', class_='download-doc') else None,
+        })
+    return out
+
+
+def bench(label, func, pages, rounds):
+    cards = 0
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for page in pages:
+            cards += len(func(page))
+    elapsed = time.perf_counter() - start
+    rate = cards / elapsed
+    print(f"{label:30} {cards:7d} cards  {elapsed:7.3f}s  {rate:10.0f} cards/s")
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("pages", nargs="*", type=Path, help="saved listing pages (default: fixtures/*.html)")
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    paths = args.pages or sorted(FIXTURES.glob("*.html"))
+    pages = [p.read_text(encoding="utf-8") for p in paths]
+    print(f"{len(pages)} page(s): {', '.join(p.name for p in paths)}")
+
+    assert [c['tender_id'] for c in legacy_parse(pages[0])] == [c['tender_id'] for c in parse_listing_html(pages[0])]
+
+    slow = bench("bs4 html.parser + find", legacy_parse, pages, args.rounds)
+    fast = bench("lxml single pass", parse_listing_html, pages, args.rounds)
+    print(f"{'speedup':30} {fast / slow:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
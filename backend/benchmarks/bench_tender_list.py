@@ -0,0 +1,75 @@
+"""Benchmark - Tender list page serialization, before vs after
+
+Compares the old GET /api/tenders response path (full documents validated
+against List[Tender], jsonable_encoder, stdlib json) with the fast path
+(list-view projection encoded directly by fast_json).
+
+Usage:
+    cd backend && python benchmarks/bench_tender_list.py [--pages 200]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+# server.py reads these at import time; no connection is opened
+os.environ.setdefault('MONGO_URL', 'mongodb://localhost:27017')
+os.environ.setdefault('DB_NAME', 'hexabid_bench')
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+
+from fast_json import dumps  # noqa: E402
+from server import TENDER_LIST_PROJECTION, Tender, generate_mock_tenders  # noqa: E402
+
+
+def make_page(size):
+    docs = []
+    while len(docs) < size:
+        docs.extend(generate_mock_tenders())
+    return docs[:size]
+
+
+def project(doc):
+    return {k: doc[k] for k in TENDER_LIST_PROJECTION if k != "_id" and k in doc}
+
+
+def bench(label, func, pages):
+    func()  # warm up
+    start = time.perf_counter()
+    for _ in range(pages):
+        func()
+    per_page_ms = (time.perf_counter() - start) / pages * 1000
+    print(f"{label:35} {per_page_ms:8.3f} ms/page")
+    return per_page_ms
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=200)
+    args = parser.parse_args()
+
+    adapter = TypeAdapter(List[Tender])
+    for size in (20, 100, 500):
+        full_docs = make_page(size)
+        list_docs = [project(d) for d in full_docs]
+        print(f"\n--- page size {size} ---")
+
+        def before():
+            validated = adapter.validate_python(full_docs)
+            return json.dumps(jsonable_encoder(validated)).encode("utf-8")
+
+        def after():
+            return dumps(list_docs)
+
+        slow = bench("validate + jsonable_encoder + json", before, args.pages)
+        fast = bench("projection + fast_json", after, args.pages)
+        print(f"{'speedup':35} {slow / fast:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Benchmark - Win model training, calibration and inference latency
+
+Draws outcomes for synthetic tenders from a known logistic model, trains on
+them with train_win_model.train, and reports how well the true weights are
+recovered, the holdout calibration, and scoring latency per tender for the
+single-tender (predict_proba) and vectorized (predict_proba_batch) paths.
+
+Usage:
+    cd backend && python benchmarks/bench_win_model.py [--samples 20000] [--latency-tenders 100000]
+"""
+import argparse
+import math
+import random
+import sys
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from ai_models.competitor_model import FEATURE_NAMES  # noqa: E402
+from ai_models.win_model import WinProbabilityModel  # noqa: E402
+from bench_competitor_batch import make_tenders, timed  # noqa: E402
+from train_win_model import train  # noqa: E402
+
+TRUE_WEIGHTS = {
+    "intercept": 3.5,
+    "estimated_value_log": -0.35,
+    "emd_ratio": -30.0,
+    "category_risk": -1.5,
+    "location_factor": 4.0,
+    "deadline_urgency": -0.8,
+}
+
+
+def make_samples(n, seed=11):
+    rng = random.Random(seed)
+    truth = WinProbabilityModel(weights=TRUE_WEIGHTS)
+    tenders = make_tenders(n, seed=seed)
+    probabilities = truth.predict_proba_batch(tenders).tolist()
+    samples = []
+    for tender, p in zip(tenders, probabilities):
+        tender["id"] = str(uuid.UUID(int=rng.getrandbits(128)))
+        samples.append((tender, int(rng.random() < p)))
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--samples", type=int, default=20_000)
+    parser.add_argument("--latency-tenders", type=int, default=100_000)
+    args = parser.parse_args()
+
+    samples = make_samples(args.samples)
+    (weights, report), train_s = timed(train, samples)
+    print(f"trained on {args.samples:,} tenders in {train_s * 1000:.0f} ms "
+          f"({report['iterations']} Newton steps, converged={report['converged']})")
+    print(f"{'weight':>20} {'true':>9} {'fitted':>9}")
+    for name in ("intercept",) + FEATURE_NAMES:
+        print(f"{name:>20} {TRUE_WEIGHTS[name]:>9.3f} {weights[name]:>9.3f}")
+
+    holdout = report["holdout"]
+    print(f"\nholdout: {holdout['samples']:,} tenders, win rate {holdout['win_rate']}, "
+          f"log loss {holdout['log_loss']} (baseline {holdout['baseline_log_loss']}), "
+          f"brier {holdout['brier']}, auc {holdout['auc']}, ece {holdout['ece']}")
+    print(f"{'bin':>9} {'count':>7} {'predicted':>10} {'observed':>9}")
+    for row in holdout["calibration"]:
+        print(f"{row['bin']:>9} {row['count']:>7} {row['predicted']:>10.3f} {row['observed']:>9.3f}")
+
+    model = WinProbabilityModel(weights=dict(weights))
+    tenders = make_tenders(args.latency_tenders, seed=3)
+    single, single_s = timed(lambda: [model.predict_proba(t) for t in tenders])
+    batch, batch_s = timed(model.predict_proba_batch, tenders)
+    assert all(math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-12) for a, b in zip(single, batch.tolist()))
+
+    n = len(tenders)
+    print(f"\n{'path':>8} {'tenders':>9} {'total':>9} {'per tender':>11}")
+    print(f"{'single':>8} {n:>9,} {single_s:>8.3f}s {single_s / n * 1e6:>9.2f}us")
+    print(f"{'batch':>8} {n:>9,} {batch_s:>8.3f}s {batch_s / n * 1e6:>9.2f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,349 @@
+"""Database Indexes - Idempotent index bootstrap and query-plan verification"""
+import asyncio
+import logging
+import os
+import sys
+from typing import Any, Dict, List
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+
+logger = logging.getLogger(__name__)
+
+DUPLICATE_KEY_ERROR = 11000
+
+# Indexes required by the hot lookups in server.py, per collection
+INDEXES: Dict[str, List[IndexModel]] = {
+    "users": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+        # Revocation sync polls for recent privilege changes
+        IndexModel([("auth_changed_at", ASCENDING)], name="auth_changed_at", sparse=True),
+    ],
+    "tenders": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("tender_id", ASCENDING)], name="tender_id_unique", unique=True),
+        IndexModel([("category", ASCENDING)], name="category"),
+        # Keyset pagination on GET /api/tenders: (sort key, id), optionally
+        # prefixed by an equality filter
+        IndexModel([("submission_deadline", ASCENDING), ("id", ASCENDING)], name="deadline_id"),
+        IndexModel([("published_date", DESCENDING), ("id", DESCENDING)], name="published_id"),
+        IndexModel(
+            [("category", ASCENDING), ("submission_deadline", ASCENDING), ("id", ASCENDING)],
+            name="category_deadline_id",
+        ),
+        IndexModel(
+            [("category", ASCENDING), ("published_date", DESCENDING), ("id", DESCENDING)],
+            name="category_published_id",
+        ),
+        IndexModel(
+            [("location", ASCENDING), ("submission_deadline", ASCENDING), ("id", ASCENDING)],
+            name="location_deadline_id",
+        ),
+        IndexModel(
+            [("location", ASCENDING), ("published_date", DESCENDING), ("id", DESCENDING)],
+            name="location_published_id",
+        ),
+        IndexModel([("estimated_value", ASCENDING)], name="estimated_value"),
+        # Threat materialized at ingest: sort by it, or filter by level and sort
+        IndexModel([("threat_score", DESCENDING), ("id", DESCENDING)], name="threat_id"),
+        IndexModel(
+            [("threat_level", ASCENDING), ("threat_score", DESCENDING), ("id", DESCENDING)],
+            name="threat_level_score_id",
+        ),
+        IndexModel(
+            [("category", ASCENDING), ("threat_score", DESCENDING), ("id", DESCENDING)],
+            name="category_threat_id",
+        ),
+        IndexModel([("threat_model_version", ASCENDING)], name="threat_model_version"),
+    ],
+    "notifications": [
+        IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING)], name="user_created"),
+        IndexModel([("id", ASCENDING), ("user_id", ASCENDING)], name="id_user"),
+    ],
+    "tender_analyses": [
+        IndexModel([("tender_id", ASCENDING), ("user_id", ASCENDING)], name="tender_user"),
+        IndexModel([("user_id", ASCENDING)], name="user"),
+    ],
+    "support_tickets": [
+        IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING)], name="user_created"),
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+    ],
+    "subscriptions": [
+        IndexModel([("user_id", ASCENDING)], name="user"),
+    ],
+    "crm_contacts": [
+        IndexModel([("user_id", ASCENDING), ("type", ASCENDING)], name="user_type"),
+    ],
+    "competitor_analyses": [
+        IndexModel([("tender_id", ASCENDING)], name="tender"),
+        # One memoized analysis per tender features and model version; analyses
+        # without a fingerprint are left out of the constraint, so they must
+        # omit feature_hash rather than store null ($exists matches null)
+        IndexModel(
+            [("tender_id", ASCENDING), ("feature_hash", ASCENDING), ("model_version", ASCENDING)],
+            name="tender_features_version_unique",
+            unique=True,
+            partialFilterExpression={"feature_hash": {"$exists": True}},
+        ),
+    ],
+    "tender_results": [
+        IndexModel([("tender_id", ASCENDING)], name="tender_id_unique", unique=True),
+    ],
+    "bid_outcomes": [
+        IndexModel([("tender_id", ASCENDING), ("user_id", ASCENDING)], name="tender_user_unique", unique=True),
+    ],
+    "scrape_jobs": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("status", ASCENDING), ("created_at", ASCENDING)], name="status_created"),
+        IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING)], name="user_created"),
+    ],
+    "tender_documents": [
+        IndexModel([("tender_id", ASCENDING), ("url", ASCENDING)], name="tender_url_unique", unique=True),
+        IndexModel([("url", ASCENDING)], name="url"),
+        IndexModel([("sha256", ASCENDING)], name="sha256"),
+    ],
+}
+
+# Query shapes issued by the API; each must be served by an index
+QUERY_SHAPES: List[Dict[str, Any]] = [
+    {"name": "user by id", "collection": "users", "filter": {"id": "probe"}},
+    {"name": "user by email", "collection": "users", "filter": {"email": "probe@example.com"}},
+    {
+        "name": "recent privilege changes",
+        "collection": "users",
+        "filter": {"auth_changed_at": {"$gte": "probe"}},
+    },
+    {"name": "tender by id", "collection": "tenders", "filter": {"id": "probe"}},
+    {"name": "tender by tender_id", "collection": "tenders", "filter": {"tender_id": "probe"}},
+    {"name": "tenders by category", "collection": "tenders", "filter": {"category": "probe"}},
+    {
+        "name": "tenders page by deadline",
+        "collection": "tenders",
+        "filter": {"$or": [
+            {"submission_deadline": {"$gt": "probe"}},
+            {"submission_deadline": "probe", "id": {"$gt": "probe"}},
+        ]},
+        "sort": [("submission_deadline", ASCENDING), ("id", ASCENDING)],
+    },
+    {
+        "name": "tenders page by category and deadline",
+        "collection": "tenders",
+        "filter": {"category": "probe"},
+        "sort": [("submission_deadline", ASCENDING), ("id", ASCENDING)],
+    },
+    {
+        "name": "tenders page by location and published date",
+        "collection": "tenders",
+        "filter": {"location": "probe"},
+        "sort": [("published_date", DESCENDING), ("id", DESCENDING)],
+    },
+    {
+        "name": "tenders page by value range",
+        "collection": "tenders",
+        "filter": {"estimated_value": {"$gte": 0, "$lte": 1}},
+        "sort": [("published_date", DESCENDING), ("id", DESCENDING)],
+    },
+    {
+        "name": "tenders page by threat",
+        "collection": "tenders",
+        "filter": {"$or": [
+            {"threat_score": {"$lt": 0.5}},
+            {"threat_score": 0.5, "id": {"$lt": "probe"}},
+            {"threat_score": None},
+        ]},
+        "sort": [("threat_score", DESCENDING), ("id", DESCENDING)],
+    },
+    {
+        "name": "tenders by threat level",
+        "collection": "tenders",
+        "filter": {"threat_level": "High"},
+        "sort": [("threat_score", DESCENDING), ("id", DESCENDING)],
+    },
+    {
+        "name": "tenders page by category and threat",
+        "collection": "tenders",
+        "filter": {"category": "probe"},
+        "sort": [("threat_score", DESCENDING), ("id", DESCENDING)],
+    },
+    {
+        "name": "notifications by user",
+        "collection": "notifications",
+        "filter": {"user_id": "probe"},
+        "sort": [("created_at", DESCENDING)],
+    },
+    {
+        "name": "analysis by tender and user",
+        "collection": "tender_analyses",
+        "filter": {"tender_id": "probe", "user_id": "probe"},
+    },
+    {
+        "name": "tickets by user",
+        "collection": "support_tickets",
+        "filter": {"user_id": "probe"},
+        "sort": [("created_at", DESCENDING)],
+    },
+    {"name": "ticket by id", "collection": "support_tickets", "filter": {"id": "probe"}},
+    {"name": "subscription by user", "collection": "subscriptions", "filter": {"user_id": "probe"}},
+    {"name": "contacts by user", "collection": "crm_contacts", "filter": {"user_id": "probe"}},
+    {
+        "name": "next queued scrape job",
+        "collection": "scrape_jobs",
+        "filter": {"status": "queued"},
+        "sort": [("created_at", ASCENDING)],
+    },
+    {
+        "name": "scrape jobs by user",
+        "collection": "scrape_jobs",
+        "filter": {"user_id": "probe"},
+        "sort": [("created_at", DESCENDING)],
+    },
+    {
+        "name": "memoized competitor analysis",
+        "collection": "competitor_analyses",
+        "filter": {"tender_id": "probe", "feature_hash": "probe", "model_version": "probe"},
+    },
+    {
+        "name": "bid outcome by tender and user",
+        "collection": "bid_outcomes",
+        "filter": {"tender_id": "probe", "user_id": "probe"},
+    },
+    {"name": "documents by tender", "collection": "tender_documents", "filter": {"tender_id": "probe"}},
+    {"name": "stored document by url", "collection": "tender_documents", "filter": {"url": "probe"}},
+    {"name": "stored document by hash", "collection": "tender_documents", "filter": {"sha256": "probe"}},
+]
+
+
+class QueryPlanError(Exception):
+    """Raised when a registered query shape falls back to a collection scan"""
+
+
+async def _count_duplicates(collection, keys: List[str]) -> int:
+    """Number of distinct key values held by more than one document"""
+    pipeline = [
+        {"$group": {"_id": {key.replace(".", "_"): f"${key}" for key in keys}, "n": {"$sum": 1}}},
+        {"$match": {"n": {"$gt": 1}}},
+        {"$count": "duplicates"},
+    ]
+    async for row in collection.aggregate(pipeline, allowDiskUse=True):
+        return row["duplicates"]
+    return 0
+
+
+async def ensure_indexes(db) -> Dict[str, List[str]]:
+    """
+    Create all required indexes
+
+    ``create_index`` is a no-op for indexes that already exist with the same
+    spec, so this is safe to run on every startup. Indexes are built one at
+    a time, so a unique index blocked by duplicate data doesn't keep the
+    collection's other indexes from being built; the blocked index is
+    logged with the number of duplicated keys.
+
+    Args:
+        db: Motor database
+
+    Returns:
+        Mapping of collection name to created/confirmed index names
+    """
+    created = {}
+    failed = []
+    for collection, indexes in INDEXES.items():
+        created[collection] = []
+        for index in indexes:
+            spec = index.document
+            try:
+                created[collection] += await db[collection].create_indexes([index])
+            except OperationFailure as e:
+                failed.append(f"{collection}.{spec['name']}")
+                if spec.get("unique") and e.code == DUPLICATE_KEY_ERROR:
+                    keys = list(spec["key"])
+                    duplicates = await _count_duplicates(db[collection], keys)
+                    logger.error(
+                        f"Unique index {spec['name']} on {collection} not built: {duplicates} "
+                        f"values of {', '.join(keys)} occur more than once. Remove or merge the "
+                        f"duplicates and restart")
+                else:
+                    # e.g. an existing index with the same name but different options
+                    logger.error(f"Failed to create index {spec['name']} on {collection}: {e}")
+    if failed:
+        logger.error(f"Missing indexes: {', '.join(failed)}")
+    logger.info(f"Ensured indexes on {len(created)} collections")
+    return created
+
+
+def _plan_stages(plan: Any) -> List[str]:
+    """Collect every stage name in an explain plan tree"""
+    stages = []
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            stages.append(plan["stage"])
+        for value in plan.values():
+            stages.extend(_plan_stages(value))
+    elif isinstance(plan, list):
+        for item in plan:
+            stages.extend(_plan_stages(item))
+    return stages
+
+
+async def verify_query_plans(db, raise_on_collscan: bool = True) -> List[Dict[str, Any]]:
+    """
+    Explain every registered query shape and check for collection scans
+
+    Args:
+        db: Motor database
+        raise_on_collscan: Raise QueryPlanError if any shape uses COLLSCAN
+
+    Returns:
+        List of per-shape results with the winning plan's stages
+    """
+    results = []
+    for shape in QUERY_SHAPES:
+        cursor = db[shape["collection"]].find(shape["filter"])
+        if shape.get("sort"):
+            cursor = cursor.sort(shape["sort"])
+        explanation = await cursor.explain()
+        stages = _plan_stages(explanation.get("queryPlanner", {}).get("winningPlan", {}))
+        results.append({
+            "name": shape["name"],
+            "collection": shape["collection"],
+            "stages": stages,
+            "collscan": "COLLSCAN" in stages,
+        })
+
+    offenders = [r for r in results if r["collscan"]]
+    for r in offenders:
+        logger.error(f"COLLSCAN for query shape '{r['name']}' on {r['collection']}: {r['stages']}")
+    if offenders and raise_on_collscan:
+        names = ", ".join(r["name"] for r in offenders)
+        raise QueryPlanError(f"Query shapes not served by an index: {names}")
+    return results
+
+
+async def _main(check: bool) -> int:
+    from dotenv import load_dotenv
+    from motor.motor_asyncio import AsyncIOMotorClient
+    from pathlib import Path
+
+    load_dotenv(Path(__file__).parent / '.env')
+    client = AsyncIOMotorClient(os.environ['MONGO_URL'])
+    db = client[os.environ['DB_NAME']]
+    try:
+        created = await ensure_indexes(db)
+        if any(len(created[c]) < len(indexes) for c, indexes in INDEXES.items()):
+            return 1
+        if check:
+            results = await verify_query_plans(db, raise_on_collscan=False)
+            for r in results:
+                status = "COLLSCAN" if r["collscan"] else "ok"
+                print(f"{status:8} {r['collection']:20} {r['name']}: {' > '.join(r['stages'])}")
+            if any(r["collscan"] for r in results):
+                return 1
+    finally:
+        client.close()
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(asyncio.run(_main(check="--check" in sys.argv)))
@@ -1,201 +1,194 @@
 """Document Preparation Module - Generate tender bidding documents"""
 from docx import Document
-from docx.shared import Inches, Pt, RGBColor
+from docx.shared import Inches, RGBColor
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 import openpyxl
-from openpyxl.styles import Font, Alignment, PatternFill
-from jinja2 import Template
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, Alignment, NamedStyle, PatternFill
 from datetime import datetime
 import os
+import uuid
+
+from template_engine import DOCX_CONTENT_TYPE, XLSX_CONTENT_TYPE, TemplateEngine, rendered_document
+
+# Bump a code-rendered type's version whenever its layout or wording changes;
+# cached renders (render_cache.RenderCache) are keyed on it. Template-defined
+# types are versioned by a hash of their template (TemplateEngine.version)
+TEMPLATE_VERSIONS = {
+    "boq": "2",
+    "company_profile": "1",
+}
+
+# Tender fields each renderer reads; callers load only these so the render
+# inputs (and cache keys) don't change with unrelated tender edits
+TENDER_FIELDS = {
+    "boq": ("tender_id", "title", "organization"),
+    "cover_letter": ("tender_id", "title", "organization"),
+    "technical_bid": ("tender_id", "title", "organization", "eligibility_criteria"),
+}
+
+# Tender fields available to other templates
+TEMPLATE_TENDER_FIELDS = ("tender_id", "title", "organization", "description", "estimated_value", "emd_amount",
+                          "category", "location", "submission_deadline", "eligibility_criteria")
+
+
+def _boq_styles():
+    """Named styles shared by every styled BOQ cell"""
+    currency = '₹#,##0.00'
+    return [
+        NamedStyle(name="boq_title", font=Font(bold=True, size=14)),
+        NamedStyle(
+            name="boq_header",
+            font=Font(color="FFFFFF", bold=True, size=12),
+            fill=PatternFill(start_color="366092", end_color="366092", fill_type="solid"),
+            alignment=Alignment(horizontal='center', vertical='center'),
+        ),
+        NamedStyle(name="boq_amount", number_format=currency),
+        NamedStyle(name="boq_total_label", font=Font(bold=True)),
+        NamedStyle(name="boq_total", font=Font(bold=True), number_format=currency),
+        NamedStyle(name="boq_grand_total_label", font=Font(bold=True, size=12)),
+        NamedStyle(name="boq_grand_total", font=Font(bold=True, size=12), number_format=currency),
+    ]
+
 
 class DocumentGenerator:
-    """Generate professional tender documents"""
+    """Generate professional tender documents
+    
+    ``render_*`` methods build a document entirely in memory and return its
+    file name, content type and bytes. ``generate_*`` methods additionally
+    persist it under ``output_dir`` and return the path. Cover letters,
+    technical bids and any other type with a file in the templates directory
+    are rendered from precompiled Jinja templates (see template_engine).
+    """
     
-    def __init__(self):
-        self.templates_dir = "/app/backend/document_templates"
-        os.makedirs(self.templates_dir, exist_ok=True)
+    def __init__(self, output_dir=None, templates_dir=None):
+        self.output_dir = output_dir or os.getenv('DOCUMENT_OUTPUT_DIR', "/app/backend/document_templates")
+        self.templates = TemplateEngine(templates_dir)
+    
+    def save(self, document):
+        """
+        Write a rendered document to ``output_dir``
+        
+        A short random suffix keeps same-day regenerations from overwriting
+        each other.
+        
+        Args:
+            document: Output of a render_* method
+        
+        Returns:
+            Path to the written file
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        stem, extension = os.path.splitext(document["filename"])
+        filepath = os.path.join(self.output_dir, f"{stem}_{uuid.uuid4().hex[:8]}{extension}")
+        with open(filepath, "wb") as f:
+            f.write(document["content"])
+        return filepath
     
     def generate_boq(self, tender_data, items):
+        """Render a BOQ and save it; returns the file path"""
+        return self.save(self.render_boq(tender_data, items))
+    
+    def generate_cover_letter(self, company_data, tender_data):
+        """Render a cover letter and save it; returns the file path"""
+        return self.save(self.render_cover_letter(company_data, tender_data))
+    
+    def generate_company_profile(self, company_data):
+        """Render a company profile and save it; returns the file path"""
+        return self.save(self.render_company_profile(company_data))
+    
+    def generate_technical_bid(self, tender_data, technical_details):
+        """Render a technical bid and save it; returns the file path"""
+        return self.save(self.render_technical_bid(tender_data, technical_details))
+    
+    def render_boq(self, tender_data, items):
         """
-        Generate Bill of Quantities (BOQ) Excel file
+        Render Bill of Quantities (BOQ) Excel file
+        
+        Rows are streamed through a write-only worksheet, so memory stays
+        flat however many items there are. Cells share named styles instead
+        of carrying their own Font objects, and amounts and totals are Excel
+        formulas, so the sheet stays correct when a bidder edits a rate.
         
         Args:
             tender_data: Tender information
-            items: List of BOQ items
+            items: Iterable of BOQ items
         
         Returns:
-            Path to generated Excel file
+            Dictionary with filename, content_type and content (bytes)
         """
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.title = "BOQ"
-        
-        # Set column widths
-        ws.column_dimensions['A'].width = 8
-        ws.column_dimensions['B'].width = 40
-        ws.column_dimensions['C'].width = 15
-        ws.column_dimensions['D'].width = 12
-        ws.column_dimensions['E'].width = 15
-        ws.column_dimensions['F'].width = 15
-        
-        # Header styling
-        header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-        header_font = Font(color="FFFFFF", bold=True, size=12)
-        
-        # Title
-        ws['A1'] = f"Bill of Quantities - {tender_data.get('tender_id', 'BOQ')}"
-        ws['A1'].font = Font(bold=True, size=14)
-        ws.merge_cells('A1:F1')
-        
-        # Tender details
-        ws['A2'] = f"Tender: {tender_data.get('title', '')}"
-        ws.merge_cells('A2:F2')
-        ws['A3'] = f"Organization: {tender_data.get('organization', '')}"
-        ws.merge_cells('A3:F3')
-        ws['A4'] = f"Date: {datetime.now().strftime('%d-%m-%Y')}"
-        ws.merge_cells('A4:F4')
+        wb = openpyxl.Workbook(write_only=True)
+        for style in _boq_styles():
+            wb.add_named_style(style)
+        ws = wb.create_sheet("BOQ")
+        
+        # Column widths must be set before the first row is written
+        for column, width in zip("ABCDEF", (8, 40, 15, 12, 15, 15)):
+            ws.column_dimensions[column].width = width
+        
+        def styled(value, style):
+            cell = WriteOnlyCell(ws, value=value)
+            cell.style = style
+            return cell
+        
+        # Title and tender details (write-only sheets can't merge; text overflows into the empty cells)
+        ws.append([styled(f"Bill of Quantities - {tender_data.get('tender_id', 'BOQ')}", "boq_title")])
+        ws.append([f"Tender: {tender_data.get('title', '')}"])
+        ws.append([f"Organization: {tender_data.get('organization', '')}"])
+        ws.append([f"Date: {datetime.now().strftime('%d-%m-%Y')}"])
+        ws.append([])
         
         # Column headers
         headers = ['S.No', 'Description', 'Unit', 'Quantity', 'Rate (₹)', 'Amount (₹)']
-        for col, header in enumerate(headers, start=1):
-            cell = ws.cell(row=6, column=col)
-            cell.value = header
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = Alignment(horizontal='center', vertical='center')
+        ws.append([styled(header, "boq_header") for header in headers])
         
         # BOQ items
-        row = 7
-        total_amount = 0
-        
+        first_row = row = 7
         for idx, item in enumerate(items, start=1):
-            ws.cell(row=row, column=1, value=idx)
-            ws.cell(row=row, column=2, value=item.get('description', ''))
-            ws.cell(row=row, column=3, value=item.get('unit', 'Nos'))
-            ws.cell(row=row, column=4, value=item.get('quantity', 1))
-            ws.cell(row=row, column=5, value=item.get('rate', 0))
-            
-            amount = item.get('quantity', 1) * item.get('rate', 0)
-            ws.cell(row=row, column=6, value=amount)
-            ws.cell(row=row, column=6).number_format = '₹#,##0.00'
-            
-            total_amount += amount
+            ws.append([
+                idx,
+                item.get('description', ''),
+                item.get('unit', 'Nos'),
+                item.get('quantity', 1),
+                item.get('rate', 0),
+                styled(f"=D{row}*E{row}", "boq_amount"),
+            ])
             row += 1
         
-        # Total row
-        ws.cell(row=row, column=5, value="Total:")
-        ws.cell(row=row, column=5).font = Font(bold=True)
-        ws.cell(row=row, column=6, value=total_amount)
-        ws.cell(row=row, column=6).font = Font(bold=True)
-        ws.cell(row=row, column=6).number_format = '₹#,##0.00'
-        
-        # GST row
-        row += 1
-        gst_amount = total_amount * 0.18
-        ws.cell(row=row, column=5, value="GST @ 18%:")
-        ws.cell(row=row, column=6, value=gst_amount)
-        ws.cell(row=row, column=6).number_format = '₹#,##0.00'
-        
-        # Grand total
-        row += 1
-        grand_total = total_amount + gst_amount
-        ws.cell(row=row, column=5, value="Grand Total:")
-        ws.cell(row=row, column=5).font = Font(bold=True, size=12)
-        ws.cell(row=row, column=6, value=grand_total)
-        ws.cell(row=row, column=6).font = Font(bold=True, size=12)
-        ws.cell(row=row, column=6).number_format = '₹#,##0.00'
-        
-        # Save file
-        filename = f"BOQ_{tender_data.get('tender_id', 'document')}_{datetime.now().strftime('%Y%m%d')}.xlsx"
-        filepath = os.path.join(self.templates_dir, filename)
-        wb.save(filepath)
-        
-        return filepath
+        # Totals
+        total_row = row
+        amount_range = f"F{first_row}:F{total_row - 1}" if total_row > first_row else None
+        ws.append([None, None, None, None, styled("Total:", "boq_total_label"),
+                   styled(f"=SUM({amount_range})" if amount_range else 0, "boq_total")])
+        ws.append([None, None, None, None, "GST @ 18%:", styled(f"=F{total_row}*0.18", "boq_amount")])
+        ws.append([None, None, None, None, styled("Grand Total:", "boq_grand_total_label"),
+                   styled(f"=F{total_row}+F{total_row + 1}", "boq_grand_total")])
+        
+        return rendered_document(f"BOQ_{tender_data.get('tender_id', 'document')}", ".xlsx", XLSX_CONTENT_TYPE,
+                                 wb.save)
     
-    def generate_cover_letter(self, company_data, tender_data):
+    def render_cover_letter(self, company_data, tender_data):
         """
-        Generate cover letter for tender submission
+        Render cover letter for tender submission (templates/cover_letter.docx.j2)
         
         Args:
             company_data: Company information
             tender_data: Tender information
         
         Returns:
-            Path to generated Word document
+            Dictionary with filename, content_type and content (bytes)
         """
-        doc = Document()
-        
-        # Company letterhead (placeholder)
-        header = doc.sections[0].header
-        header_para = header.paragraphs[0]
-        header_para.text = company_data.get('name', 'Company Name')
-        header_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        header_para.runs[0].font.size = Pt(16)
-        header_para.runs[0].font.bold = True
-        
-        # Date
-        doc.add_paragraph(f"Date: {datetime.now().strftime('%d-%m-%Y')}")
-        doc.add_paragraph()
-        
-        # To address
-        to_para = doc.add_paragraph()
-        to_para.add_run(f"To,\n{tender_data.get('organization', 'Organization')}\n").bold = True
-        
-        # Subject
-        doc.add_paragraph()
-        subject = doc.add_paragraph()
-        subject.add_run(f"Subject: Submission of Bid for {tender_data.get('tender_id', 'Tender ID')}\n").bold = True
-        
-        # Salutation
-        doc.add_paragraph("Dear Sir/Madam,")
-        doc.add_paragraph()
-        
-        # Body
-        body_text = f"""With reference to your tender notice {tender_data.get('tender_id', '')}, we hereby submit our bid for "{tender_data.get('title', '')}".
-
-We, {company_data.get('name', 'Company Name')}, have carefully studied the tender documents and confirm that we meet all the eligibility criteria and technical specifications mentioned therein.
-
-We have attached the following documents:
-1. Technical Bid
-2. Financial Bid (BOQ)
-3. Company Profile
-4. Experience Certificates
-5. EMD/Earnest Money Deposit
-6. Required Certificates and Compliance Documents
-
-We assure you of our best services and timely execution of the work/supply as per the terms and conditions of the tender.
-
-We look forward to a positive response from your esteemed organization.
-
-Thanking you,
-"""
-        doc.add_paragraph(body_text)
-        
-        # Signature
-        doc.add_paragraph()
-        signature = doc.add_paragraph("Yours faithfully,\n\n")
-        doc.add_paragraph(f"{company_data.get('authorized_person', 'Authorized Signatory')}")
-        doc.add_paragraph(f"{company_data.get('designation', 'Director')}")
-        doc.add_paragraph(f"{company_data.get('name', 'Company Name')}")
-        doc.add_paragraph(f"Contact: {company_data.get('phone', '')}")
-        doc.add_paragraph(f"Email: {company_data.get('email', '')}")
-        
-        # Save file
-        filename = f"CoverLetter_{tender_data.get('tender_id', 'document')}_{datetime.now().strftime('%Y%m%d')}.docx"
-        filepath = os.path.join(self.templates_dir, filename)
-        doc.save(filepath)
-        
-        return filepath
+        return self.templates.render("cover_letter", {"company": company_data, "tender": tender_data})
     
-    def generate_company_profile(self, company_data):
+    def render_company_profile(self, company_data):
         """
-        Generate company profile document
+        Render company profile document
         
         Args:
             company_data: Company information
         
         Returns:
-            Path to generated Word document
+            Dictionary with filename, content_type and content (bytes)
         """
         doc = Document()
         
@@ -247,92 +240,42 @@ Thanking you,
         for cert in certifications:
             doc.add_paragraph(cert, style='List Bullet')
         
-        # Save file
-        filename = f"CompanyProfile_{company_data.get('name', 'company').replace(' ', '_')}_{datetime.now().strftime('%Y%m%d')}.docx"
-        filepath = os.path.join(self.templates_dir, filename)
-        doc.save(filepath)
-        
-        return filepath
+        return rendered_document(f"CompanyProfile_{company_data.get('name', 'company')}", ".docx",
+                                 DOCX_CONTENT_TYPE, doc.save)
     
-    def generate_technical_bid(self, tender_data, technical_details):
+    def render_technical_bid(self, tender_data, technical_details):
         """
-        Generate technical bid document
+        Render technical bid document (templates/technical_bid.docx.j2)
         
         Args:
             tender_data: Tender information
             technical_details: Technical specifications and compliance
         
         Returns:
-            Path to generated Word document
+            Dictionary with filename, content_type and content (bytes)
         """
-        doc = Document()
-        
-        # Title
-        title = doc.add_heading('TECHNICAL BID', 0)
-        title.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        
-        # Tender details
-        doc.add_heading('Tender Details', 1)
-        details = [
-            ('Tender ID', tender_data.get('tender_id', '')),
-            ('Tender Title', tender_data.get('title', '')),
-            ('Organization', tender_data.get('organization', '')),
-            ('Submission Date', datetime.now().strftime('%d-%m-%Y')),
-        ]
-        
-        for label, value in details:
-            p = doc.add_paragraph()
-            p.add_run(f"{label}: ").bold = True
-            p.add_run(value)
-        
-        doc.add_paragraph()
-        
-        # Eligibility compliance
-        doc.add_heading('Eligibility Criteria Compliance', 1)
-        doc.add_paragraph("We hereby confirm compliance with all eligibility criteria:")
-        
-        for criterion in tender_data.get('eligibility_criteria', []):
-            doc.add_paragraph(f"✓ {criterion}", style='List Bullet')
-        
-        # Technical specifications
-        doc.add_heading('Technical Specifications', 1)
-        doc.add_paragraph("We confirm that our offered solution meets all technical requirements:")
-        
-        for spec_key, spec_value in technical_details.items():
-            p = doc.add_paragraph()
-            p.add_run(f"{spec_key}: ").bold = True
-            p.add_run(str(spec_value))
-        
-        # Compliance matrix
-        doc.add_heading('Compliance Matrix', 1)
-        table = doc.add_table(rows=1, cols=3)
-        table.style = 'Medium Shading 1 Accent 1'
-        
-        # Header row
-        header_cells = table.rows[0].cells
-        header_cells[0].text = 'Requirement'
-        header_cells[1].text = 'Compliance'
-        header_cells[2].text = 'Remarks'
-        
-        # Data rows
-        for criterion in tender_data.get('eligibility_criteria', []):
-            row_cells = table.add_row().cells
-            row_cells[0].text = criterion
-            row_cells[1].text = 'Yes'
-            row_cells[2].text = 'Fully compliant'
-        
-        # Declaration
-        doc.add_paragraph()
-        doc.add_heading('Declaration', 1)
-        declaration_text = """We declare that all information provided in this technical bid is true and accurate to the best of our knowledge. We understand that any false information may lead to disqualification."""
-        doc.add_paragraph(declaration_text)
+        return self.templates.render("technical_bid", {"tender": tender_data, "technical_details": technical_details})
+    
+    def render_template(self, kind, tender_data, company_data, data):
+        """
+        Render any template-defined document type
         
-        # Save file
-        filename = f"TechnicalBid_{tender_data.get('tender_id', 'document')}_{datetime.now().strftime('%Y%m%d')}.docx"
-        filepath = os.path.join(self.templates_dir, filename)
-        doc.save(filepath)
+        Args:
+            kind: Template name (e.g. financial_bid)
+            tender_data: Tender information (may be empty)
+            company_data: Company information (may be empty)
+            data: Type-specific fields
         
-        return filepath
+        Returns:
+            Dictionary with filename, content_type and content (bytes)
+        """
+        return self.templates.render(kind, {"tender": tender_data, "company": company_data, "data": data})
+    
+    def template_version(self, kind):
+        """Version of a document type's layout, for render cache keys"""
+        if kind in TEMPLATE_VERSIONS:
+            return TEMPLATE_VERSIONS[kind]
+        return self.templates.version(kind)
     
     def calculate_emd(self, tender_value, emd_percentage=2.0):
         """
@@ -0,0 +1,154 @@
+"""Document Store - Content-addressed storage for downloaded tender documents"""
+import asyncio
+import hashlib
+import logging
+import os
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import unquote, urlparse
+
+import httpx
+
+from gem_fetch import default_fetcher
+
+logger = logging.getLogger(__name__)
+
+
+class DocumentStore:
+    """Tender documents (NIT, BOQ, ...) stored once per distinct content
+
+    Files live under ``objects/<aa>/<sha256>`` and the ``tender_documents``
+    collection maps each (tender_id, url) to a hash. A URL that has been
+    stored before is never fetched again, concurrent requests for the same
+    URL share one download, and identical files from different URLs are kept
+    once on disk. Interrupted downloads stay under ``partial/`` and resume
+    with a Range request on the next attempt, unless the remote file has
+    changed since (see GeMHttpFetcher.download_to).
+    """
+
+    def __init__(self, db, root_dir: str, http_fetcher=None, concurrency: int = 4):
+        self.collection = db.tender_documents
+        self.objects_dir = os.path.join(root_dir, "objects")
+        self.partial_dir = os.path.join(root_dir, "partial")
+        os.makedirs(self.objects_dir, exist_ok=True)
+        os.makedirs(self.partial_dir, exist_ok=True)
+        self.http_fetcher = http_fetcher or default_fetcher
+        self.concurrency = concurrency
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.downloads = 0
+        self.reused = 0
+        self.deduplicated = 0
+        self.failed = 0
+
+    def object_path(self, sha256: str) -> str:
+        """On-disk path of a stored document"""
+        return os.path.join(self.objects_dir, sha256[:2], sha256)
+
+    def _partial_path(self, url: str) -> str:
+        return os.path.join(self.partial_dir, hashlib.sha1(url.encode("utf-8")).hexdigest() + ".part")
+
+    async def fetch(self, tender_id: str, url: str, filename: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Store a tender document, downloading it only if its URL is new
+
+        Args:
+            tender_id: Tender the document belongs to
+            url: Document URL
+            filename: Display name (defaults to the URL's file name)
+
+        Returns:
+            The tender_documents entry, or None if the download failed
+        """
+        existing = await self.collection.find_one({"url": url}, {"_id": 0})
+        if existing and os.path.exists(self.object_path(existing["sha256"])):
+            self.reused += 1
+            if existing["tender_id"] == tender_id:
+                return existing
+            meta = existing
+        else:
+            task = self._inflight.get(url)
+            if task is None:
+                task = asyncio.create_task(self._download(url))
+                self._inflight[url] = task
+                task.add_done_callback(lambda _: self._inflight.pop(url, None))
+            try:
+                # Shielded so one cancelled caller doesn't abort a shared download
+                meta = await asyncio.shield(task)
+            except (httpx.HTTPError, httpx.InvalidURL, OSError) as e:
+                logger.error(f"Error downloading document for tender {tender_id}: {e}")
+                return None
+
+        entry = {
+            "tender_id": tender_id,
+            "url": url,
+            "sha256": meta["sha256"],
+            "size": meta["size"],
+            "content_type": meta.get("content_type"),
+            "etag": meta.get("etag"),
+            "filename": filename or os.path.basename(unquote(urlparse(url).path)) or meta["sha256"],
+            "stored_at": datetime.now(timezone.utc),
+        }
+        await self.collection.update_one(
+            {"tender_id": tender_id, "url": url},
+            {"$set": entry},
+            upsert=True,
+        )
+        return entry
+
+    async def _download(self, url: str) -> Dict[str, Any]:
+        part = self._partial_path(url)
+        try:
+            meta = await self.http_fetcher.download_to(url, part)
+        except Exception:
+            self.failed += 1
+            raise
+
+        dest = self.object_path(meta["sha256"])
+        if os.path.exists(dest):
+            os.remove(part)
+            self.deduplicated += 1
+        else:
+            os.makedirs(os.path.dirname(dest), exist_ok=True)
+            os.replace(part, dest)
+        self.downloads += 1
+        logger.info(f"Stored {url} as {meta['sha256']} ({meta['size']} bytes)")
+        return meta
+
+    async def fetch_many(self, documents: Iterable[Tuple[str, str]]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Store several documents with at most ``concurrency`` downloads in flight
+
+        Args:
+            documents: (tender_id, url) pairs
+
+        Returns:
+            One entry (or None on failure) per pair, in order
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def fetch_one(tender_id, url):
+            async with semaphore:
+                return await self.fetch(tender_id, url)
+
+        return await asyncio.gather(*(fetch_one(t, u) for t, u in documents))
+
+    async def list_for_tender(self, tender_id: str) -> List[Dict[str, Any]]:
+        """Stored documents of a tender"""
+        return await self.collection.find({"tender_id": tender_id}, {"_id": 0}).to_list(100)
+
+    async def get(self, sha256: str) -> Optional[Dict[str, Any]]:
+        """Any index entry for a stored hash, if its file is present"""
+        entry = await self.collection.find_one({"sha256": sha256}, {"_id": 0})
+        if entry and os.path.exists(self.object_path(sha256)):
+            return entry
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        """Return download counters"""
+        return {
+            "downloads": self.downloads,
+            "reused": self.reused,
+            "deduplicated": self.deduplicated,
+            "failed": self.failed,
+            "in_flight": len(self._inflight),
+        }
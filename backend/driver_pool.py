@@ -0,0 +1,187 @@
+"""Driver Pool - Reusable, size-bounded pool of warmed browser sessions"""
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class DriverPoolTimeout(Exception):
+    """Raised when no driver becomes available within the checkout timeout"""
+
+
+class PooledDriver:
+    """A WebDriver plus the bookkeeping the pool needs to recycle it"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+        self.authenticated = False
+        self.created_at = time.monotonic()
+
+    def visit(self, url: str) -> None:
+        """Navigate to a URL, counting it towards the recycle limit"""
+        self.pages += 1
+        self.driver.get(url)
+
+    def quit(self) -> None:
+        try:
+            self.driver.quit()
+        except Exception:
+            pass
+
+
+class DriverPool:
+    """Thread-safe pool of browser drivers
+
+    Drivers are created lazily up to ``size``, warmed once (e.g. logged in)
+    by the optional ``warmup`` callable, health-checked on checkout and
+    recycled after ``max_pages`` page loads so long-lived Chrome processes
+    don't accumulate memory.
+    """
+
+    def __init__(self, factory: Callable[[], Any], size: int = 2, max_pages: int = 50,
+                 checkout_timeout: float = 60.0, warmup: Optional[Callable[[Any], bool]] = None):
+        self.factory = factory
+        self.size = size
+        self.max_pages = max_pages
+        self.checkout_timeout = checkout_timeout
+        self.warmup = warmup
+        self._idle = deque()
+        self._created = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self.checkouts = 0
+        self.reused = 0
+        self.launched = 0
+        self.recycled = 0
+        self.unhealthy = 0
+        self.timeouts = 0
+
+    def _launch(self) -> PooledDriver:
+        pooled = PooledDriver(self.factory())
+        self.launched += 1
+        if self.warmup is not None:
+            try:
+                pooled.authenticated = bool(self.warmup(pooled.driver))
+            except Exception as e:
+                logger.warning(f"Driver warmup failed: {e}")
+        return pooled
+
+    def _healthy(self, pooled: PooledDriver) -> bool:
+        try:
+            pooled.driver.execute_script("return 1")
+            return True
+        except Exception:
+            return False
+
+    def _discard(self, pooled: PooledDriver) -> None:
+        pooled.quit()
+        with self._cond:
+            self._created -= 1
+            self._cond.notify()
+
+    def checkout(self, timeout: Optional[float] = None) -> PooledDriver:
+        """
+        Borrow a driver, launching one if the pool is below its size
+
+        Args:
+            timeout: Seconds to wait for a free driver (defaults to checkout_timeout)
+
+        Returns:
+            PooledDriver that must be returned with release()
+        """
+        timeout = self.checkout_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._cond:
+                if self._closed:
+                    raise RuntimeError("Driver pool is closed")
+                pooled = None
+                launch = False
+                while pooled is None and not launch:
+                    if self._idle:
+                        pooled = self._idle.popleft()
+                    elif self._created < self.size:
+                        self._created += 1
+                        launch = True
+                    else:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            self.timeouts += 1
+                            raise DriverPoolTimeout(f"No browser driver available within {timeout}s")
+                        self._cond.wait(remaining)
+
+            if launch:
+                try:
+                    pooled = self._launch()
+                except Exception:
+                    with self._cond:
+                        self._created -= 1
+                        self._cond.notify()
+                    raise
+            elif not self._healthy(pooled):
+                self.unhealthy += 1
+                self._discard(pooled)
+                continue
+            else:
+                self.reused += 1
+
+            self.checkouts += 1
+            return pooled
+
+    def release(self, pooled: PooledDriver, discard: bool = False) -> None:
+        """
+        Return a driver to the pool
+
+        Args:
+            pooled: Driver obtained from checkout()
+            discard: Quit the driver instead of reusing it
+        """
+        if discard or self._closed or pooled.pages >= self.max_pages:
+            if not discard and pooled.pages >= self.max_pages:
+                self.recycled += 1
+            self._discard(pooled)
+            return
+        with self._cond:
+            self._idle.append(pooled)
+            self._cond.notify()
+
+    @contextmanager
+    def driver(self, timeout: Optional[float] = None):
+        """Context manager around checkout()/release()"""
+        pooled = self.checkout(timeout)
+        try:
+            yield pooled
+        finally:
+            self.release(pooled)
+
+    def close(self) -> None:
+        """Quit all idle drivers; checked-out drivers are quit on release"""
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._created -= len(idle)
+            self._cond.notify_all()
+        for pooled in idle:
+            pooled.quit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return pool usage counters"""
+        with self._cond:
+            return {
+                "size": self.size,
+                "max_pages": self.max_pages,
+                "created": self._created,
+                "idle": len(self._idle),
+                "checkouts": self.checkouts,
+                "reused": self.reused,
+                "launched": self.launched,
+                "recycled": self.recycled,
+                "unhealthy": self.unhealthy,
+                "timeouts": self.timeouts,
+            }
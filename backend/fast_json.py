@@ -0,0 +1,48 @@
+"""Fast JSON - Response encoding for large list payloads"""
+import json
+from datetime import date, datetime
+from typing import Any
+
+from starlette.responses import Response
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Encode trusted data to JSON bytes
+
+    Uses orjson when installed (native datetime support, several times faster
+    than the stdlib) and falls back to a compact ``json.dumps``.
+
+    Args:
+        content: JSON-compatible data; datetimes are emitted as ISO-8601
+
+    Returns:
+        UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(content, default=_default)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(Response):
+    """JSON response that skips FastAPI's response_model revalidation
+
+    Only use for data read straight from our own collections, which was
+    validated when it was written.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,383 @@
+"""GeM Fetch - Pooled HTTP fetching and single-pass lxml parsing of bid listings"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import random
+from typing import Any, Dict, List, Optional
+from urllib.parse import urljoin
+
+import httpx
+from lxml import html as lxml_html
+
+logger = logging.getLogger(__name__)
+
+# Card element class -> tender field. Each card is walked once and every
+# element is matched against this table instead of searching per field.
+CARD_FIELD_CLASSES = {
+    "bid-number": "tender_id",
+    "bid-title": "title",
+    "organization": "organization",
+    "published-date": "published_date",
+    "closing-date": "submission_deadline",
+    "estimated-value": "estimated_value",
+    "emd-amount": "emd_amount",
+    "description": "description",
+    "location": "location",
+}
+
+CARD_XPATH = '//div[contains(concat(" ", normalize-space(@class), " "), " bid-card ")]'
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml",
+    "Accept-Language": "en-IN,en;q=0.9",
+}
+
+# Throttling and transient server errors worth retrying
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Downloads are buffered to this size before each (threaded) disk write
+DOWNLOAD_WRITE_BUFFER = 1024 * 1024
+
+
+def extract_card_fields(card, base_url: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Extract raw text fields from one bid card in a single pass
+
+    Args:
+        card: lxml element for a ``div.bid-card``
+        base_url: URL of the page the card is on; relative document links are resolved against it
+
+    Returns:
+        Dict of raw field strings plus ``eligibility_criteria`` and ``document_url``
+    """
+    fields: Dict[str, Any] = {}
+    eligibility: List[str] = []
+    for el in card.iter():
+        class_attr = el.get("class")
+        if not class_attr:
+            continue
+        for cls in class_attr.split():
+            key = CARD_FIELD_CLASSES.get(cls)
+            if key is not None:
+                if key not in fields:
+                    fields[key] = el.text_content().strip()
+            elif cls == "download-doc" and el.tag == "a" and "document_url" not in fields:
+                href = el.get("href")
+                fields["document_url"] = urljoin(base_url, href) if href and base_url else href
+            elif cls == "eligibility" and not eligibility:
+                eligibility = [li.text_content().strip() for li in el.iter("li")]
+    fields["eligibility_criteria"] = eligibility
+    return fields
+
+
+def parse_listing_html(page_html: str, limit: Optional[int] = None,
+                       base_url: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Parse every bid card on a listing page
+
+    Args:
+        page_html: Listing page HTML
+        limit: Maximum number of cards to parse
+        base_url: URL of the listing page, for resolving relative links
+
+    Returns:
+        List of raw card field dicts
+    """
+    if not page_html:
+        return []
+    root = lxml_html.fromstring(page_html)
+    cards = root.xpath(CARD_XPATH)
+    if limit is not None:
+        cards = cards[:limit]
+    return [extract_card_fields(card, base_url) for card in cards]
+
+
+class HostRateLimiter:
+    """Spaces out request starts to the same host
+
+    Each call reserves the next free slot for its host, so concurrent callers
+    queue up ``1 / rate`` seconds apart without holding a lock.
+    """
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_slot: Dict[str, float] = {}
+
+    async def wait(self, host: str) -> None:
+        if not self.interval:
+            return
+        now = asyncio.get_running_loop().time()
+        slot = max(now, self._next_slot.get(host, 0.0))
+        self._next_slot[host] = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+class GeMHttpFetcher:
+    """Pooled async HTTP client for GeM pages that render without JavaScript
+
+    Requests are rate limited per host and retried with exponential backoff
+    (plus jitter, or the server's Retry-After) on transport errors and
+    throttling/5xx responses.
+    """
+
+    def __init__(self, max_connections: int = 10, timeout: float = 20.0,
+                 requests_per_second: float = 2.0, max_retries: int = 3,
+                 backoff_base: float = 0.5, backoff_max: float = 30.0):
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.rate_limiter = HostRateLimiter(requests_per_second)
+        self._client: Optional[httpx.AsyncClient] = None
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                headers=DEFAULT_HEADERS,
+                timeout=self.timeout,
+                follow_redirects=True,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+            )
+        return self._client
+
+    async def get(self, url: str, headers: Optional[Dict[str, str]] = None) -> httpx.Response:
+        """
+        Fetch a URL over the shared connection pool
+
+        Args:
+            url: Page URL
+            headers: Extra request headers
+
+        Returns:
+            httpx response (the last one if every retry was throttled)
+        """
+        host = httpx.URL(url).host
+        for attempt in range(self.max_retries + 1):
+            await self.rate_limiter.wait(host)
+            self.requests += 1
+            try:
+                response = await self.client.get(url, headers=headers)
+            except httpx.TransportError as e:
+                if attempt == self.max_retries:
+                    self.failures += 1
+                    raise
+                delay = self._backoff(attempt)
+                logger.warning(f"GET {url} failed ({e}), retrying in {delay:.1f}s")
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt == self.max_retries:
+                    return response
+                delay = self._retry_after(response) or self._backoff(attempt)
+                logger.warning(f"GET {url} returned {response.status_code}, retrying in {delay:.1f}s")
+            self.retries += 1
+            await asyncio.sleep(delay)
+
+    def _backoff(self, attempt: int) -> float:
+        delay = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return delay + random.uniform(0, delay / 2)
+
+    def _retry_after(self, response: httpx.Response) -> Optional[float]:
+        try:
+            return min(self.backoff_max, float(response.headers["Retry-After"]))
+        except (KeyError, ValueError):
+            return None
+
+    async def get_text(self, url: str) -> Optional[str]:
+        """Fetch a page and return its body, or None on any error"""
+        try:
+            response = await self.get(url)
+            response.raise_for_status()
+            return response.text
+        except httpx.HTTPError as e:
+            logger.warning(f"HTTP fetch of {url} failed: {e}")
+            return None
+
+    async def get_conditional(self, url: str, etag: Optional[str] = None,
+                              last_modified: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Fetch a page with If-None-Match / If-Modified-Since validators
+
+        Args:
+            url: Page URL
+            etag: ETag from the previous response
+            last_modified: Last-Modified from the previous response
+
+        Returns:
+            Dict with ``not_modified``, ``html``, ``etag`` and ``last_modified``,
+            or None on any error
+        """
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        try:
+            response = await self.get(url, headers=headers or None)
+            if response.status_code == 304:
+                return {"not_modified": True, "html": None, "etag": etag, "last_modified": last_modified}
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            logger.warning(f"HTTP fetch of {url} failed: {e}")
+            return None
+        return {
+            "not_modified": False,
+            "html": response.text,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        }
+
+    async def download_to(self, url: str, path: str) -> Dict[str, Any]:
+        """
+        Stream a file to ``path``, resuming a partial download with a Range request
+
+        Bytes already in ``path`` are kept and only the rest is requested,
+        conditional on the file being unchanged: the ETag (or Last-Modified)
+        of the response that started the file is kept next to it and sent as
+        If-Range, so a changed file comes back whole (200) and is rewritten
+        from the start rather than appended to stale bytes. A partial file
+        without a usable validator is never resumed. Transient failures are
+        retried from wherever the file got to. Disk writes run off the event
+        loop in buffered blocks.
+
+        Args:
+            url: File URL
+            path: Destination (typically a ``.part`` file)
+
+        Returns:
+            Dict with ``sha256``, ``size``, ``content_type`` and ``etag``
+
+        Raises:
+            httpx.HTTPError: If the download still fails after all retries
+        """
+        host = httpx.URL(url).host
+        validator_path = f"{path}.validator"
+        for attempt in range(self.max_retries + 1):
+            offset = os.path.getsize(path) if os.path.exists(path) else 0
+            validator = _read_validator(validator_path) if offset else None
+            headers = {"Range": f"bytes={offset}-", "If-Range": validator} if validator else None
+            if not validator:
+                offset = 0
+            await self.rate_limiter.wait(host)
+            self.requests += 1
+            try:
+                async with self.client.stream("GET", url, headers=headers) as response:
+                    if response.status_code == 416 and offset:
+                        # Nothing left to fetch: the part file is already complete
+                        _remove(validator_path)
+                        return await _describe_file(path, response)
+                    if response.status_code in RETRY_STATUSES and attempt < self.max_retries:
+                        raise httpx.HTTPStatusError(f"HTTP {response.status_code}", request=response.request,
+                                                    response=response)
+                    response.raise_for_status()
+                    resumed = offset and response.status_code == 206
+                    if not resumed:
+                        _write_validator(validator_path, response)
+                    digest = await asyncio.to_thread(_hash_file, path) if resumed else hashlib.sha256()
+                    size = offset if resumed else 0
+                    with open(path, "ab" if resumed else "wb") as f:
+                        buffer = bytearray()
+                        async for chunk in response.aiter_bytes():
+                            digest.update(chunk)
+                            buffer += chunk
+                            if len(buffer) >= DOWNLOAD_WRITE_BUFFER:
+                                await asyncio.to_thread(f.write, bytes(buffer))
+                                size += len(buffer)
+                                buffer.clear()
+                        if buffer:
+                            await asyncio.to_thread(f.write, bytes(buffer))
+                            size += len(buffer)
+                    _remove(validator_path)
+                    return {
+                        "sha256": digest.hexdigest(),
+                        "size": size,
+                        "content_type": response.headers.get("Content-Type"),
+                        "etag": response.headers.get("ETag"),
+                    }
+            except (httpx.TransportError, httpx.HTTPStatusError) as e:
+                status = e.response.status_code if isinstance(e, httpx.HTTPStatusError) else None
+                if attempt == self.max_retries or (status is not None and status not in RETRY_STATUSES):
+                    self.failures += 1
+                    raise
+                delay = self._backoff(attempt)
+                logger.warning(f"Download of {url} interrupted ({e}), resuming in {delay:.1f}s")
+                self.retries += 1
+                await asyncio.sleep(delay)
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Return request counters"""
+        return {
+            "max_connections": self.max_connections,
+            "requests_per_second": 1.0 / self.rate_limiter.interval if self.rate_limiter.interval else None,
+            "requests": self.requests,
+            "retries": self.retries,
+            "failures": self.failures,
+        }
+
+
+def _hash_file(path: str):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(DOWNLOAD_WRITE_BUFFER), b""):
+            digest.update(block)
+    return digest
+
+
+def _read_validator(path: str) -> Optional[str]:
+    # If-Range needs a strong ETag; weak ones fall back to Last-Modified
+    try:
+        with open(path) as f:
+            saved = json.load(f)
+    except (OSError, ValueError):
+        return None
+    etag = saved.get("etag")
+    if etag and not etag.startswith("W/"):
+        return etag
+    return saved.get("last_modified")
+
+
+def _write_validator(path: str, response: httpx.Response) -> None:
+    with open(path, "w") as f:
+        json.dump({"etag": response.headers.get("ETag"),
+                   "last_modified": response.headers.get("Last-Modified")}, f)
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+async def _describe_file(path: str, response: httpx.Response) -> Dict[str, Any]:
+    digest = await asyncio.to_thread(_hash_file, path)
+    return {
+        "sha256": digest.hexdigest(),
+        "size": os.path.getsize(path),
+        "content_type": response.headers.get("Content-Type"),
+        "etag": response.headers.get("ETag"),
+    }
+
+
+# Shared across scraper instances so keep-alive connections and the per-host
+# rate limit apply to every scrape in the process
+default_fetcher = GeMHttpFetcher(
+    max_connections=int(os.getenv('GEM_HTTP_MAX_CONNECTIONS', 10)),
+    requests_per_second=float(os.getenv('GEM_HTTP_RATE', 2.0)),
+    max_retries=int(os.getenv('GEM_HTTP_RETRIES', 3)),
+)
@@ -1,180 +1,469 @@
 """GeM Portal Scraper - Real-time tender data extraction"""
 import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from bs4 import BeautifulSoup
-import requests
 from datetime import datetime, timezone
 import uuid
 import logging
 import json
 import os
+import hashlib
+from contextlib import contextmanager
+
+from pymongo import UpdateOne
+
+from driver_pool import DriverPool, PooledDriver
+from gem_fetch import default_fetcher, extract_card_fields, parse_listing_html
 
 logger = logging.getLogger(__name__)
 
+GEM_BASE_URL = "https://gem.gov.in"
+
+# "auto" tries a plain HTTP fetch first and falls back to Chrome when the page
+# needs JavaScript; "http" and "browser" force one path
+GEM_FETCH_MODE = os.getenv('GEM_FETCH_MODE', 'auto')
+
+# Incremental scrapes stop after this many consecutive already-seen bids;
+# the listing is newest first, so everything past them was scraped before
+GEM_INCREMENTAL_STOP_AFTER = int(os.getenv('GEM_INCREMENTAL_STOP_AFTER', 20))
+
+# Listing pages fetched at once, and a hard stop for runaway pagination
+GEM_LISTING_CONCURRENCY = int(os.getenv('GEM_LISTING_CONCURRENCY', 4))
+GEM_LISTING_MAX_PAGES = int(os.getenv('GEM_LISTING_MAX_PAGES', 500))
+
+DEFAULT_ELIGIBILITY = [
+    "Registered company with valid GST",
+    "Minimum 2 years of experience",
+    "Valid PAN and Aadhaar"
+]
+
+# Selenium and BeautifulSoup both block; scraper work runs on these
+# threads so the API event loop keeps serving other users during a scrape
+SCRAPER_EXECUTOR = ThreadPoolExecutor(
+    max_workers=int(os.getenv('GEM_SCRAPER_THREADS', 4)),
+    thread_name_prefix="gem-scraper",
+)
+
+
+def create_chrome_driver():
+    """Launch a headless Chrome driver"""
+    chrome_options = Options()
+    chrome_options.add_argument('--headless')
+    chrome_options.add_argument('--no-sandbox')
+    chrome_options.add_argument('--disable-dev-shm-usage')
+    chrome_options.add_argument('--disable-gpu')
+    chrome_options.add_argument('--window-size=1920,1080')
+    return webdriver.Chrome(options=chrome_options)
+
+
+def login_driver(driver, username, password, base_url=GEM_BASE_URL):
+    """
+    Log a driver into the GeM portal
+    
+    Args:
+        driver: Selenium WebDriver
+        username: GeM username
+        password: GeM password
+        base_url: Portal base URL
+    
+    Returns:
+        True if login succeeded
+    """
+    if not username or not password:
+        logger.warning("GeM credentials not provided, proceeding without authentication")
+        return False
+    
+    try:
+        logger.info(f"Attempting to login to GeM portal with username: {username}")
+        
+        # Navigate to login page
+        driver.get(f"{base_url}/login")
+        
+        # Wait for login form
+        wait = WebDriverWait(driver, 15)
+        
+        # Find and fill username
+        username_field = wait.until(
+            EC.presence_of_element_located((By.ID, "username"))
+        )
+        username_field.clear()
+        username_field.send_keys(username)
+        
+        # Find and fill password
+        password_field = driver.find_element(By.ID, "password")
+        password_field.clear()
+        password_field.send_keys(password)
+        
+        # Click login button
+        login_button = driver.find_element(By.ID, "login-button")
+        login_button.click()
+        
+        # Wait for successful login (dashboard or profile element)
+        wait.until(EC.url_contains("dashboard"))
+        
+        logger.info("Successfully logged into GeM portal")
+        return True
+        
+    except Exception as e:
+        logger.error(f"Failed to login to GeM portal: {e}")
+        return False
+
+
+def create_gem_driver_pool(username=None, password=None, size=2, max_pages=50, checkout_timeout=60.0):
+    """
+    Build a pool of Chrome drivers that are logged in when launched
+    
+    Args:
+        username: GeM username (defaults to GEM_USERNAME)
+        password: GeM password (defaults to GEM_PASSWORD)
+        size: Maximum number of concurrent browsers
+        max_pages: Page loads after which a browser is recycled
+        checkout_timeout: Seconds to wait for a free browser
+    
+    Returns:
+        DriverPool
+    """
+    username = username or os.getenv('GEM_USERNAME')
+    password = password or os.getenv('GEM_PASSWORD')
+    return DriverPool(
+        factory=create_chrome_driver,
+        size=size,
+        max_pages=max_pages,
+        checkout_timeout=checkout_timeout,
+        warmup=lambda driver: login_driver(driver, username, password),
+    )
+
+
 class GeMScraper:
     """Scraper for GeM (Government e-Marketplace) Portal"""
     
-    def __init__(self, username=None, password=None):
-        self.base_url = "https://gem.gov.in"
+    def __init__(self, username=None, password=None, driver_pool=None, executor=None,
+                 fetch_mode=None, http_fetcher=None, stop_after_known=None,
+                 page_concurrency=None, max_pages=None):
+        self.base_url = GEM_BASE_URL
         self.api_url = "https://api.gem.gov.in"
         self.username = username or os.getenv('GEM_USERNAME')
         self.password = password or os.getenv('GEM_PASSWORD')
         self.authenticated = False
-        self.setup_driver()
+        # With a pool, browsers are borrowed per operation and kept warm;
+        # without one the scraper owns a single driver for its lifetime
+        self.driver_pool = driver_pool
+        self.executor = executor or SCRAPER_EXECUTOR
+        self.fetch_mode = fetch_mode or GEM_FETCH_MODE
+        self.http_fetcher = http_fetcher or default_fetcher
+        self.stop_after_known = stop_after_known or GEM_INCREMENTAL_STOP_AFTER
+        self.page_concurrency = page_concurrency or GEM_LISTING_CONCURRENCY
+        self.max_pages = max_pages or GEM_LISTING_MAX_PAGES
+        self.driver = None
+        # HTTP-only scrapers never need a browser
+        if driver_pool is None and self.fetch_mode != "http":
+            self.setup_driver()
     
     def setup_driver(self):
         """Setup headless Chrome driver"""
-        chrome_options = Options()
-        chrome_options.add_argument('--headless')
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        chrome_options.add_argument('--disable-gpu')
-        chrome_options.add_argument('--window-size=1920,1080')
-        self.driver = webdriver.Chrome(options=chrome_options)
+        self.driver = create_chrome_driver()
+    
+    @contextmanager
+    def _session(self):
+        """Yield a PooledDriver, borrowed from the pool when one is configured"""
+        if self.driver_pool is not None:
+            with self.driver_pool.driver() as pooled:
+                yield pooled
+        else:
+            pooled = PooledDriver(self.driver)
+            pooled.authenticated = self.authenticated
+            try:
+                yield pooled
+            finally:
+                self.authenticated = pooled.authenticated
+    
+    def _ensure_login(self, session):
+        if self.username and self.password and not session.authenticated:
+            session.authenticated = login_driver(session.driver, self.username, self.password, self.base_url)
+    
+    async def _run_blocking(self, func, *args):
+        """Run a blocking scraper call on the scraper executor"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, func, *args)
     
     async def login(self):
         """Login to GeM portal"""
-        if not self.username or not self.password:
-            logger.warning("GeM credentials not provided, proceeding without authentication")
-            return False
-        
-        try:
-            logger.info(f"Attempting to login to GeM portal with username: {self.username}")
-            
-            # Navigate to login page
-            self.driver.get(f"{self.base_url}/login")
-            
-            # Wait for login form
-            wait = WebDriverWait(self.driver, 15)
-            
-            # Find and fill username
-            username_field = wait.until(
-                EC.presence_of_element_located((By.ID, "username"))
-            )
-            username_field.clear()
-            username_field.send_keys(self.username)
-            
-            # Find and fill password
-            password_field = self.driver.find_element(By.ID, "password")
-            password_field.clear()
-            password_field.send_keys(self.password)
-            
-            # Click login button
-            login_button = self.driver.find_element(By.ID, "login-button")
-            login_button.click()
-            
-            # Wait for successful login (dashboard or profile element)
-            wait.until(EC.url_contains("dashboard"))
-            
-            self.authenticated = True
-            logger.info("Successfully logged into GeM portal")
-            return True
-            
-        except Exception as e:
-            logger.error(f"Failed to login to GeM portal: {e}")
-            self.authenticated = False
-            return False
+        return await self._run_blocking(self._login_sync)
+    
+    def _login_sync(self):
+        with self._session() as session:
+            session.authenticated = login_driver(session.driver, self.username, self.password, self.base_url)
+            return session.authenticated
     
-    async def scrape_latest_tenders(self, category=None, limit=50):
+    def listing_url(self, page=1):
+        """URL of one page of the active bids listing"""
+        url = f"{self.base_url}/bidlists/activeBids"
+        return url if page == 1 else f"{url}?page={page}"
+    
+    async def scrape_latest_tenders(self, category=None, limit=50, state=None):
         """
         Scrape latest tenders from GeM portal
         
         Args:
             category: Tender category filter
             limit: Number of tenders to fetch
+            state: Optional ScrapeState for incremental scraping
         
         Returns:
             List of tender dictionaries
         """
         tenders = []
+        async for batch in self.iter_latest_tenders(category, limit, state):
+            tenders.extend(batch)
+        return tenders
+    
+    async def iter_latest_tenders(self, category=None, limit=50, state=None):
+        """
+        Stream tenders from the paginated active bids listing
         
-        try:
-            # Login if credentials are available
-            if self.username and self.password and not self.authenticated:
-                await self.login()
-            
-            # Navigate to tender listing page
-            url = f"{self.base_url}/bidlists/activeBids"
-            self.driver.get(url)
-            
-            # Wait for page load
-            wait = WebDriverWait(self.driver, 15)
-            
-            try:
-                wait.until(EC.presence_of_element_located((By.CLASS_NAME, "bid-card")))
-            except:
-                # If bid-card class not found, try alternative selectors
-                logger.warning("bid-card class not found, trying alternative methods")
-                wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-            
-            # Wait additional time for dynamic content
-            await asyncio.sleep(2)
-            
-            # Get page source and parse with BeautifulSoup
-            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-            
-            # Find all tender cards
-            tender_cards = soup.find_all('div', class_='bid-card')[:limit]
-            
-            # If no cards found with default class, try alternative approaches
-            if not tender_cards:
-                logger.warning(f"No tender cards found with class 'bid-card', found {len(tender_cards)} tenders")
-                # Could implement alternative parsing logic here
+        The first page is fetched on its own; later pages are fetched over
+        HTTP up to ``page_concurrency`` at a time (the fetcher rate limits
+        and retries per host) and each page's tenders are yielded as soon as
+        it is parsed, so ingestion can start before traversal ends. When the
+        static HTML has no bid cards the listing is rendered page by page in
+        a browser instead. Traversal stops at ``limit`` tenders, at the first
+        empty page, at a page that can't be fetched or after ``max_pages``.
+        
+        With a ScrapeState the scrape is incremental: the first page is
+        fetched conditionally (an unchanged listing yields nothing) and
+        paging stops once a run of already-seen bid numbers is reached. The
+        caller remembers and saves the state after ingesting the tenders.
+        
+        Args:
+            category: Tender category filter
+            limit: Number of tenders to fetch
+            state: Optional ScrapeState for incremental scraping
+        
+        Yields:
+            Lists of tender dictionaries, one per listing page
+        """
+        if self.fetch_mode in ("auto", "http"):
+            url = self.listing_url(1)
+            if state is not None:
+                page = await self.http_fetcher.get_conditional(url, state.etag, state.last_modified)
+                if page and page["not_modified"]:
+                    logger.info("GeM listing not modified since last scrape")
+                    state.not_modified = True
+                    return
+                page_html = page["html"] if page else None
+            else:
+                page = None
+                page_html = await self.http_fetcher.get_text(url)
             
-            for card in tender_cards:
+            card_count, tenders, card_ids = await self._run_blocking(self._parse_page, page_html, category, state)
+            if card_count or self.fetch_mode == "http":
+                traversal = {"complete": False}
+                async for batch in self._iter_http_pages(tenders, card_count, card_ids, category, limit, state,
+                                                         traversal):
+                    yield batch
+                # Validators only hold for a listing that was fully traversed;
+                # a scrape cut short by its limit must not 304 the next run
+                if page is not None and traversal["complete"]:
+                    state.set_validators(page["etag"], page["last_modified"])
+                return
+            logger.info("No bid cards in static HTML, falling back to browser rendering")
+        
+        async for batch in self._iter_browser_pages(category, limit, state):
+            yield batch
+    
+    async def _iter_http_pages(self, first_tenders, first_cards, first_ids, category, limit, state, traversal):
+        taken = 0
+        batch = first_tenders[:limit]
+        self._mark_scanned(state, first_ids, first_tenders, len(batch))
+        if batch:
+            taken += len(batch)
+            yield batch
+        exhausted = not first_cards or (state is not None and state.reached_known)
+        failed = False
+        
+        pending = {}
+        next_page = 2
+        try:
+            while True:
+                while (not exhausted and not failed and taken < limit and len(pending) < self.page_concurrency
+                       and next_page <= self.max_pages):
+                    task = asyncio.create_task(self.http_fetcher.get_text(self.listing_url(next_page)))
+                    pending[task] = next_page
+                    next_page += 1
+                if not pending:
+                    break
+                
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in sorted(done, key=pending.get):
+                    page_number = pending.pop(task)
+                    page_html = task.result()
+                    if page_html is None:
+                        # The fetcher already retried; a failed page says nothing
+                        # about where the listing ends
+                        logger.warning(f"Listing page {page_number} could not be fetched, stopping")
+                        failed = True
+                        continue
+                    card_count, tenders, card_ids = await self._run_blocking(self._parse_page, page_html,
+                                                                             category, state)
+                    if not card_count:
+                        logger.info(f"Listing page {page_number} is empty, stopping")
+                        exhausted = True
+                    elif state is not None and state.reached_known:
+                        exhausted = True
+                    batch = tenders[:max(limit - taken, 0)]
+                    self._mark_scanned(state, card_ids, tenders, len(batch))
+                    if batch:
+                        taken += len(batch)
+                        yield batch
+        finally:
+            for task in pending:
+                task.cancel()
+        
+        traversal["complete"] = exhausted and not failed
+    
+    async def _iter_browser_pages(self, category, limit, state):
+        taken = 0
+        try:
+            for page_number in range(1, self.max_pages + 1):
+                page_html = await self._run_blocking(self._render_listing_sync, self.listing_url(page_number))
+                if not page_html:
+                    break
+                card_count, tenders, card_ids = await self._run_blocking(self._parse_page, page_html, category, state)
+                batch = tenders[:limit - taken]
+                self._mark_scanned(state, card_ids, tenders, len(batch))
+                if batch:
+                    taken += len(batch)
+                    yield batch
+                if not card_count or taken >= limit or (state is not None and state.reached_known):
+                    break
+        finally:
+            # Pooled browsers stay warm for the next scrape
+            if self.driver_pool is None:
+                await self._run_blocking(self.driver.quit)
+    
+    def _render_listing_sync(self, url):
+        """Load a listing page in a browser and return the rendered HTML"""
+        try:
+            with self._session() as session:
+                # Login if credentials are available
+                self._ensure_login(session)
+                
+                session.visit(url)
+                
+                # Wait for page load
+                wait = WebDriverWait(session.driver, 15)
+                
                 try:
-                    tender = self.parse_tender_card(card)
-                    if tender and (not category or tender.get('category') == category):
-                        tenders.append(tender)
-                except Exception as e:
-                    logger.error(f"Error parsing tender card: {e}")
-                    continue
+                    wait.until(EC.presence_of_element_located((By.CLASS_NAME, "bid-card")))
+                except:
+                    # If bid-card class not found, try alternative selectors
+                    logger.warning("bid-card class not found, trying alternative methods")
+                    wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+                
+                # Wait additional time for dynamic content
+                time.sleep(2)
+                
+                return session.driver.page_source
         
         except Exception as e:
             logger.error(f"Error scraping tenders: {e}")
+            return None
+    
+    def parse_listing(self, page_html, category=None, limit=50, state=None):
+        """
+        Parse tenders from a bid listing page
         
-        finally:
-            self.driver.quit()
+        Args:
+            page_html: Listing page HTML
+            category: Tender category filter
+            limit: Maximum number of cards to parse
+            state: Optional ScrapeState; parsing stops after
+                ``stop_after_known`` consecutive already-seen bids
         
-        return tenders
+        Returns:
+            List of tender dictionaries
+        """
+        return self._parse_page(page_html, category, state, limit)[1]
+    
+    def _parse_page(self, page_html, category=None, state=None, limit=None):
+        """Parse a listing page into (number of bid cards, tenders, bid numbers of the cards scanned)"""
+        try:
+            cards = parse_listing_html(page_html, limit, base_url=self.listing_url())
+        except Exception as e:
+            logger.error(f"Error parsing listing page: {e}")
+            return 0, [], []
+        
+        if not cards:
+            logger.warning("No tender cards found with class 'bid-card'")
+        
+        tenders = []
+        card_ids = []
+        known_run = 0
+        # A page shorter than stop_after_known that is entirely known also ends the scan
+        stop_after = min(self.stop_after_known, len(cards))
+        for fields in cards:
+            if state is not None:
+                if state.is_known(fields.get('tender_id')):
+                    known_run += 1
+                    if known_run >= stop_after:
+                        logger.info(f"Reached {known_run} already-seen bids, stopping")
+                        state.reached_known = True
+                        break
+                else:
+                    known_run = 0
+            card_ids.append(fields.get('tender_id'))
+            tender = self.build_tender(fields)
+            if tender and (not category or tender.get('category') == category):
+                tenders.append(tender)
+        return len(cards), tenders, card_ids
+    
+    @staticmethod
+    def _mark_scanned(state, card_ids, tenders, taken):
+        """
+        Record the cards of a page that the scrape got past
+        
+        Cards the category filter dropped count as scanned too, so the next
+        incremental run can stop on them; cards after the last tender cut off
+        by the limit don't, as they were never yielded.
+        """
+        if state is None:
+            return
+        if taken < len(tenders):
+            card_ids = card_ids[:card_ids.index(tenders[taken - 1]['tender_id']) + 1] if taken else []
+        state.scanned(card_ids)
     
     def parse_tender_card(self, card):
-        """Parse individual tender card HTML"""
+        """Parse individual tender card (lxml element)"""
+        return self.build_tender(extract_card_fields(card, self.listing_url()))
+    
+    def build_tender(self, fields):
+        """Build a tender document from raw card fields"""
         try:
-            tender_id = card.find('span', class_='bid-number').text.strip()
-            title = card.find('h3', class_='bid-title').text.strip()
-            organization = card.find('span', class_='organization').text.strip()
-            
-            # Extract dates
-            published_date_str = card.find('span', class_='published-date').text.strip()
-            deadline_str = card.find('span', class_='closing-date').text.strip()
-            
-            # Extract values
-            estimated_value_str = card.find('span', class_='estimated-value').text.strip()
-            emd_amount_str = card.find('span', class_='emd-amount').text.strip()
-            
+            title = fields['title']
             tender = {
                 'id': str(uuid.uuid4()),
-                'tender_id': tender_id,
+                'tender_id': fields['tender_id'],
                 'title': title,
-                'organization': organization,
-                'description': card.find('p', class_='description').text.strip() if card.find('p', class_='description') else "",
-                'estimated_value': self.parse_currency(estimated_value_str),
-                'emd_amount': self.parse_currency(emd_amount_str),
+                'organization': fields['organization'],
+                'description': fields.get('description', ""),
+                'estimated_value': self.parse_currency(fields['estimated_value']),
+                'emd_amount': self.parse_currency(fields['emd_amount']),
                 'category': self.detect_category(title),
-                'location': card.find('span', class_='location').text.strip() if card.find('span', class_='location') else "India",
-                'published_date': self.parse_date(published_date_str),
-                'submission_deadline': self.parse_date(deadline_str),
+                'location': fields.get('location') or "India",
+                'published_date': self.parse_date(fields['published_date']),
+                'submission_deadline': self.parse_date(fields['submission_deadline']),
                 'status': 'active',
                 'source': 'GeM',
-                'eligibility_criteria': self.extract_eligibility(card),
+                'eligibility_criteria': self.extract_eligibility(fields.get('eligibility_criteria')),
                 'technical_specs': {},
-                'document_url': card.find('a', class_='download-doc')['href'] if card.find('a', class_='download-doc') else None,
-                'created_at': datetime.now(timezone.utc).isoformat()
+                'document_url': fields.get('document_url'),
+                'created_at': datetime.now(timezone.utc)
             }
             
             return tender
@@ -199,18 +488,24 @@ class GeMScraper:
             return 0.0
     
     def parse_date(self, date_str):
-        """Parse date string to ISO format"""
+        """
+        Parse date string to a UTC datetime (stored as a native BSON date)
+        
+        Returns None for an unrecognised date, so the tender is rejected at
+        ingest rather than stored with a date (and content hash) that changes
+        on every scrape.
+        """
         try:
             # Handle various date formats
             formats = ['%d-%m-%Y', '%d/%m/%Y', '%Y-%m-%d', '%d %b %Y']
             for fmt in formats:
                 try:
-                    return datetime.strptime(date_str, fmt).isoformat()
+                    return datetime.strptime(date_str, fmt).replace(tzinfo=timezone.utc)
                 except:
                     continue
-            return datetime.now(timezone.utc).isoformat()
+            return None
         except:
-            return datetime.now(timezone.utc).isoformat()
+            return None
     
     def detect_category(self, title):
         """Auto-detect tender category from title"""
@@ -230,30 +525,18 @@ class GeMScraper:
         
         return 'General'
     
-    def extract_eligibility(self, card):
-        """Extract eligibility criteria"""
-        criteria = []
-        
-        # Look for eligibility section
-        eligibility_div = card.find('div', class_='eligibility')
-        if eligibility_div:
-            criteria_items = eligibility_div.find_all('li')
-            criteria = [item.text.strip() for item in criteria_items]
-        
-        # Default criteria if none found
-        if not criteria:
-            criteria = [
-                "Registered company with valid GST",
-                "Minimum 2 years of experience",
-                "Valid PAN and Aadhaar"
-            ]
-        
-        return criteria
+    def extract_eligibility(self, criteria):
+        """Eligibility criteria from a card, or the GeM defaults if none listed"""
+        return list(criteria) if criteria else list(DEFAULT_ELIGIBILITY)
     
     async def download_tender_document(self, tender_id, document_url, save_path):
         """
         Download tender document (NIT/BOQ)
         
+        Streams over the shared HTTP connection pool without blocking the
+        event loop; an interrupted download resumes from its ``.part`` file.
+        Use DocumentStore to keep one copy per distinct document.
+        
         Args:
             tender_id: Unique tender identifier
             document_url: URL to download document
@@ -262,24 +545,15 @@ class GeMScraper:
         Returns:
             Path to downloaded file or None
         """
+        part_path = f"{save_path}.part"
         try:
-            # Download document
-            response = requests.get(document_url, stream=True)
+            # Create directory if not exists
+            os.makedirs(os.path.dirname(save_path) or ".", exist_ok=True)
+            await self.http_fetcher.download_to(document_url, part_path)
+            os.replace(part_path, save_path)
             
-            if response.status_code == 200:
-                # Create directory if not exists
-                os.makedirs(os.path.dirname(save_path), exist_ok=True)
-                
-                # Save file
-                with open(save_path, 'wb') as f:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        f.write(chunk)
-                
-                logger.info(f"Downloaded document for tender {tender_id} to {save_path}")
-                return save_path
-            else:
-                logger.error(f"Failed to download document: HTTP {response.status_code}")
-                return None
+            logger.info(f"Downloaded document for tender {tender_id} to {save_path}")
+            return save_path
         
         except Exception as e:
             logger.error(f"Error downloading document: {e}")
@@ -295,14 +569,18 @@ class GeMScraper:
         Returns:
             Dictionary with result data
         """
+        return await self._run_blocking(self._get_tender_results_sync, tender_id)
+    
+    def _get_tender_results_sync(self, tender_id):
         try:
             url = f"{self.base_url}/tender-results/{tender_id}"
-            self.driver.get(url)
-            
-            wait = WebDriverWait(self.driver, 10)
-            wait.until(EC.presence_of_element_located((By.CLASS_NAME, "result-table")))
-            
-            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
+            with self._session() as session:
+                session.visit(url)
+                
+                wait = WebDriverWait(session.driver, 10)
+                wait.until(EC.presence_of_element_located((By.CLASS_NAME, "result-table")))
+                
+                soup = BeautifulSoup(session.driver.page_source, 'lxml')
             
             results = {
                 'tender_id': tender_id,
@@ -346,7 +624,8 @@ class GeMScraper:
     def __del__(self):
         """Cleanup"""
         try:
-            self.driver.quit()
+            if self.driver is not None:
+                self.driver.quit()
         except:
             pass
 
@@ -354,9 +633,13 @@ class GeMScraper:
 class HistoricalDataCollector:
     """Collect historical tender data for analytics"""
     
-    def __init__(self, db):
+    def __init__(self, db, driver_pool=None, concurrency=4, batch_size=100):
         self.db = db
-        self.scraper = GeMScraper()
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        # Caller-owned pool (left open); without one, each collection starts
+        # its own and closes it when done
+        self.driver_pool = driver_pool
     
     async def collect_historical_tenders(self, months=6):
         """
@@ -372,23 +655,80 @@ class HistoricalDataCollector:
         # For now, we'll generate representative historical data
         pass
     
-    async def collect_tender_results(self, tender_ids):
+    async def collect_tender_results(self, tender_ids, run_id=None):
         """
         Collect results for list of tenders
         
+        Lookups fan out over the driver pool with at most ``concurrency`` in
+        flight, and results are written in batches of ``batch_size`` as
+        upserts keyed on tender_id. Progress is checkpointed in
+        ``tender_result_runs`` after every batch. Tenders that already have
+        stored results are skipped, so re-running an interrupted collection
+        resumes where it stopped; lookups that failed are retried, and drop
+        off the run's ``failed`` list once they succeed.
+        
         Args:
             tender_ids: List of GeM tender IDs
+            run_id: Checkpoint key (defaults to a hash of the tender IDs)
         
         Returns:
             Number of results collected
         """
-        results_collected = 0
+        tender_ids = list(dict.fromkeys(tender_ids))
+        if run_id is None:
+            run_id = hashlib.sha1("\n".join(sorted(tender_ids)).encode()).hexdigest()
+        
+        skip = set()
+        for start in range(0, len(tender_ids), 1000):
+            chunk = tender_ids[start:start + 1000]
+            async for doc in self.db.tender_results.find({"tender_id": {"$in": chunk}}, {"tender_id": 1}):
+                skip.add(doc["tender_id"])
+        pending = [tid for tid in tender_ids if tid not in skip]
+        logger.info(f"Result run {run_id}: {len(pending)} of {len(tender_ids)} tenders left to collect")
         
-        for tender_id in tender_ids:
-            result = await self.scraper.get_tender_results(tender_id)
-            if result:
-                # Store in database
-                await self.db.tender_results.insert_one(result)
-                results_collected += 1
+        if not pending:
+            return 0
+        
+        # Concurrent lookups need one browser each, so always work off a pool
+        driver_pool = self.driver_pool or create_gem_driver_pool(size=self.concurrency)
+        scraper = GeMScraper(driver_pool=driver_pool)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        
+        async def fetch(tender_id):
+            async with semaphore:
+                return tender_id, await scraper.get_tender_results(tender_id)
+        
+        results_collected = 0
+        try:
+            for start in range(0, len(pending), self.batch_size):
+                batch = pending[start:start + self.batch_size]
+                fetched = await asyncio.gather(*(fetch(tid) for tid in batch))
+                
+                results = [result for _, result in fetched if result]
+                succeeded = [tid for tid, result in fetched if result]
+                failed = [tid for tid, result in fetched if not result]
+                if results:
+                    await self.db.tender_results.bulk_write(
+                        [UpdateOne({"tender_id": r["tender_id"]}, {"$set": r}, upsert=True) for r in results],
+                        ordered=False,
+                    )
+                    results_collected += len(results)
+                    # A separate update: $pull and $addToSet can't target "failed" together
+                    await self.db.tender_result_runs.update_one(
+                        {"_id": run_id}, {"$pull": {"failed": {"$in": succeeded}}})
+                
+                await self.db.tender_result_runs.update_one(
+                    {"_id": run_id},
+                    {
+                        "$inc": {"collected": len(results), "processed": len(batch)},
+                        "$addToSet": {"failed": {"$each": failed}},
+                        "$set": {"total": len(tender_ids), "updated_at": datetime.now(timezone.utc)},
+                    },
+                    upsert=True,
+                )
+        finally:
+            if driver_pool is not self.driver_pool:
+                # Quitting the browsers blocks
+                await asyncio.to_thread(driver_pool.close)
         
         return results_collected
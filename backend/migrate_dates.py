@@ -0,0 +1,142 @@
+"""Date Migration - Rewrite ISO-string dates to native BSON datetimes
+
+Batched and resumable: progress is checkpointed per collection in the
+``migrations`` collection, so an interrupted run continues from the last
+processed ``_id``. Collections already migrated are checked again for
+string dates written since, and rescanned if any are found.
+
+Usage:
+    python migrate_dates.py [--batch-size 1000] [--collection tenders] [--restart]
+"""
+import argparse
+import asyncio
+import logging
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from pymongo import UpdateOne
+
+from persistence import DATE_FIELDS, coerce_dates
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINTS = "migrations"
+
+
+def _string_filter(fields: Iterable[str]) -> Dict:
+    """Match documents that still hold at least one string date"""
+    return {"$or": [{field: {"$type": "string"}} for field in fields]}
+
+
+async def migrate_collection(db, name: str, fields: Iterable[str], batch_size: int = 1000,
+                             restart: bool = False) -> int:
+    """
+    Convert string dates in one collection
+
+    Args:
+        db: Motor database
+        name: Collection name
+        fields: Date fields to convert (see DATE_FIELDS)
+        batch_size: Documents per bulk_write
+        restart: Ignore any saved checkpoint
+
+    Returns:
+        Number of documents rewritten in this run
+    """
+    fields = tuple(fields)
+    checkpoint_id = f"dates:{name}"
+    checkpoint = None if restart else await db[CHECKPOINTS].find_one({"_id": checkpoint_id})
+    last_id = checkpoint.get("last_id") if checkpoint else None
+    if checkpoint and checkpoint.get("done"):
+        # Old writers, restores or imports may have added string dates since;
+        # they can sit at any _id, so rescan from the start if there are any
+        if await db[name].find_one(_string_filter(fields), {"_id": 1}) is None:
+            logger.info(f"{name}: already migrated")
+            return 0
+        logger.info(f"{name}: string dates found after the last migration, rescanning")
+        last_id = None
+    migrated = 0
+    # Only top-level field names are needed for the projection
+    projection = {field.split(".", 1)[0]: 1 for field in fields}
+
+    while True:
+        query = _string_filter(fields)
+        if last_id is not None:
+            query = {"$and": [{"_id": {"$gt": last_id}}, query]}
+        batch = await db[name].find(query, projection).sort("_id", 1).limit(batch_size).to_list(batch_size)
+        if not batch:
+            break
+
+        operations = []
+        for doc in batch:
+            original_id = doc["_id"]
+            coerce_dates(doc, fields)
+            changes = {key: doc[key] for key in projection if key in doc}
+            operations.append(UpdateOne({"_id": original_id}, {"$set": changes}))
+
+        await db[name].bulk_write(operations, ordered=False)
+        migrated += len(operations)
+        last_id = batch[-1]["_id"]
+        await db[CHECKPOINTS].update_one(
+            {"_id": checkpoint_id},
+            {"$set": {"last_id": last_id, "updated_at": datetime.now(timezone.utc)},
+             "$inc": {"migrated": len(operations)}},
+            upsert=True,
+        )
+        logger.info(f"{name}: migrated {migrated} documents")
+
+    await db[CHECKPOINTS].update_one(
+        {"_id": checkpoint_id},
+        {"$set": {"done": True, "updated_at": datetime.now(timezone.utc)}},
+        upsert=True,
+    )
+    return migrated
+
+
+async def migrate_all(db, batch_size: int = 1000, collection: Optional[str] = None,
+                      restart: bool = False) -> Dict[str, int]:
+    """
+    Convert string dates in every collection listed in DATE_FIELDS
+
+    Args:
+        db: Motor database
+        batch_size: Documents per bulk_write
+        collection: Limit the run to one collection
+        restart: Ignore saved checkpoints
+
+    Returns:
+        Mapping of collection name to documents rewritten
+    """
+    results = {}
+    for name, fields in DATE_FIELDS.items():
+        if collection and name != collection:
+            continue
+        results[name] = await migrate_collection(db, name, fields, batch_size=batch_size, restart=restart)
+    return results
+
+
+async def _main(args) -> None:
+    from dotenv import load_dotenv
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    load_dotenv(Path(__file__).parent / '.env')
+    client = AsyncIOMotorClient(os.environ['MONGO_URL'], tz_aware=True)
+    db = client[os.environ['DB_NAME']]
+    try:
+        results = await migrate_all(db, batch_size=args.batch_size, collection=args.collection,
+                                    restart=args.restart)
+        for name, count in results.items():
+            print(f"{name:25} {count} documents migrated")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert ISO-string dates to BSON datetimes")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--collection", choices=sorted(DATE_FIELDS))
+    parser.add_argument("--restart", action="store_true", help="ignore saved checkpoints")
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_main(parser.parse_args()))
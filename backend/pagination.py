@@ -0,0 +1,108 @@
+"""Pagination - Keyset (cursor) pagination helpers for Mongo list endpoints"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from pymongo import ASCENDING, DESCENDING
+
+# Sort keys supported by keyset pagination and their direction
+TENDER_SORTS = {
+    "submission_deadline": ASCENDING,  # closing soonest first
+    "published_date": DESCENDING,      # newest first
+    "threat_score": DESCENDING,        # most contested first
+}
+
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor cannot be decoded or does not match the request"""
+
+
+def _encode_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, datetime):
+        return {"t": "dt", "v": value.isoformat()}
+    return {"t": "raw", "v": value}
+
+
+def _decode_value(payload: Dict[str, Any]) -> Any:
+    if payload.get("t") == "dt":
+        return datetime.fromisoformat(payload["v"])
+    return payload.get("v")
+
+
+def encode_cursor(sort: str, last_doc: Dict[str, Any]) -> str:
+    """
+    Build an opaque cursor pointing just past ``last_doc``
+
+    Args:
+        sort: Sort key the page was ordered by
+        last_doc: Last document of the current page
+
+    Returns:
+        URL-safe cursor string
+    """
+    payload = {"s": sort, "k": _encode_value(last_doc.get(sort)), "id": last_doc["id"]}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, Any, str]:
+    """
+    Decode a cursor produced by encode_cursor
+
+    Args:
+        cursor: Opaque cursor string
+
+    Returns:
+        Tuple of (sort key, last sort value, last id)
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return payload["s"], _decode_value(payload["k"]), payload["id"]
+    except Exception as e:
+        raise InvalidCursor("Malformed cursor") from e
+
+
+def keyset_query(query: Dict[str, Any], sort: str, cursor: Optional[str]) -> Tuple[Dict[str, Any], List[Tuple[str, int]]]:
+    """
+    Extend a filter with the keyset condition for the next page
+
+    Args:
+        query: Base Mongo filter
+        sort: Sort key (one of TENDER_SORTS)
+        cursor: Cursor from the previous page, or None for the first page
+
+    Returns:
+        Tuple of (filter, sort specification) ordered by (sort key, id)
+    """
+    if sort not in TENDER_SORTS:
+        raise InvalidCursor(f"Unsupported sort key: {sort}")
+    direction = TENDER_SORTS[sort]
+    sort_spec = [(sort, direction), ("id", direction)]
+    if not cursor:
+        return query, sort_spec
+
+    cursor_sort, last_value, last_id = decode_cursor(cursor)
+    if cursor_sort != sort:
+        raise InvalidCursor("Cursor was issued for a different sort key")
+
+    op = "$gt" if direction == ASCENDING else "$lt"
+    # Null and missing values sort below every number and date: first when
+    # ascending, last when descending. Range operators never match them, so
+    # they need their own branches or those documents are unreachable.
+    if last_value is None:
+        keyset = {sort: None, "id": {op: last_id}}
+        if direction == ASCENDING:
+            keyset = {"$or": [keyset, {sort: {"$ne": None}}]}
+    else:
+        branches = [
+            {sort: {op: last_value}},
+            {sort: last_value, "id": {op: last_id}},
+        ]
+        if direction == DESCENDING:
+            branches.append({sort: None})
+        keyset = {"$or": branches}
+    if query:
+        return {"$and": [query, keyset]}, sort_spec
+    return keyset, sort_spec
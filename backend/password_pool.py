@@ -0,0 +1,115 @@
+"""Password Pool - Run bcrypt hashing and verification off the event loop"""
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict
+
+from passlib.context import CryptContext
+
+logger = logging.getLogger(__name__)
+
+
+class PasswordPoolSaturated(Exception):
+    """Raised when too many password operations are already waiting"""
+
+
+class PasswordHasher:
+    """Bounded thread pool for bcrypt work
+
+    bcrypt releases the GIL while hashing, so a small dedicated thread pool
+    keeps logins from stalling the event loop. Concurrency is capped by the
+    pool size and callers beyond ``max_queue`` waiting operations are rejected
+    instead of piling up behind a login burst.
+    """
+
+    def __init__(self, pwd_context: CryptContext, max_workers: int = 4, max_queue: int = 100):
+        self.pwd_context = pwd_context
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password")
+        self._semaphore = None
+        self.in_flight = 0
+        self.queued = 0
+        self.max_queue_depth = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_wait_seconds = 0.0
+        self.total_run_seconds = 0.0
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # Created lazily so it binds to the running loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_workers)
+        return self._semaphore
+
+    async def _run(self, func, *args):
+        if self.queued >= self.max_queue:
+            self.rejected += 1
+            raise PasswordPoolSaturated("Too many pending password operations")
+
+        self.queued += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.queued)
+        enqueued = time.perf_counter()
+        acquired = False
+        try:
+            async with self._get_semaphore():
+                acquired = True
+                self.queued -= 1
+                self.in_flight += 1
+                started = time.perf_counter()
+                self.total_wait_seconds += started - enqueued
+                try:
+                    loop = asyncio.get_running_loop()
+                    return await loop.run_in_executor(self._executor, func, *args)
+                finally:
+                    self.in_flight -= 1
+                    self.completed += 1
+                    self.total_run_seconds += time.perf_counter() - started
+        finally:
+            if not acquired:
+                # Cancelled while waiting for a worker slot
+                self.queued -= 1
+
+    async def hash(self, password: str) -> str:
+        """
+        Hash a password in the pool
+
+        Args:
+            password: Plain-text password
+
+        Returns:
+            bcrypt hash
+        """
+        return await self._run(self.pwd_context.hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """
+        Verify a password in the pool
+
+        Args:
+            plain_password: Password supplied by the user
+            hashed_password: Stored bcrypt hash
+
+        Returns:
+            True if the password matches
+        """
+        return await self._run(self.pwd_context.verify, plain_password, hashed_password)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return concurrency and queue-depth metrics"""
+        return {
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "max_queue_depth": self.max_queue_depth,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_wait_ms": round(self.total_wait_seconds / self.completed * 1000, 2) if self.completed else 0.0,
+            "avg_run_ms": round(self.total_run_seconds / self.completed * 1000, 2) if self.completed else 0.0,
+        }
+
+    def shutdown(self) -> None:
+        """Stop the worker threads"""
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,87 @@
+"""Persistence - Typed document conversion with native BSON datetimes"""
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Optional
+
+from pydantic import BaseModel
+
+# Datetime fields per collection. Dotted paths address a field inside each
+# element of an array (e.g. support ticket responses).
+DATE_FIELDS: Dict[str, tuple] = {
+    "users": ("created_at",),
+    "tenders": ("published_date", "submission_deadline", "created_at"),
+    "notifications": ("created_at",),
+    "support_tickets": ("created_at", "responses.timestamp"),
+    "subscriptions": ("start_date", "end_date", "created_at"),
+    "tender_analyses": ("created_at",),
+    "competitor_analyses": ("created_at",),
+    "win_predictions": ("created_at",),
+    "boqs": ("created_at",),
+    "crm_contacts": ("created_at",),
+    "price_analyses": ("created_at",),
+    "product_recommendations": ("created_at",),
+}
+
+
+def parse_datetime(value: Any) -> Optional[datetime]:
+    """
+    Convert a stored value to a timezone-aware UTC datetime
+
+    Args:
+        value: datetime, ISO-8601 string or None
+
+    Returns:
+        Aware datetime, or None if the value is empty or unparseable
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    if not isinstance(value, datetime):
+        return None
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def coerce_dates(doc: Dict[str, Any], fields: Iterable[str]) -> Dict[str, Any]:
+    """
+    Convert string dates in a raw document to datetimes, in place
+
+    Values that cannot be parsed are left untouched.
+
+    Args:
+        doc: Document to update
+        fields: Field names (see DATE_FIELDS)
+
+    Returns:
+        The same document
+    """
+    for field in fields:
+        if "." in field:
+            array_field, item_field = field.split(".", 1)
+            for item in doc.get(array_field) or []:
+                if isinstance(item, dict):
+                    parsed = parse_datetime(item.get(item_field))
+                    if parsed is not None:
+                        item[item_field] = parsed
+        else:
+            parsed = parse_datetime(doc.get(field))
+            if parsed is not None:
+                doc[field] = parsed
+    return doc
+
+
+def to_document(model: BaseModel) -> Dict[str, Any]:
+    """
+    Dump a model for insertion, keeping datetimes native
+
+    Args:
+        model: Pydantic model instance
+
+    Returns:
+        Dict ready for insert_one
+    """
+    return model.model_dump()
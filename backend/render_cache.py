@@ -0,0 +1,132 @@
+"""Render Cache - Content-addressed cache of generated tender documents"""
+import asyncio
+import hashlib
+import json
+import threading
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+from cachetools import LRUCache
+
+
+class _SizedLRU(LRUCache):
+    # LRUCache that counts what it evicts to stay under its byte budget
+    def __init__(self, maxsize: int):
+        super().__init__(maxsize=maxsize, getsizeof=lambda document: len(document["content"]))
+        self.evictions = 0
+
+    def popitem(self):
+        item = super().popitem()
+        self.evictions += 1
+        return item
+
+
+class RenderCache:
+    """LRU of rendered documents keyed by a hash of everything that shapes them
+
+    The key covers the document type, its template version, the render date
+    (documents print today's date) and the exact inputs: the tender fields
+    the renderer reads plus the caller's company data, items or technical
+    details. Any change to those produces a new key; edits to unrelated
+    tender fields don't. Entries are evicted least-recently-used once the
+    cached bytes exceed ``max_bytes``, and concurrent requests for a
+    document that is still rendering wait for that one render, which
+    carries on if the request that started it is cancelled.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, max_item_bytes: int = 8 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        # LRUCache refuses single values larger than the whole cache
+        self.max_item_bytes = min(max_item_bytes, max_bytes)
+        self._cache = _SizedLRU(max_bytes)
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.shared = 0
+        self.misses = 0
+        self.skipped = 0
+
+    @staticmethod
+    def key(kind: str, version: str, day: str, *inputs: Any) -> str:
+        """
+        Content hash for a render
+
+        Args:
+            kind: Document type
+            version: Template version of that type
+            day: Render date as printed on the document
+            *inputs: Renderer arguments (JSON-serializable after str() of dates)
+
+        Returns:
+            Hex digest
+        """
+        payload = json.dumps([kind, version, day, *inputs], sort_keys=True, default=str, separators=(",", ":"))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    async def get_or_render(self, key: str,
+                            render: Callable[[], Awaitable[Dict[str, Any]]]) -> Tuple[Dict[str, Any], bool]:
+        """
+        Return the cached document for a key, rendering it on a miss
+
+        Args:
+            key: Output of key()
+            render: Coroutine factory producing the document on a miss
+
+        Returns:
+            (document, True if it was served without rendering)
+        """
+        with self._lock:
+            document = self._cache.get(key)
+        if document is not None:
+            self.hits += 1
+            return document, True
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.shared += 1
+            return await asyncio.shield(pending), True
+
+        self.misses += 1
+        # The render runs as its own task that every caller waits on through
+        # a shield, so a cancelled caller (the first one included) stops
+        # waiting without cancelling the render the others depend on
+        task = asyncio.ensure_future(self._render(key, render))
+        self._inflight[key] = task
+        task.add_done_callback(self._finished)
+        return await asyncio.shield(task), False
+
+    async def _render(self, key: str, render: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        try:
+            document = await render()
+        finally:
+            self._inflight.pop(key, None)
+        if len(document["content"]) <= self.max_item_bytes:
+            with self._lock:
+                self._cache[key] = document
+        else:
+            self.skipped += 1
+        return document
+
+    @staticmethod
+    def _finished(task: asyncio.Future) -> None:
+        # Every waiter may have been cancelled; don't log "exception never retrieved"
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache counters"""
+        with self._lock:
+            entries = len(self._cache)
+            size = self._cache.currsize
+            evictions = self._cache.evictions
+        lookups = self.hits + self.shared + self.misses
+        return {
+            "entries": entries,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "shared": self.shared,
+            "misses": self.misses,
+            "skipped_oversize": self.skipped,
+            "evictions": evictions,
+            "hit_ratio": round((self.hits + self.shared) / lookups, 3) if lookups else None,
+        }
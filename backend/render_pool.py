@@ -0,0 +1,229 @@
+"""Render Pool - Run DocumentGenerator rendering in worker processes"""
+import asyncio
+import logging
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Document type -> DocumentGenerator in-memory render method; any other type
+# is rendered from its template by DocumentGenerator.render_template
+RENDERERS = {
+    "boq": "render_boq",
+    "cover_letter": "render_cover_letter",
+    "company_profile": "render_company_profile",
+    "technical_bid": "render_technical_bid",
+}
+
+# One generator per worker process, built (templates compiled) when the worker starts
+_generator = None
+
+
+def _init_worker() -> None:
+    global _generator
+    from document_generator import DocumentGenerator
+    _generator = DocumentGenerator()
+
+
+def _render_in_worker(kind: str, args: tuple) -> Any:
+    if _generator is None:
+        _init_worker()
+    if kind in RENDERERS:
+        return getattr(_generator, RENDERERS[kind])(*args)
+    return _generator.render_template(kind, *args)
+
+
+class RenderPoolSaturated(Exception):
+    """Raised when too many renders of a document type are already waiting"""
+
+
+class RenderTimeout(Exception):
+    """Raised when a render does not finish within the pool's timeout"""
+
+
+class _TypeStats:
+    __slots__ = ("queued", "in_flight", "max_queue_depth", "completed", "failed", "timeouts",
+                 "rejected", "total_wait_seconds", "total_run_seconds")
+
+    def __init__(self):
+        self.queued = 0
+        self.in_flight = 0
+        self.max_queue_depth = 0
+        self.completed = 0
+        self.failed = 0
+        self.timeouts = 0
+        self.rejected = 0
+        self.total_wait_seconds = 0.0
+        self.total_run_seconds = 0.0
+
+    def as_dict(self, limit: int) -> Dict[str, Any]:
+        finished = self.completed + self.failed + self.timeouts
+        return {
+            "limit": limit,
+            "queued": self.queued,
+            "in_flight": self.in_flight,
+            "max_queue_depth": self.max_queue_depth,
+            "completed": self.completed,
+            "failed": self.failed,
+            "timeouts": self.timeouts,
+            "rejected": self.rejected,
+            "avg_wait_ms": round(self.total_wait_seconds / finished * 1000, 2) if finished else 0.0,
+            "avg_run_ms": round(self.total_run_seconds / finished * 1000, 2) if finished else 0.0,
+        }
+
+
+class DocumentRenderPool:
+    """Bounded process pool for openpyxl/python-docx rendering
+
+    Rendering is CPU-bound pure Python, so it runs in separate processes
+    rather than threads. Each document type has its own concurrency limit
+    (so a burst of large BOQs cannot take every worker) and its own waiting
+    queue capped at ``max_queue``; callers beyond that are rejected. A
+    render that exceeds ``timeout`` is reported to the caller as
+    RenderTimeout while its worker finishes in the background, still
+    holding its slot of the type's limit until it does.
+    """
+
+    def __init__(self, max_workers: int = 2, max_queue: int = 20, timeout: float = 60.0,
+                 type_limits: Optional[Dict[str, int]] = None):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        # Types without an explicit limit may use every worker
+        self.type_limits = {k: max(1, min(v, max_workers)) for k, v in (type_limits or {}).items() if k}
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._stats = {kind: _TypeStats() for kind in RENDERERS}
+        self.restarts = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        # Created lazily; spawn keeps workers clear of the server's threads and sockets
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker)
+        return self._executor
+
+    def _get_semaphore(self, kind: str) -> asyncio.Semaphore:
+        # Created lazily so it binds to the running loop
+        if kind not in self._semaphores:
+            self._semaphores[kind] = asyncio.Semaphore(self.type_limits.get(kind, self.max_workers))
+        return self._semaphores[kind]
+
+    async def render(self, kind: str, *args) -> Any:
+        """
+        Render a document in the pool
+
+        Args:
+            kind: Document type (a key of RENDERERS or a template name)
+            *args: Arguments for the DocumentGenerator method
+
+        Returns:
+            Whatever the DocumentGenerator method returns
+        """
+        stats = self._stats.setdefault(kind, _TypeStats())
+        if stats.queued >= self.max_queue:
+            stats.rejected += 1
+            raise RenderPoolSaturated(f"Too many pending {kind} renders")
+
+        stats.queued += 1
+        stats.max_queue_depth = max(stats.max_queue_depth, stats.queued)
+        enqueued = time.perf_counter()
+        semaphore = self._get_semaphore(kind)
+        try:
+            await semaphore.acquire()
+        finally:
+            # Dequeued either way; cancelled callers never got a slot
+            stats.queued -= 1
+        stats.in_flight += 1
+        started = time.perf_counter()
+        stats.total_wait_seconds += started - enqueued
+
+        def finished(done: asyncio.Future) -> None:
+            # The slot is held until the worker is actually done, so renders
+            # abandoned by a timeout or a cancelled caller still count
+            # against the type's limit instead of piling up in the executor
+            stats.in_flight -= 1
+            stats.total_run_seconds += time.perf_counter() - started
+            semaphore.release()
+            if not done.cancelled():
+                done.exception()  # retrieved, even if nobody awaits it any more
+
+        executor = self._get_executor()
+        try:
+            future = asyncio.get_running_loop().run_in_executor(executor, _render_in_worker, kind, args)
+        except Exception as e:
+            stats.failed += 1
+            stats.in_flight -= 1
+            semaphore.release()
+            if isinstance(e, BrokenProcessPool):
+                self._restart(executor)
+            raise
+        future.add_done_callback(finished)
+
+        try:
+            result = await asyncio.wait_for(asyncio.shield(future), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            stats.timeouts += 1
+            logger.error(f"{kind} render timed out after {self.timeout}s")
+            raise RenderTimeout(f"{kind} render timed out")
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM on a huge BOQ); start a fresh pool for the next render
+            stats.failed += 1
+            self._restart(executor)
+            raise
+        except Exception:
+            stats.failed += 1
+            raise
+        stats.completed += 1
+        return result
+
+    def _restart(self, executor: ProcessPoolExecutor) -> None:
+        # Every render on a broken pool fails; only the first to notice
+        # replaces it, so later failures don't tear down its healthy successor
+        if executor is not self._executor:
+            return
+        self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+        self.restarts += 1
+        logger.error("Document render pool broken; restarting workers")
+
+    def stats(self) -> Dict[str, Any]:
+        """Return per-type queue and latency metrics"""
+        return {
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "timeout_seconds": self.timeout,
+            "restarts": self.restarts,
+            "types": {kind: s.as_dict(self.type_limits.get(kind, self.max_workers))
+                      for kind, s in self._stats.items()},
+        }
+
+    def shutdown(self) -> None:
+        """Stop the worker processes"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+def parse_type_limits(value: str) -> Dict[str, int]:
+    """
+    Parse per-type limits from an env value such as ``boq=1,technical_bid=2``
+
+    Args:
+        value: Comma-separated type=limit pairs
+
+    Returns:
+        Mapping of document type to limit (malformed pairs are skipped)
+    """
+    limits = {}
+    for pair in value.split(","):
+        kind, _, limit = pair.partition("=")
+        try:
+            limits[kind.strip()] = int(limit)
+        except ValueError:
+            continue
+    return limits
@@ -0,0 +1,181 @@
+"""Scrape Jobs - Mongo-backed background job queue for GeM scrapes"""
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from pymongo import ReturnDocument
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+
+class JobQueueFull(Exception):
+    """Raised when too many jobs are already waiting"""
+
+
+class ScrapeJobQueue:
+    """Background scrape jobs persisted in the ``scrape_jobs`` collection
+
+    Jobs are claimed atomically with ``find_one_and_update``, so several API
+    processes on one box can share the queue without extra services. Workers
+    are woken immediately on enqueue and otherwise poll every
+    ``poll_interval`` seconds.
+
+    ``runner(job, progress)`` does the work: ``progress(**counts)`` records
+    progress on the job document and the returned dict is stored as the result.
+    """
+
+    def __init__(self, db, runner: Callable[[Dict[str, Any], Callable[..., Awaitable[None]]], Awaitable[Dict[str, Any]]],
+                 workers: int = 1, max_pending: int = 50, poll_interval: float = 5.0,
+                 stale_after: float = 1800.0):
+        self.collection = db.scrape_jobs
+        self.runner = runner
+        self.workers = workers
+        self.max_pending = max_pending
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after
+        self._wakeup = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+        self._running: Dict[int, str] = {}
+
+    async def start(self) -> None:
+        """Requeue jobs orphaned by a crashed process and start the workers"""
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.stale_after)
+        requeued = await self.collection.update_many(
+            {"status": JOB_RUNNING, "updated_at": {"$lt": cutoff}},
+            {"$set": {"status": JOB_QUEUED, "updated_at": datetime.now(timezone.utc)}},
+        )
+        if requeued.modified_count:
+            logger.warning(f"Requeued {requeued.modified_count} stale scrape jobs")
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+
+    async def stop(self) -> None:
+        """Cancel the workers and put their interrupted jobs back in the queue"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._running:
+            await self.collection.update_many(
+                {"id": {"$in": list(self._running.values())}, "status": JOB_RUNNING},
+                {"$set": {"status": JOB_QUEUED, "updated_at": datetime.now(timezone.utc)}},
+            )
+            self._running.clear()
+
+    async def enqueue(self, params: Dict[str, Any], user_id: str) -> Dict[str, Any]:
+        """
+        Queue a scrape job
+
+        Args:
+            params: Keyword arguments for the runner (category, limit, ...)
+            user_id: Requesting user
+
+        Returns:
+            The job document
+        """
+        pending = await self.collection.count_documents({"status": JOB_QUEUED})
+        if pending >= self.max_pending:
+            raise JobQueueFull(f"{pending} scrape jobs already queued")
+
+        now = datetime.now(timezone.utc)
+        job = {
+            "id": str(uuid.uuid4()),
+            "user_id": user_id,
+            "params": params,
+            "status": JOB_QUEUED,
+            "progress": {},
+            "result": None,
+            "error": None,
+            "created_at": now,
+            "updated_at": now,
+            "started_at": None,
+            "finished_at": None,
+        }
+        await self.collection.insert_one(dict(job))
+        self._wakeup.set()
+        return job
+
+    async def get(self, job_id: str, user_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Fetch a job, optionally restricted to its owner"""
+        query = {"id": job_id}
+        if user_id is not None:
+            query["user_id"] = user_id
+        return await self.collection.find_one(query, {"_id": 0})
+
+    async def list(self, user_id: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """List a user's most recent jobs"""
+        return await self.collection.find({"user_id": user_id}, {"_id": 0}).sort("created_at", -1).limit(limit).to_list(limit)
+
+    async def _claim(self) -> Optional[Dict[str, Any]]:
+        now = datetime.now(timezone.utc)
+        return await self.collection.find_one_and_update(
+            {"status": JOB_QUEUED},
+            {"$set": {"status": JOB_RUNNING, "started_at": now, "updated_at": now}},
+            sort=[("created_at", 1)],
+            projection={"_id": 0},
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def _run(self, job: Dict[str, Any]) -> None:
+        async def progress(**counts):
+            update = {f"progress.{k}": v for k, v in counts.items()}
+            update["updated_at"] = datetime.now(timezone.utc)
+            await self.collection.update_one({"id": job["id"]}, {"$set": update})
+
+        try:
+            result = await self.runner(job, progress)
+            status, error = JOB_COMPLETED, None
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.exception(f"Scrape job {job['id']} failed")
+            result, status, error = None, JOB_FAILED, str(e)
+
+        now = datetime.now(timezone.utc)
+        await self.collection.update_one(
+            {"id": job["id"]},
+            {"$set": {"status": status, "result": result, "error": error,
+                      "finished_at": now, "updated_at": now}},
+        )
+
+    async def _worker(self, index: int) -> None:
+        while True:
+            # Cleared before claiming so an enqueue during the claim is not missed
+            self._wakeup.clear()
+            try:
+                job = await self._claim()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Scrape worker {index} could not claim a job: {e}")
+                job = None
+
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            logger.info(f"Scrape worker {index} running job {job['id']}")
+            self._running[index] = job["id"]
+            await self._run(job)
+            self._running.pop(index, None)
+
+    async def stats(self) -> Dict[str, Any]:
+        """Return worker configuration and job counts by status"""
+        counts = await self.collection.aggregate([
+            {"$group": {"_id": "$status", "count": {"$sum": 1}}},
+        ]).to_list(None)
+        return {
+            "workers": self.workers,
+            "running_workers": sum(1 for t in self._tasks if not t.done()),
+            "max_pending": self.max_pending,
+            "jobs": {c["_id"]: c["count"] for c in counts},
+        }
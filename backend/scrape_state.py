@@ -0,0 +1,93 @@
+"""Scrape State - Persistent bookkeeping for incremental GeM scrapes"""
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Bid numbers remembered per listing; enough to cover several full listing
+# traversals between steady-state runs
+MAX_SEEN_IDS = 5000
+
+
+def scrape_state_key(category: Optional[str] = None) -> str:
+    """State document key for the active bids listing, per category filter"""
+    return f"gem:activeBids:{category or 'all'}"
+
+
+class ScrapeState:
+    """Last-seen bid numbers and HTTP validators for one listing
+
+    Stored in the ``scrape_state`` collection. The scraper reads the
+    validators to send conditional requests, consults ``is_known`` to stop
+    early and collects the bid numbers of every card it got past in
+    ``scanned_ids`` (including those a category filter dropped); the caller
+    ``remember``s them and saves the state once the tenders have been
+    written.
+    """
+
+    def __init__(self, key: str, etag: Optional[str] = None, last_modified: Optional[str] = None,
+                 seen_ids: Optional[List[str]] = None, max_seen: int = MAX_SEEN_IDS):
+        self.key = key
+        self.etag = etag
+        self.last_modified = last_modified
+        self.max_seen = max_seen
+        # Newest first, so truncation drops the oldest bid numbers
+        self.seen_ids: List[str] = list(seen_ids or [])[:max_seen]
+        self._seen = set(self.seen_ids)
+        self.scanned_ids: List[str] = []
+        self.not_modified = False
+        self.reached_known = False
+
+    @classmethod
+    async def load(cls, db, key: str, max_seen: int = MAX_SEEN_IDS) -> "ScrapeState":
+        """Load the state for ``key``, or a fresh one on the first run"""
+        doc = await db.scrape_state.find_one({"_id": key})
+        if not doc:
+            return cls(key, max_seen=max_seen)
+        return cls(key, etag=doc.get("etag"), last_modified=doc.get("last_modified"),
+                   seen_ids=doc.get("seen_ids"), max_seen=max_seen)
+
+    def is_known(self, tender_id: Optional[str]) -> bool:
+        return tender_id in self._seen
+
+    def set_validators(self, etag: Optional[str], last_modified: Optional[str]) -> None:
+        """Record the ETag/Last-Modified of a listing response"""
+        self.etag = etag
+        self.last_modified = last_modified
+
+    def scanned(self, tender_ids: Iterable[str]) -> None:
+        """Collect bid numbers passed during this scrape, to remember once ingested"""
+        self.scanned_ids.extend(tender_ids)
+
+    def remember(self, tender_ids: Iterable[str]) -> None:
+        """
+        Mark bid numbers as seen
+
+        Args:
+            tender_ids: Bid numbers in listing order (newest first)
+        """
+        fresh = [t for t in dict.fromkeys(tender_ids) if t and t not in self._seen]
+        if not fresh:
+            return
+        self.seen_ids = (fresh + self.seen_ids)[:self.max_seen]
+        self._seen = set(self.seen_ids)
+
+    async def save(self, db) -> None:
+        await db.scrape_state.update_one(
+            {"_id": self.key},
+            {"$set": {
+                "etag": self.etag,
+                "last_modified": self.last_modified,
+                "seen_ids": self.seen_ids,
+                "updated_at": datetime.now(timezone.utc),
+            }},
+            upsert=True,
+        )
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "not_modified": self.not_modified,
+            "reached_known": self.reached_known,
+            "seen_ids": len(self.seen_ids),
+        }
@@ -1,13 +1,16 @@
 from fastapi import FastAPI, APIRouter, Depends, HTTPException, status, File, UploadFile
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi.responses import FileResponse, StreamingResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+import asyncio
+import heapq
 import os
 import logging
 from pathlib import Path
 from pydantic import BaseModel, Field, ConfigDict, EmailStr
-from typing import List, Optional, Dict, Any
+from typing import List, Literal, Optional, Dict, Any
 import uuid
 from datetime import datetime, timezone, timedelta
 from passlib.context import CryptContext
@@ -15,28 +18,79 @@ from jose import JWTError, jwt
 import random
 import io
 from PyPDF2 import PdfReader
-from gem_scraper import GeMScraper, HistoricalDataCollector
-from document_generator import DocumentGenerator
-from ai_models.competitor_model import SimpleCompetitorModel, analyze_market
+from gem_scraper import GeMScraper, HistoricalDataCollector, create_gem_driver_pool
+from gem_fetch import default_fetcher as gem_http_fetcher
+from document_generator import TEMPLATE_TENDER_FIELDS, TENDER_FIELDS, DocumentGenerator
+from render_pool import RENDERERS, DocumentRenderPool, RenderPoolSaturated, RenderTimeout, parse_type_limits
+from render_cache import RenderCache
+from ai_models.competitor_model import analyze_market
+from ai_models.model_registry import CompetitorModelRegistry
+from ai_models.win_model import WinProbabilityModel
+from auth_cache import UserCache
+from password_pool import PasswordHasher, PasswordPoolSaturated
+from db_indexes import ensure_indexes, verify_query_plans
+from pagination import InvalidCursor, encode_cursor, keyset_query
+from persistence import coerce_dates, to_document
+from fast_json import FastJSONResponse
+from tender_ingest import achunked, bulk_upsert_tenders, iter_csv, iter_in_thread, iter_jsonl
+from scrape_jobs import JobQueueFull, ScrapeJobQueue
+from scrape_state import ScrapeState, scrape_state_key
+from document_store import DocumentStore
+from analysis_cache import CompetitorAnalysisCache
+from threat_scoring import THREAT_FIELDS, THREAT_LEVELS, annotate_threat, rescore_tenders
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
 # MongoDB connection
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+# tz_aware so native BSON dates come back as aware UTC datetimes
+client = AsyncIOMotorClient(mongo_url, tz_aware=True)
 db = client[os.environ['DB_NAME']]
 
 # Security
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+password_hasher = PasswordHasher(
+    pwd_context,
+    max_workers=int(os.getenv('PASSWORD_POOL_WORKERS', 4)),
+    max_queue=int(os.getenv('PASSWORD_POOL_MAX_QUEUE', 100)),
+)
 security = HTTPBearer()
 
 JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY')
 JWT_ALGORITHM = os.getenv('JWT_ALGORITHM', 'HS256')
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv('ACCESS_TOKEN_EXPIRE_MINUTES', 43200))
+# Trust the user claims signed into the JWT on hot read-only routes instead of
+# re-reading the user from Mongo
+JWT_TRUST_CLAIMS = os.getenv('JWT_TRUST_CLAIMS', 'false').lower() in ('1', 'true', 'yes')
+# How often each worker picks up privilege changes made on other workers
+JWT_REVOCATION_SYNC_SECONDS = float(os.getenv('JWT_REVOCATION_SYNC_SECONDS', 5))
+
+user_cache = UserCache(
+    maxsize=int(os.getenv('USER_CACHE_MAX_SIZE', 10000)),
+    ttl=float(os.getenv('USER_CACHE_TTL_SECONDS', 60)),
+    revocation_ttl=ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+)
 
 ASSISTANT_NAME = os.getenv('AI_ASSISTANT_NAME', 'HexaBid Assistant')
 
+# Competitor model configs are loaded once and hot-reloaded when the files change
+competitor_models = CompetitorModelRegistry(
+    weights_path=os.getenv('COMPETITOR_WEIGHTS_PATH', str(ROOT_DIR / 'ai_models' / 'competitor_weights.json')),
+    competitors_path=os.getenv('COMPETITOR_CONFIG_PATH', str(ROOT_DIR / 'ai_models' / 'competitors.json')),
+    check_interval=float(os.getenv('COMPETITOR_MODEL_CHECK_SECONDS', 5)),
+)
+# Win-probability weights are produced offline by train_win_model.py
+win_models = CompetitorModelRegistry(
+    weights_path=os.getenv('WIN_MODEL_WEIGHTS_PATH', str(ROOT_DIR / 'ai_models' / 'win_weights.json')),
+    check_interval=float(os.getenv('COMPETITOR_MODEL_CHECK_SECONDS', 5)),
+    model_cls=WinProbabilityModel,
+)
+competitor_analysis_cache = CompetitorAnalysisCache(
+    db,
+    maxsize=int(os.getenv('COMPETITOR_ANALYSIS_CACHE_SIZE', 5000)),
+)
+
 
 def _format_currency(value: float) -> str:
     try:
@@ -179,6 +233,11 @@ class UserLogin(BaseModel):
     email: EmailStr
     password: str
 
+class UserStatusUpdate(BaseModel):
+    role: Optional[Literal["super_admin", "contractor", "vendor", "oem", "consultant"]] = None
+    is_active: Optional[bool] = None
+    kyc_verified: Optional[bool] = None
+
 class Token(BaseModel):
     access_token: str
     token_type: str
@@ -201,6 +260,8 @@ class Tender(BaseModel):
     source: str = "GeM"  # GeM, MSME, etc.
     eligibility_criteria: List[str] = []
     technical_specs: Dict[str, Any] = {}
+    threat_score: Optional[float] = None
+    threat_level: Optional[str] = None
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 class TenderAnalysis(BaseModel):
@@ -217,13 +278,15 @@ class TenderAnalysis(BaseModel):
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 class CompetitorAnalysis(BaseModel):
-    model_config = ConfigDict(extra="ignore")
+    model_config = ConfigDict(extra="ignore", protected_namespaces=())
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     tender_id: str
     competitors: List[Dict[str, Any]]
     market_analysis: str
     competitive_advantage: List[str]
     threat_level: str
+    model_version: Optional[str] = None
+    feature_hash: Optional[str] = None
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 class WinPrediction(BaseModel):
@@ -333,20 +396,32 @@ class Subscription(BaseModel):
 
 # ===== HELPER FUNCTIONS =====
 
-def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+async def get_password_hash(password: str) -> str:
+    try:
+        return await password_hasher.hash(password)
+    except PasswordPoolSaturated:
+        raise HTTPException(status_code=503, detail="Authentication service busy, please retry")
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    try:
+        return await password_hasher.verify(plain_password, hashed_password)
+    except PasswordPoolSaturated:
+        raise HTTPException(status_code=503, detail="Authentication service busy, please retry")
 
 def create_access_token(data: dict) -> str:
     to_encode = data.copy()
-    expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
+    now = datetime.now(timezone.utc)
+    expire = now + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    to_encode.update({"exp": expire, "iat": now})
     encoded_jwt = jwt.encode(to_encode, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
     return encoded_jwt
 
-async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> User:
+def create_user_token(user: User) -> str:
+    """Issue a token carrying the user's signed claims"""
+    claims = user.model_dump(mode="json")
+    return create_access_token(data={"sub": user.id, "usr": claims})
+
+def decode_access_token(credentials: HTTPAuthorizationCredentials) -> Dict[str, Any]:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -355,19 +430,43 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
     try:
         token = credentials.credentials
         payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
-        user_id: str = payload.get("sub")
-        if user_id is None:
+        if payload.get("sub") is None:
             raise credentials_exception
     except JWTError:
         raise credentials_exception
-    
-    user_doc = await db.users.find_one({"id": user_id}, {"_id": 0})
+    return payload
+
+async def load_user(user_id: str) -> User:
+    """Resolve a user through the in-process cache, falling back to Mongo"""
+    user_doc = user_cache.get(user_id)
     if user_doc is None:
-        raise credentials_exception
-    if isinstance(user_doc['created_at'], str):
-        user_doc['created_at'] = datetime.fromisoformat(user_doc['created_at'])
+        user_doc = await db.users.find_one({"id": user_id}, {"_id": 0, "hashed_password": 0})
+        if user_doc is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Could not validate credentials",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        user_cache.set(user_id, user_doc)
     return User(**user_doc)
 
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> User:
+    payload = decode_access_token(credentials)
+    return await load_user(payload["sub"])
+
+async def get_current_user_claims(credentials: HTTPAuthorizationCredentials = Depends(security)) -> User:
+    """Stateless variant of get_current_user for hot read-only routes
+
+    Builds the user straight from the signed ``usr`` claim when JWT_TRUST_CLAIMS
+    is enabled and the user has not been invalidated since the token was issued.
+    """
+    payload = decode_access_token(credentials)
+    user_id = payload["sub"]
+    claims = payload.get("usr")
+    if JWT_TRUST_CLAIMS and claims and user_cache.claims_valid(user_id, payload.get("iat")):
+        return User(**claims)
+    return await load_user(user_id)
+
 # Mock data generators
 def generate_mock_tenders() -> List[Dict]:
     categories = ["IT Services", "Construction", "Medical Equipment", "Office Supplies", "Consulting"]
@@ -386,8 +485,8 @@ def generate_mock_tenders() -> List[Dict]:
             "emd_amount": round(random.uniform(10000, 500000), 2),
             "category": random.choice(categories),
             "location": random.choice(locations),
-            "published_date": (datetime.now(timezone.utc) - timedelta(days=random.randint(1, 30))).isoformat(),
-            "submission_deadline": (datetime.now(timezone.utc) + timedelta(days=random.randint(10, 60))).isoformat(),
+            "published_date": datetime.now(timezone.utc) - timedelta(days=random.randint(1, 30)),
+            "submission_deadline": datetime.now(timezone.utc) + timedelta(days=random.randint(10, 60)),
             "status": "active",
             "source": "GeM",
             "eligibility_criteria": [
@@ -396,7 +495,7 @@ def generate_mock_tenders() -> List[Dict]:
                 "Valid PAN and Aadhaar"
             ],
             "technical_specs": {"compliance": "ISO certified", "warranty": "2 years"},
-            "created_at": datetime.now(timezone.utc).isoformat()
+            "created_at": datetime.now(timezone.utc)
         }
         tenders.append(tender)
     return tenders
@@ -411,7 +510,7 @@ async def register(user_data: UserCreate):
         raise HTTPException(status_code=400, detail="Email already registered")
     
     # Create user
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await get_password_hash(user_data.password)
     user = User(
         email=user_data.email,
         full_name=user_data.full_name,
@@ -419,37 +518,33 @@ async def register(user_data: UserCreate):
         role=user_data.role
     )
     
-    user_doc = user.model_dump()
-    user_doc['created_at'] = user_doc['created_at'].isoformat()
+    user_doc = to_document(user)
     user_doc['hashed_password'] = hashed_password
     
     await db.users.insert_one(user_doc)
     
     # Create token
-    access_token = create_access_token(data={"sub": user.id})
+    access_token = create_user_token(user)
     
     return Token(access_token=access_token, token_type="bearer", user=user)
 
 @api_router.post("/auth/login", response_model=Token)
 async def login(credentials: UserLogin):
     user_doc = await db.users.find_one({"email": credentials.email})
-    if not user_doc or not verify_password(credentials.password, user_doc.get('hashed_password', '')):
+    if not user_doc or not await verify_password(credentials.password, user_doc.get('hashed_password', '')):
         raise HTTPException(status_code=401, detail="Invalid email or password")
     
-    if isinstance(user_doc['created_at'], str):
-        user_doc['created_at'] = datetime.fromisoformat(user_doc['created_at'])
-    
     user = User(**{k: v for k, v in user_doc.items() if k != 'hashed_password'})
-    access_token = create_access_token(data={"sub": user.id})
+    access_token = create_user_token(user)
     
     return Token(access_token=access_token, token_type="bearer", user=user)
 
 @api_router.get("/auth/me", response_model=User)
-async def get_me(current_user: User = Depends(get_current_user)):
+async def get_me(current_user: User = Depends(get_current_user_claims)):
     return current_user
 
 @api_router.get("/dashboard/stats")
-async def get_dashboard_stats(current_user: User = Depends(get_current_user)):
+async def get_dashboard_stats(current_user: User = Depends(get_current_user_claims)):
     # Mock statistics
     total_tenders = await db.tenders.count_documents({})
     my_bids = await db.tender_analyses.count_documents({"user_id": current_user.id})
@@ -464,23 +559,92 @@ async def get_dashboard_stats(current_user: User = Depends(get_current_user)):
         "estimated_value": round(random.uniform(5000000, 50000000), 2)
     }
 
+MAX_TENDER_PAGE_SIZE = 100
+
+# Fields rendered by the tender list view; detail-only fields such as
+# eligibility_criteria and technical_specs are left to GET /tenders/{id}
+TENDER_LIST_PROJECTION = {
+    "_id": 0,
+    "id": 1,
+    "tender_id": 1,
+    "title": 1,
+    "organization": 1,
+    "description": 1,
+    "estimated_value": 1,
+    "emd_amount": 1,
+    "category": 1,
+    "location": 1,
+    "published_date": 1,
+    "submission_deadline": 1,
+    "status": 1,
+    "source": 1,
+    "threat_score": 1,
+    "threat_level": 1,
+    "created_at": 1,
+}
+
 @api_router.get("/tenders", response_model=List[Tender])
-async def get_tenders(skip: int = 0, limit: int = 20, category: Optional[str] = None):
+async def get_tenders(
+    skip: int = 0,
+    limit: int = 20,
+    category: Optional[str] = None,
+    location: Optional[str] = None,
+    min_value: Optional[float] = None,
+    max_value: Optional[float] = None,
+    threat_level: Optional[str] = None,
+    min_threat: Optional[float] = None,
+    sort: Optional[str] = None,
+    cursor: Optional[str] = None,
+):
+    """List tenders
+
+    ``threat_level`` (High/Medium/Low) and ``min_threat`` filter on the
+    competitor threat stored at ingest time.
+
+    Passing ``sort`` (submission_deadline, published_date or threat_score) or ``cursor``
+    switches to keyset pagination: the next page's cursor is returned in the
+    ``X-Next-Cursor`` header. Without them the legacy skip/limit form is used.
+
+    Documents come straight from the tenders collection, so they are encoded
+    directly instead of being revalidated against ``Tender``.
+    """
     query = {}
     if category:
         query['category'] = category
+    if location:
+        query['location'] = location
+    if min_value is not None or max_value is not None:
+        value_range = {}
+        if min_value is not None:
+            value_range['$gte'] = min_value
+        if max_value is not None:
+            value_range['$lte'] = max_value
+        query['estimated_value'] = value_range
+    if threat_level:
+        if threat_level.capitalize() not in THREAT_LEVELS:
+            raise HTTPException(status_code=400, detail=f"threat_level must be one of {', '.join(THREAT_LEVELS)}")
+        query['threat_level'] = threat_level.capitalize()
+    if min_threat is not None:
+        query['threat_score'] = {'$gte': min_threat}
+    
+    headers = {}
+    if sort or cursor:
+        limit = max(1, min(limit, MAX_TENDER_PAGE_SIZE))
+        sort = sort or "submission_deadline"
+        try:
+            page_query, sort_spec = keyset_query(query, sort, cursor)
+        except InvalidCursor as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        
+        # Fetch one extra document to learn whether another page exists
+        tenders = await db.tenders.find(page_query, TENDER_LIST_PROJECTION).sort(sort_spec).limit(limit + 1).to_list(limit + 1)
+        if len(tenders) > limit:
+            tenders = tenders[:limit]
+            headers["X-Next-Cursor"] = encode_cursor(sort, tenders[-1])
+    else:
+        tenders = await db.tenders.find(query, TENDER_LIST_PROJECTION).skip(skip).limit(limit).to_list(limit)
     
-    tenders = await db.tenders.find(query, {"_id": 0}).skip(skip).limit(limit).to_list(limit)
-    
-    for tender in tenders:
-        if isinstance(tender.get('published_date'), str):
-            tender['published_date'] = datetime.fromisoformat(tender['published_date'])
-        if isinstance(tender.get('submission_deadline'), str):
-            tender['submission_deadline'] = datetime.fromisoformat(tender['submission_deadline'])
-        if isinstance(tender.get('created_at'), str):
-            tender['created_at'] = datetime.fromisoformat(tender['created_at'])
-    
-    return tenders
+    return FastJSONResponse(tenders, headers=headers)
 
 @api_router.get("/tenders/{tender_id}", response_model=Tender)
 async def get_tender(tender_id: str):
@@ -488,13 +652,6 @@ async def get_tender(tender_id: str):
     if not tender:
         raise HTTPException(status_code=404, detail="Tender not found")
     
-    if isinstance(tender.get('published_date'), str):
-        tender['published_date'] = datetime.fromisoformat(tender['published_date'])
-    if isinstance(tender.get('submission_deadline'), str):
-        tender['submission_deadline'] = datetime.fromisoformat(tender['submission_deadline'])
-    if isinstance(tender.get('created_at'), str):
-        tender['created_at'] = datetime.fromisoformat(tender['created_at'])
-    
     return Tender(**tender)
 
 @api_router.post("/tenders/import")
@@ -502,11 +659,13 @@ async def import_tenders(current_user: User = Depends(get_current_user)):
     """Mock tender import from GeM and other sources"""
     mock_tenders = generate_mock_tenders()
     
-    # Clear existing and insert new
+    # Clear existing and upsert new; random tender_ids can collide, and
+    # tender_id is unique, so the last duplicate wins instead of failing
     await db.tenders.delete_many({})
-    await db.tenders.insert_many(mock_tenders)
+    ingest = await bulk_upsert_tenders(db, mock_tenders, threat_model=competitor_models.get())
+    count = ingest["inserted"] + ingest["updated"]
     
-    return {"message": f"Imported {len(mock_tenders)} tenders successfully", "count": len(mock_tenders)}
+    return {"message": f"Imported {count} tenders successfully", "count": count}
 
 @api_router.post("/tenders/{tender_id}/analyze", response_model=TenderAnalysis)
 async def analyze_tender(tender_id: str, current_user: User = Depends(get_current_user)):
@@ -541,8 +700,7 @@ async def analyze_tender(tender_id: str, current_user: User = Depends(get_curren
         ai_summary=tender_summary
     )
     
-    analysis_doc = analysis.model_dump()
-    analysis_doc['created_at'] = analysis_doc['created_at'].isoformat()
+    analysis_doc = to_document(analysis)
     await db.tender_analyses.insert_one(analysis_doc)
     
     return analysis
@@ -556,9 +714,6 @@ async def get_tender_analysis(tender_id: str, current_user: User = Depends(get_c
     if not analysis:
         raise HTTPException(status_code=404, detail="Analysis not found")
     
-    if isinstance(analysis.get('created_at'), str):
-        analysis['created_at'] = datetime.fromisoformat(analysis['created_at'])
-    
     return TenderAnalysis(**analysis)
 
 @api_router.post("/tenders/{tender_id}/competitors-ml", response_model=CompetitorAnalysis)
@@ -567,19 +722,15 @@ async def analyze_competitors_ml(tender_id: str, current_user: User = Depends(ge
     if not tender:
         raise HTTPException(status_code=404, detail="Tender not found")
 
-    # Ensure datetime types for model features
-    def to_dt(v):
-        if isinstance(v, str):
-            try:
-                return datetime.fromisoformat(v)
-            except Exception:
-                return None
-        return v
+    # Tenders not yet migrated may still hold ISO strings
+    coerce_dates(tender, ("published_date", "submission_deadline"))
 
-    tender["published_date"] = to_dt(tender.get("published_date"))
-    tender["submission_deadline"] = to_dt(tender.get("submission_deadline"))
+    model = competitor_models.get()
+    feature_hash = model.feature_hash(tender)
+    cached = await competitor_analysis_cache.get(tender_id, feature_hash, model.version)
+    if cached:
+        return CompetitorAnalysis(**cached)
 
-    model = SimpleCompetitorModel()
     competitors_scored = model.predict(tender)
 
     analysis = CompetitorAnalysis(
@@ -595,14 +746,78 @@ async def analyze_competitors_ml(tender_id: str, current_user: User = Depends(ge
             "High" if any(c.get("threat") == "high" for c in competitors_scored)
             else ("Medium" if any(c.get("threat") == "medium" for c in competitors_scored) else "Low")
         ),
+        model_version=model.version,
+        feature_hash=feature_hash,
     )
 
-    analysis_doc = analysis.model_dump()
-    analysis_doc['created_at'] = analysis_doc['created_at'].isoformat()
-    await db.competitor_analyses.insert_one(analysis_doc)
+    stored = await competitor_analysis_cache.put(to_document(analysis))
 
-    return analysis
+    return CompetitorAnalysis(**stored)
+
+
+MAX_COMPETITOR_BATCH_LIMIT = 1000
 
+class CompetitorBatchRequest(BaseModel):
+    tender_ids: Optional[List[str]] = None
+    category: Optional[str] = None
+    limit: int = Field(100, ge=1, le=MAX_COMPETITOR_BATCH_LIMIT)
+
+# Only the fields SimpleCompetitorModel reads
+COMPETITOR_FEATURE_PROJECTION = {
+    "_id": 0, "id": 1, "tender_id": 1, "title": 1, "estimated_value": 1, "emd_amount": 1,
+    "category": 1, "location": 1, "published_date": 1, "submission_deadline": 1,
+}
+# Tenders read and scored per step of a batch ranking
+COMPETITOR_BATCH_CHUNK = int(os.getenv('COMPETITOR_BATCH_CHUNK', 5000))
+
+@api_router.post("/tenders/competitors-ml/batch")
+async def analyze_competitors_ml_batch(request: CompetitorBatchRequest, current_user: User = Depends(get_current_user)):
+    """Score many tenders at once and rank them by their highest competitor threat
+    
+    Without tender_ids every active tender (optionally in one category) is
+    scored; the top ``limit`` are returned. Tenders are read and scored
+    COMPETITOR_BATCH_CHUNK at a time (scoring in a worker thread), keeping
+    only the running top ``limit``, so memory doesn't grow with the catalogue.
+    """
+    query: Dict[str, Any] = {"status": "active"}
+    if request.tender_ids:
+        query = {"id": {"$in": request.tender_ids}}
+    if request.category:
+        query["category"] = request.category
+    
+    model = competitor_models.get()
+    
+    def rank_chunk(chunk, offset):
+        # Ranking runs on the threat matrix; dicts are only built for the chunk's top results
+        for tender in chunk:
+            coerce_dates(tender, ("published_date", "submission_deadline"))
+        ranked_chunk = []
+        for index, top_score, competitors in model.rank_batch(chunk, request.limit):
+            ranked_chunk.append((top_score, -(offset + index), chunk[index], competitors))
+        return ranked_chunk
+    
+    best = []
+    scored = 0
+    cursor = db.tenders.find(query, COMPETITOR_FEATURE_PROJECTION).batch_size(COMPETITOR_BATCH_CHUNK)
+    async for chunk in achunked(cursor, COMPETITOR_BATCH_CHUNK):
+        candidates = await asyncio.to_thread(rank_chunk, chunk, scored)
+        # Ties keep catalogue order, as a single ranking pass would
+        best = heapq.nlargest(request.limit, best + candidates, key=lambda c: c[:2])
+        scored += len(chunk)
+    
+    ranked = []
+    for _, _, tender, competitors in best:
+        top = max(competitors, key=lambda c: c["threat_score"]) if competitors else None
+        ranked.append({
+            "id": tender.get("id"),
+            "tender_id": tender.get("tender_id"),
+            "title": tender.get("title"),
+            "threat_level": top["threat"].capitalize() if top else "Low",
+            "threat_score": top["threat_score"] if top else 0.0,
+            "competitors": competitors,
+        })
+    
+    return FastJSONResponse({"scored": scored, "model_version": model.version, "results": ranked})
 
 @api_router.post("/tenders/{tender_id}/competitors", response_model=CompetitorAnalysis)
 async def analyze_competitors(tender_id: str, current_user: User = Depends(get_current_user)):
@@ -629,8 +844,11 @@ async def analyze_competitors(tender_id: str, current_user: User = Depends(get_c
         threat_level="Medium"
     )
     
-    analysis_doc = analysis.model_dump()
-    analysis_doc['created_at'] = analysis_doc['created_at'].isoformat()
+    # No fingerprint: leave the fields out rather than null, since the partial
+    # unique index on (tender_id, feature_hash, model_version) matches nulls
+    analysis_doc = to_document(analysis)
+    analysis_doc.pop("feature_hash")
+    analysis_doc.pop("model_version")
     await db.competitor_analyses.insert_one(analysis_doc)
     
     return analysis
@@ -641,31 +859,53 @@ async def predict_win_probability(tender_id: str, current_user: User = Depends(g
     if not tender:
         raise HTTPException(status_code=404, detail="Tender not found")
     
-    # AI-based prediction (mocked)
-    win_prob = round(random.uniform(35, 75), 2)
-    confidence = round(random.uniform(70, 95), 2)
-    bid_margin = round(random.uniform(10, 20), 2)
+    model = win_models.get()
+    result = model.explain(coerce_dates(tender, ("published_date", "submission_deadline")))
+    probability = result["probability"]
     
     prediction = WinPrediction(
         tender_id=tender_id,
         user_id=current_user.id,
-        win_probability=win_prob,
-        confidence_score=confidence,
-        recommended_bid_margin=bid_margin,
-        factors={
-            "experience_match": "High",
-            "price_competitiveness": "Medium",
-            "technical_capability": "High",
-            "past_performance": "Good"
-        }
+        win_probability=round(probability * 100, 2),
+        # How decisive the model is, not a statistical interval
+        confidence_score=round(max(probability, 1 - probability) * 100, 2),
+        # Room to price up where we are likely to win anyway
+        recommended_bid_margin=round(10 + 10 * probability, 2),
+        factors={**result["factors"], "model": model.version},
     )
     
-    pred_doc = prediction.model_dump()
-    pred_doc['created_at'] = pred_doc['created_at'].isoformat()
+    pred_doc = to_document(prediction)
     await db.win_predictions.insert_one(pred_doc)
     
     return prediction
 
+class BidOutcomeRequest(BaseModel):
+    outcome: str
+    our_price: Optional[float] = None
+    l1_price: Optional[float] = None
+
+@api_router.post("/tenders/{tender_id}/outcome")
+async def record_bid_outcome(tender_id: str, request: BidOutcomeRequest, current_user: User = Depends(get_current_user)):
+    """Record whether our bid on a tender was won or lost (training data for the win model)"""
+    if request.outcome not in ("won", "lost"):
+        raise HTTPException(status_code=400, detail="outcome must be 'won' or 'lost'")
+    tender = await db.tenders.find_one({"id": tender_id}, {"_id": 0, "id": 1})
+    if not tender:
+        raise HTTPException(status_code=404, detail="Tender not found")
+    
+    outcome_doc = {
+        "tender_id": tender_id,
+        "user_id": current_user.id,
+        **request.model_dump(),
+        "recorded_at": datetime.now(timezone.utc),
+    }
+    await db.bid_outcomes.update_one(
+        {"tender_id": tender_id, "user_id": current_user.id},
+        {"$set": outcome_doc},
+        upsert=True,
+    )
+    return outcome_doc
+
 @api_router.post("/tenders/{tender_id}/boq", response_model=BOQ)
 async def generate_boq(tender_id: str, items: List[Dict[str, Any]], current_user: User = Depends(get_current_user)):
     tender = await db.tenders.find_one({"id": tender_id}, {"_id": 0})
@@ -686,8 +926,7 @@ async def generate_boq(tender_id: str, items: List[Dict[str, Any]], current_user
         grand_total=round(grand_total, 2)
     )
     
-    boq_doc = boq.model_dump()
-    boq_doc['created_at'] = boq_doc['created_at'].isoformat()
+    boq_doc = to_document(boq)
     await db.boqs.insert_one(boq_doc)
     
     return boq
@@ -700,17 +939,12 @@ async def get_contacts(current_user: User = Depends(get_current_user), contact_t
     
     contacts = await db.crm_contacts.find(query, {"_id": 0}).to_list(100)
     
-    for contact in contacts:
-        if isinstance(contact.get('created_at'), str):
-            contact['created_at'] = datetime.fromisoformat(contact['created_at'])
-    
     return contacts
 
 @api_router.post("/crm/contacts", response_model=CRMContact)
 async def create_contact(contact: CRMContact, current_user: User = Depends(get_current_user)):
     contact.user_id = current_user.id
-    contact_doc = contact.model_dump()
-    contact_doc['created_at'] = contact_doc['created_at'].isoformat()
+    contact_doc = to_document(contact)
     await db.crm_contacts.insert_one(contact_doc)
     return contact
 
@@ -755,8 +989,60 @@ async def upload_tender_document(
         "ai_insights": insights
     }
 
+# NIT/BOQ files downloaded from GeM, one copy per distinct content
+document_store = DocumentStore(
+    db,
+    os.getenv('DOCUMENT_STORE_DIR', str(ROOT_DIR / 'tender_documents')),
+    http_fetcher=gem_http_fetcher,
+    concurrency=int(os.getenv('DOCUMENT_DOWNLOAD_CONCURRENCY', 4)),
+)
+
+class DocumentFetchRequest(BaseModel):
+    tender_ids: List[str]
+
+@api_router.post("/tenders/{tender_id}/documents/fetch")
+async def fetch_tender_document(tender_id: str, current_user: User = Depends(get_current_user)):
+    """Download a tender's GeM document into the document store (no-op if already stored)"""
+    tender = await db.tenders.find_one({"id": tender_id}, {"_id": 0, "tender_id": 1, "document_url": 1})
+    if not tender:
+        raise HTTPException(status_code=404, detail="Tender not found")
+    if not tender.get("document_url"):
+        raise HTTPException(status_code=404, detail="Tender has no document URL")
+    
+    entry = await document_store.fetch(tender["tender_id"], tender["document_url"])
+    if entry is None:
+        raise HTTPException(status_code=502, detail="Could not download tender document")
+    return entry
+
+@api_router.post("/tenders/documents/fetch")
+async def fetch_tender_documents(request: DocumentFetchRequest, current_user: User = Depends(get_current_user)):
+    """Download documents for several tenders in parallel"""
+    tenders = await db.tenders.find(
+        {"id": {"$in": request.tender_ids}, "document_url": {"$exists": True, "$ne": None}},
+        {"_id": 0, "tender_id": 1, "document_url": 1},
+    ).to_list(len(request.tender_ids))
+    
+    entries = await document_store.fetch_many((t["tender_id"], t["document_url"]) for t in tenders)
+    stored = [e for e in entries if e is not None]
+    return {"requested": len(request.tender_ids), "stored": len(stored), "failed": len(entries) - len(stored), "documents": stored}
+
+@api_router.get("/tenders/{tender_id}/documents")
+async def list_tender_documents(tender_id: str, current_user: User = Depends(get_current_user)):
+    tender = await db.tenders.find_one({"id": tender_id}, {"_id": 0, "tender_id": 1})
+    if not tender:
+        raise HTTPException(status_code=404, detail="Tender not found")
+    return await document_store.list_for_tender(tender["tender_id"])
+
+@api_router.get("/documents/stored/{sha256}")
+async def download_stored_document(sha256: str, current_user: User = Depends(get_current_user)):
+    entry = await document_store.get(sha256)
+    if not entry:
+        raise HTTPException(status_code=404, detail="Document not found")
+    return FileResponse(document_store.object_path(sha256), media_type=entry.get("content_type") or "application/octet-stream",
+                        filename=entry["filename"])
+
 @api_router.get("/reports/win-loss")
-async def get_win_loss_report(current_user: User = Depends(get_current_user)):
+async def get_win_loss_report(current_user: User = Depends(get_current_user_claims)):
     total_bids = await db.tender_analyses.count_documents({"user_id": current_user.id})
     
     # Mock data
@@ -820,8 +1106,7 @@ async def analyze_prices(tender_id: str, current_user: User = Depends(get_curren
         price_trend="stable"
     )
     
-    analysis_doc = analysis.model_dump()
-    analysis_doc['created_at'] = analysis_doc['created_at'].isoformat()
+    analysis_doc = to_document(analysis)
     await db.price_analyses.insert_one(analysis_doc)
     
     return analysis
@@ -852,30 +1137,24 @@ async def recommend_products(tender_id: str, current_user: User = Depends(get_cu
         technical_compliance={"iso": True, "bis": True, "ce": True}
     )
     
-    rec_doc = recommendation.model_dump()
-    rec_doc['created_at'] = rec_doc['created_at'].isoformat()
+    rec_doc = to_document(recommendation)
     await db.product_recommendations.insert_one(rec_doc)
     
     return recommendation
 
 @api_router.get("/notifications", response_model=List[Notification])
-async def get_notifications(current_user: User = Depends(get_current_user)):
+async def get_notifications(current_user: User = Depends(get_current_user_claims)):
     notifications = await db.notifications.find(
         {"user_id": current_user.id},
         {"_id": 0}
     ).sort("created_at", -1).limit(50).to_list(50)
     
-    for notif in notifications:
-        if isinstance(notif.get('created_at'), str):
-            notif['created_at'] = datetime.fromisoformat(notif['created_at'])
-    
     return notifications
 
 @api_router.post("/notifications", response_model=Notification)
 async def create_notification(notification: Notification, current_user: User = Depends(get_current_user)):
     notification.user_id = current_user.id
-    notif_doc = notification.model_dump()
-    notif_doc['created_at'] = notif_doc['created_at'].isoformat()
+    notif_doc = to_document(notification)
     await db.notifications.insert_one(notif_doc)
     return notification
 
@@ -890,23 +1169,18 @@ async def mark_notification_read(notification_id: str, current_user: User = Depe
     return {"message": "Notification marked as read"}
 
 @api_router.get("/support/tickets", response_model=List[SupportTicket])
-async def get_tickets(current_user: User = Depends(get_current_user)):
+async def get_tickets(current_user: User = Depends(get_current_user_claims)):
     tickets = await db.support_tickets.find(
         {"user_id": current_user.id},
         {"_id": 0}
     ).sort("created_at", -1).to_list(100)
     
-    for ticket in tickets:
-        if isinstance(ticket.get('created_at'), str):
-            ticket['created_at'] = datetime.fromisoformat(ticket['created_at'])
-    
     return tickets
 
 @api_router.post("/support/tickets", response_model=SupportTicket)
 async def create_ticket(ticket: SupportTicket, current_user: User = Depends(get_current_user)):
     ticket.user_id = current_user.id
-    ticket_doc = ticket.model_dump()
-    ticket_doc['created_at'] = ticket_doc['created_at'].isoformat()
+    ticket_doc = to_document(ticket)
     await db.support_tickets.insert_one(ticket_doc)
     
     # Auto-create notification
@@ -916,8 +1190,7 @@ async def create_ticket(ticket: SupportTicket, current_user: User = Depends(get_
         message=f"Your ticket '{ticket.subject}' has been created successfully.",
         type="info"
     )
-    notif_doc = notif.model_dump()
-    notif_doc['created_at'] = notif_doc['created_at'].isoformat()
+    notif_doc = to_document(notif)
     await db.notifications.insert_one(notif_doc)
     
     return ticket
@@ -931,7 +1204,7 @@ async def respond_to_ticket(ticket_id: str, response_text: str, current_user: Us
     response_payload = {
         "user": current_user.full_name,
         "message": response_text,
-        "timestamp": datetime.now(timezone.utc).isoformat()
+        "timestamp": datetime.now(timezone.utc)
     }
     
     await db.support_tickets.update_one(
@@ -974,9 +1247,6 @@ async def admin_get_users(current_user: User = Depends(get_current_user)):
         raise HTTPException(status_code=403, detail="Admin access required")
     
     users = await db.users.find({}, {"_id": 0, "hashed_password": 0}).to_list(1000)
-    for user in users:
-        if isinstance(user.get('created_at'), str):
-            user['created_at'] = datetime.fromisoformat(user['created_at'])
     return users
 
 @api_router.get("/admin/stats")
@@ -998,8 +1268,58 @@ async def admin_get_stats(current_user: User = Depends(get_current_user)):
         "revenue_this_month": round(random.uniform(50000, 200000), 2)
     }
 
+@api_router.put("/admin/users/{user_id}")
+async def admin_update_user(user_id: str, update: UserStatusUpdate, current_user: User = Depends(get_current_user)):
+    if current_user.role != "super_admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+    
+    changes = update.model_dump(exclude_none=True)
+    if not changes:
+        raise HTTPException(status_code=400, detail="No changes provided")
+    
+    # auth_changed_at tells the other workers to stop trusting older claims
+    result = await db.users.update_one(
+        {"id": user_id}, {"$set": {**changes, "auth_changed_at": datetime.now(timezone.utc)}})
+    if result.matched_count == 0:
+        raise HTTPException(status_code=404, detail="User not found")
+    
+    # Role/KYC/activation changes must not be served from stale cache or claims
+    user_cache.invalidate(user_id)
+    
+    return {"message": "User updated successfully", "changes": changes}
+
+@api_router.post("/admin/tenders/rescore-threat")
+async def admin_rescore_threat(current_user: User = Depends(get_current_user)):
+    """Recompute stored threat scores for tenders scored by an older model version"""
+    if current_user.role != "super_admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+    
+    model = competitor_models.get()
+    updated = await rescore_tenders(db, model)
+    return {"message": f"Rescored {updated} tenders", "count": updated, "model_version": model.version}
+
+@api_router.get("/admin/metrics")
+async def admin_get_metrics(current_user: User = Depends(get_current_user)):
+    if current_user.role != "super_admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+    
+    return {
+        "auth_cache": user_cache.stats(),
+        "password_pool": password_hasher.stats(),
+        "gem_driver_pool": _gem_driver_pool.stats() if _gem_driver_pool else None,
+        "gem_http": gem_http_fetcher.stats(),
+        "document_store": document_store.stats(),
+        "competitor_model": competitor_models.stats(),
+        "competitor_analysis_cache": competitor_analysis_cache.stats(),
+        "win_model": win_models.stats(),
+        "document_render_pool": document_render_pool.stats(),
+        "document_render_cache": document_render_cache.stats(),
+        "scrape_jobs": await scrape_job_queue.stats(),
+        "jwt_trust_claims": JWT_TRUST_CLAIMS,
+    }
+
 @api_router.get("/subscription/my-subscription", response_model=Subscription)
-async def get_my_subscription(current_user: User = Depends(get_current_user)):
+async def get_my_subscription(current_user: User = Depends(get_current_user_claims)):
     subscription = await db.subscriptions.find_one({"user_id": current_user.id}, {"_id": 0})
     
     if not subscription:
@@ -1011,18 +1331,9 @@ async def get_my_subscription(current_user: User = Depends(get_current_user)):
             start_date=datetime.now(timezone.utc),
             end_date=datetime.now(timezone.utc) + timedelta(days=30)
         )
-        sub_doc = subscription.model_dump()
-        sub_doc['start_date'] = sub_doc['start_date'].isoformat()
-        sub_doc['end_date'] = sub_doc['end_date'].isoformat()
-        sub_doc['created_at'] = sub_doc['created_at'].isoformat()
+        sub_doc = to_document(subscription)
         await db.subscriptions.insert_one(sub_doc)
     else:
-        if isinstance(subscription.get('start_date'), str):
-            subscription['start_date'] = datetime.fromisoformat(subscription['start_date'])
-        if isinstance(subscription.get('end_date'), str):
-            subscription['end_date'] = datetime.fromisoformat(subscription['end_date'])
-        if isinstance(subscription.get('created_at'), str):
-            subscription['created_at'] = datetime.fromisoformat(subscription['created_at'])
         subscription = Subscription(**subscription)
     
     return subscription
@@ -1032,100 +1343,250 @@ async def auto_classify_tenders(current_user: User = Depends(get_current_user)):
     """Auto-classify tenders using deterministic keyword heuristics"""
     tenders = await db.tenders.find({}, {"_id": 0}).to_list(100)
 
-    classified_count = 0
-
+    # Category feeds the competitor model, so reclassified tenders are rescored too
+    classified = []
     for tender in tenders:
         if not tender.get('ai_classified'):
-            category = classify_tender_category(tender)
-            await db.tenders.update_one(
-                {"id": tender['id']},
-                {"$set": {"category": category, "ai_classified": True}}
-            )
-            classified_count += 1
+            tender['category'] = classify_tender_category(tender)
+            coerce_dates(tender, ("published_date", "submission_deadline"))
+            classified.append(tender)
+    annotate_threat(classified, competitor_models.get())
+
+    for tender in classified:
+        update = {"category": tender['category'], "ai_classified": True}
+        update.update({f: tender[f] for f in THREAT_FIELDS if f in tender})
+        await db.tenders.update_one({"id": tender['id']}, {"$set": update})
+    classified_count = len(classified)
 
     return {"message": f"Classified {classified_count} tenders", "count": classified_count}
 
+# Warm, logged-in Chrome sessions shared by all scrapes; launched on first use
+_gem_driver_pool = None
+
+def get_gem_driver_pool():
+    global _gem_driver_pool
+    if _gem_driver_pool is None:
+        _gem_driver_pool = create_gem_driver_pool(
+            size=int(os.getenv('GEM_DRIVER_POOL_SIZE', 2)),
+            max_pages=int(os.getenv('GEM_DRIVER_MAX_PAGES', 50)),
+            checkout_timeout=float(os.getenv('GEM_DRIVER_CHECKOUT_TIMEOUT', 60)),
+        )
+    return _gem_driver_pool
+
+# Scraped pages are written in batches of this size while traversal continues
+SCRAPE_INGEST_BATCH = int(os.getenv('GEM_SCRAPE_INGEST_BATCH', 500))
+
+async def scrape_and_ingest(category: Optional[str], limit: int, incremental: bool, progress=None,
+                            keep_tenders: bool = False) -> Dict[str, Any]:
+    """
+    Scrape the GeM listing and upsert the result
+    
+    Tenders stream from the page traversal straight into bulk upserts, so
+    large scrapes are written as they arrive instead of being held in
+    memory. Incremental runs resume from the stored ScrapeState and only
+    write tenders whose content hash changed.
+    """
+    state = await ScrapeState.load(db, scrape_state_key(category)) if incremental else None
+    if progress:
+        await progress(stage="scraping", scraped=0)
+    scraper = GeMScraper(driver_pool=get_gem_driver_pool())
+    scraped_ids = []
+    kept = []
+    
+    async def stream():
+        async for batch in scraper.iter_latest_tenders(category=category, limit=limit, state=state):
+            scraped_ids.extend(t["tender_id"] for t in batch)
+            if keep_tenders:
+                kept.extend(batch)
+            if progress:
+                await progress(stage="scraping", scraped=len(scraped_ids))
+            for tender in batch:
+                yield tender
+    
+    ingest = await bulk_upsert_tenders(db, stream(), batch_size=SCRAPE_INGEST_BATCH, skip_unchanged=incremental,
+                                       threat_model=competitor_models.get())
+    
+    if state is not None:
+        state.remember(state.scanned_ids)
+        await state.save(db)
+        ingest["incremental"] = state.summary()
+    return {"count": len(scraped_ids), "tenders": kept, "ingest": ingest}
+
 @api_router.post("/gem/scrape-latest")
-async def scrape_gem_tenders(category: Optional[str] = None, limit: int = 50, current_user: User = Depends(get_current_user)):
+async def scrape_gem_tenders(category: Optional[str] = None, limit: int = 50, incremental: bool = False,
+                             current_user: User = Depends(get_current_user)):
     """Scrape latest tenders from GeM portal"""
-    scraper = GeMScraper()
-    tenders = await scraper.scrape_latest_tenders(category=category, limit=limit)
+    scraped = await scrape_and_ingest(category, limit, incremental, keep_tenders=True)
     
-    # Store in database
-    if tenders:
-        for tender in tenders:
-            # Check if tender already exists
-            existing = await db.tenders.find_one({"tender_id": tender['tender_id']})
-            if not existing:
-                await db.tenders.insert_one(tender)
+    return {"message": f"Scraped {scraped['count']} tenders from GeM", "count": scraped["count"], "ingest": scraped["ingest"], "tenders": scraped["tenders"]}
+
+async def run_scrape_job(job: Dict[str, Any], progress) -> Dict[str, Any]:
+    """Scrape GeM and ingest the results for a queued job"""
+    params = job["params"]
+    scraped = await scrape_and_ingest(params.get("category"), params.get("limit", 50),
+                                      params.get("incremental", False), progress)
+    ingest = scraped["ingest"]
     
-    return {"message": f"Scraped {len(tenders)} tenders from GeM", "count": len(tenders), "tenders": tenders}
+    await progress(stage="done", inserted=ingest["inserted"], updated=ingest["updated"], unchanged=ingest["unchanged"])
+    return {"scraped": scraped["count"], **ingest}
+
+scrape_job_queue = ScrapeJobQueue(
+    db,
+    run_scrape_job,
+    workers=int(os.getenv('GEM_SCRAPE_WORKERS', 1)),
+    max_pending=int(os.getenv('GEM_SCRAPE_MAX_PENDING', 50)),
+)
+
+@api_router.post("/gem/scrape-jobs")
+async def create_scrape_job(category: Optional[str] = None, limit: int = 50, incremental: bool = False,
+                            current_user: User = Depends(get_current_user)):
+    """Queue a GeM scrape; poll GET /gem/scrape-jobs/{job_id} for progress"""
+    try:
+        job = await scrape_job_queue.enqueue({"category": category, "limit": limit, "incremental": incremental}, current_user.id)
+    except JobQueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    
+    return {"message": "Scrape job queued", "job_id": job["id"], "status": job["status"]}
+
+@api_router.get("/gem/scrape-jobs")
+async def list_scrape_jobs(limit: int = 20, current_user: User = Depends(get_current_user)):
+    return await scrape_job_queue.list(current_user.id, limit=min(limit, 100))
+
+@api_router.get("/gem/scrape-jobs/{job_id}")
+async def get_scrape_job(job_id: str, current_user: User = Depends(get_current_user)):
+    job = await scrape_job_queue.get(job_id, user_id=current_user.id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Scrape job not found")
+    return job
+
+@api_router.post("/tenders/bulk-import")
+async def bulk_import_tenders(file: UploadFile = File(...), current_user: User = Depends(get_current_user)):
+    """Bulk upsert tenders from a CSV or JSON-lines file, keyed on tender_id"""
+    filename = file.filename or ""
+    if filename.endswith('.csv'):
+        records = iter_csv(file.file)
+    elif filename.endswith(('.jsonl', '.ndjson')):
+        records = iter_jsonl(file.file)
+    else:
+        raise HTTPException(status_code=400, detail="Only .csv and .jsonl files are supported")
+    
+    try:
+        # The upload is read and parsed off the event loop, one batch at a time
+        ingest = await bulk_upsert_tenders(db, iter_in_thread(records), threat_model=competitor_models.get())
+    except (ValueError, UnicodeDecodeError) as e:
+        raise HTTPException(status_code=400, detail=f"Could not parse {filename}: {e}")
+    
+    return {"message": f"Processed {ingest['received']} tenders", **ingest}
+
+# openpyxl/python-docx rendering runs in worker processes, off the event loop
+document_render_pool = DocumentRenderPool(
+    max_workers=int(os.getenv('DOCUMENT_RENDER_WORKERS', 2)),
+    max_queue=int(os.getenv('DOCUMENT_RENDER_MAX_QUEUE', 20)),
+    timeout=float(os.getenv('DOCUMENT_RENDER_TIMEOUT_SECONDS', 60)),
+    type_limits=parse_type_limits(os.getenv('DOCUMENT_RENDER_TYPE_LIMITS', 'boq=1')),
+)
+# Repeat renders with identical inputs are served from memory
+document_render_cache = RenderCache(
+    max_bytes=int(float(os.getenv('DOCUMENT_RENDER_CACHE_MB', 64)) * 1024 * 1024),
+    max_item_bytes=int(float(os.getenv('DOCUMENT_RENDER_CACHE_MAX_ITEM_MB', 8)) * 1024 * 1024),
+)
+# Template versions and listing, EMD maths and persist=true copies; rendering itself happens in the pool
+document_output = DocumentGenerator()
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+def tender_projection(kind: str) -> Dict[str, int]:
+    """Projection of the tender fields a document type renders"""
+    return {"_id": 0, **{field: 1 for field in TENDER_FIELDS.get(kind, TEMPLATE_TENDER_FIELDS)}}
+
+async def render_document(kind: str, *args, persist: bool = False) -> StreamingResponse:
+    """Render in the pool (or reuse a cached render) and stream the bytes back, optionally keeping a copy on disk"""
+    key = RenderCache.key(kind, document_output.template_version(kind), datetime.now().strftime('%Y%m%d'), *args)
+    try:
+        document, cached = await document_render_cache.get_or_render(
+            key, lambda: document_render_pool.render(kind, *args))
+    except RenderPoolSaturated:
+        raise HTTPException(status_code=503, detail="Document generation busy, please retry")
+    except RenderTimeout:
+        raise HTTPException(status_code=504, detail="Document generation timed out")
+    
+    content = document["content"]
+    headers = {
+        # File names are ASCII-only (see template_engine.safe_name)
+        "Content-Disposition": f"attachment; filename=\"{document['filename']}\"",
+        "Content-Length": str(len(content)),
+        "X-Render-Cache": "hit" if cached else "miss",
+    }
+    if persist:
+        filepath = await asyncio.to_thread(document_output.save, document)
+        headers["X-Document-Path"] = filepath
+    
+    def chunks():
+        for offset in range(0, len(content), DOWNLOAD_CHUNK_SIZE):
+            yield content[offset:offset + DOWNLOAD_CHUNK_SIZE]
+    
+    return StreamingResponse(chunks(), media_type=document["content_type"], headers=headers)
 
 @api_router.post("/documents/generate-boq")
-async def generate_boq_document(tender_id: str, items: List[Dict[str, Any]], current_user: User = Depends(get_current_user)):
-    """Generate BOQ Excel document"""
-    tender = await db.tenders.find_one({"id": tender_id}, {"_id": 0})
+async def generate_boq_document(tender_id: str, items: List[Dict[str, Any]], persist: bool = False,
+                                current_user: User = Depends(get_current_user)):
+    """Generate BOQ Excel document (streamed as a download; persist=true also keeps a copy)"""
+    tender = await db.tenders.find_one({"id": tender_id}, tender_projection("boq"))
     if not tender:
         raise HTTPException(status_code=404, detail="Tender not found")
     
-    doc_generator = DocumentGenerator()
-    filepath = doc_generator.generate_boq(tender, items)
-    
-    return {
-        "message": "BOQ generated successfully",
-        "file_path": filepath,
-        "file_name": os.path.basename(filepath)
-    }
+    return await render_document("boq", tender, items, persist=persist)
 
 @api_router.post("/documents/generate-cover-letter")
-async def generate_cover_letter_document(tender_id: str, company_data: Dict[str, Any], current_user: User = Depends(get_current_user)):
-    """Generate cover letter document"""
-    tender = await db.tenders.find_one({"id": tender_id}, {"_id": 0})
+async def generate_cover_letter_document(tender_id: str, company_data: Dict[str, Any], persist: bool = False,
+                                         current_user: User = Depends(get_current_user)):
+    """Generate cover letter document (streamed as a download; persist=true also keeps a copy)"""
+    tender = await db.tenders.find_one({"id": tender_id}, tender_projection("cover_letter"))
     if not tender:
         raise HTTPException(status_code=404, detail="Tender not found")
     
-    doc_generator = DocumentGenerator()
-    filepath = doc_generator.generate_cover_letter(company_data, tender)
-    
-    return {
-        "message": "Cover letter generated successfully",
-        "file_path": filepath,
-        "file_name": os.path.basename(filepath)
-    }
+    return await render_document("cover_letter", company_data, tender, persist=persist)
 
 @api_router.post("/documents/generate-company-profile")
-async def generate_company_profile_document(company_data: Dict[str, Any], current_user: User = Depends(get_current_user)):
-    """Generate company profile document"""
-    doc_generator = DocumentGenerator()
-    filepath = doc_generator.generate_company_profile(company_data)
-    
-    return {
-        "message": "Company profile generated successfully",
-        "file_path": filepath,
-        "file_name": os.path.basename(filepath)
-    }
+async def generate_company_profile_document(company_data: Dict[str, Any], persist: bool = False,
+                                            current_user: User = Depends(get_current_user)):
+    """Generate company profile document (streamed as a download; persist=true also keeps a copy)"""
+    return await render_document("company_profile", company_data, persist=persist)
 
 @api_router.post("/documents/generate-technical-bid")
-async def generate_technical_bid_document(tender_id: str, technical_details: Dict[str, Any], current_user: User = Depends(get_current_user)):
-    """Generate technical bid document"""
-    tender = await db.tenders.find_one({"id": tender_id}, {"_id": 0})
+async def generate_technical_bid_document(tender_id: str, technical_details: Dict[str, Any], persist: bool = False,
+                                          current_user: User = Depends(get_current_user)):
+    """Generate technical bid document (streamed as a download; persist=true also keeps a copy)"""
+    tender = await db.tenders.find_one({"id": tender_id}, tender_projection("technical_bid"))
     if not tender:
         raise HTTPException(status_code=404, detail="Tender not found")
     
-    doc_generator = DocumentGenerator()
-    filepath = doc_generator.generate_technical_bid(tender, technical_details)
+    return await render_document("technical_bid", tender, technical_details, persist=persist)
+
+class TemplateDocumentRequest(BaseModel):
+    tender_id: Optional[str] = None
+    company_data: Dict[str, Any] = {}
+    data: Dict[str, Any] = {}
+
+@api_router.post("/documents/generate/{template_id}")
+async def generate_template_document(template_id: str, request: TemplateDocumentRequest, persist: bool = False,
+                                     current_user: User = Depends(get_current_user)):
+    """Generate a document from a template in the templates directory (e.g. financial_bid, experience_certificate)"""
+    # Types with their own endpoint take different arguments
+    if template_id in RENDERERS or not document_output.templates.has(template_id):
+        raise HTTPException(status_code=404, detail="Template not found")
     
-    return {
-        "message": "Technical bid generated successfully",
-        "file_path": filepath,
-        "file_name": os.path.basename(filepath)
-    }
+    tender = {}
+    if request.tender_id:
+        tender = await db.tenders.find_one({"id": request.tender_id}, tender_projection(template_id))
+        if not tender:
+            raise HTTPException(status_code=404, detail="Tender not found")
+    
+    return await render_document(template_id, tender, request.company_data, request.data, persist=persist)
 
 @api_router.post("/documents/calculate-emd")
 async def calculate_emd(tender_value: float, emd_percentage: float = 2.0):
     """Calculate EMD amount"""
-    doc_generator = DocumentGenerator()
-    emd_amount = doc_generator.calculate_emd(tender_value, emd_percentage)
+    emd_amount = document_output.calculate_emd(tender_value, emd_percentage)
     
     return {
         "tender_value": tender_value,
@@ -1135,7 +1596,7 @@ async def calculate_emd(tender_value: float, emd_percentage: float = 2.0):
     }
 
 @api_router.get("/documents/templates")
-async def get_document_templates(current_user: User = Depends(get_current_user)):
+async def get_document_templates(current_user: User = Depends(get_current_user_claims)):
     """Get available document templates"""
     templates = [
         {"id": "boq", "name": "Bill of Quantities (BOQ)", "description": "Excel template for BOQ"},
@@ -1145,6 +1606,12 @@ async def get_document_templates(current_user: User = Depends(get_current_user))
         {"id": "financial_bid", "name": "Financial Bid", "description": "Financial bid document"},
         {"id": "experience_certificate", "name": "Experience Certificate", "description": "Work experience certificate template"}
     ]
+    # Template files added since are listed under their file name
+    listed = {template["id"] for template in templates}
+    templates += [
+        {"id": kind, "name": kind.replace("_", " ").title(), "description": "Custom document template"}
+        for kind in document_output.templates.kinds() if kind not in listed
+    ]
     return templates
 
 @api_router.get("/documents")
@@ -1176,7 +1643,7 @@ async def get_documents(current_user: User = Depends(get_current_user)):
     return documents
 
 @api_router.get("/analytics/tender-trends")
-async def get_tender_trends(current_user: User = Depends(get_current_user)):
+async def get_tender_trends(current_user: User = Depends(get_current_user_claims)):
     # Mock analytics data
     trends = {
         "categories": [
@@ -1207,6 +1674,7 @@ app.add_middleware(
     allow_origins=os.environ.get('CORS_ORIGINS', '*').split(','),
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Content-Disposition", "X-Document-Path", "X-Render-Cache"],
 )
 
 logging.basicConfig(
@@ -1215,6 +1683,58 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def bootstrap_indexes():
+    await ensure_indexes(db)
+    # Check mode: refuse to start if any registered query shape would COLLSCAN
+    if os.getenv('MONGO_INDEX_CHECK', 'false').lower() in ('1', 'true', 'yes'):
+        await verify_query_plans(db)
+
+@app.on_event("startup")
+async def start_scrape_workers():
+    await scrape_job_queue.start()
+
+_threat_backfill_task = None
+_revocation_sync_task = None
+
+async def sync_auth_revocations():
+    """Pull privilege changes made through any worker into this worker's user cache"""
+    since = datetime.now(timezone.utc) - timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    while True:
+        try:
+            async for user_doc in db.users.find(
+                    {"auth_changed_at": {"$gte": since}}, {"_id": 0, "id": 1, "auth_changed_at": 1}):
+                changed_at = user_doc["auth_changed_at"]
+                user_cache.revoke(user_doc["id"], changed_at.timestamp())
+                since = max(since, changed_at)
+        except Exception as e:
+            logger.error(f"Auth revocation sync failed: {e}")
+        await asyncio.sleep(JWT_REVOCATION_SYNC_SECONDS)
+
+@app.on_event("startup")
+async def start_revocation_sync():
+    global _revocation_sync_task
+    # Both signed claims and load_user's per-worker user cache can outlive a
+    # privilege change made on another worker; revoke() drops both
+    _revocation_sync_task = asyncio.create_task(sync_auth_revocations())
+
+@app.on_event("startup")
+async def backfill_threat_scores():
+    """Score tenders stored before threat scoring (or by an older model) in the background"""
+    global _threat_backfill_task
+    if os.getenv('THREAT_BACKFILL_ON_STARTUP', 'true').lower() in ('1', 'true', 'yes'):
+        _threat_backfill_task = asyncio.create_task(rescore_tenders(db, competitor_models.get()))
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
-    client.close()
\ No newline at end of file
+    await scrape_job_queue.stop()
+    if _threat_backfill_task is not None and not _threat_backfill_task.done():
+        _threat_backfill_task.cancel()
+    if _revocation_sync_task is not None:
+        _revocation_sync_task.cancel()
+    client.close()
+    password_hasher.shutdown()
+    document_render_pool.shutdown()
+    if _gem_driver_pool is not None:
+        _gem_driver_pool.close()
+    await gem_http_fetcher.close()
\ No newline at end of file
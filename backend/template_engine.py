@@ -0,0 +1,335 @@
+"""Template Engine - Jinja-driven docx/xlsx document rendering
+
+Document types are Jinja templates named ``<type>.<format>.j2`` in the
+templates directory (``docx`` or ``xlsx``). Every template is compiled once
+when the engine is created; a render only evaluates the compiled template
+and feeds the text to the format's backend. Adding a document type means
+adding a template file.
+
+Templates render a small line-based markup.
+
+docx::
+
+    @filename CoverLetter_{{ tender.tender_id }}
+    @header {{ company.name }}           letterhead, centered and bold
+    @table-style Medium Shading 1 Accent 1
+    = Title                              title heading, centered
+    == Heading / === Subheading
+    - bullet point
+    | Cell | Cell | Cell                 table row; the first row of a table is its header
+    (empty line)                         empty paragraph
+    any other text, with **bold** runs   paragraph
+
+xlsx::
+
+    @filename FinancialBid_{{ tender.tender_id }}
+    @sheet Financial Bid
+    @widths 8 40 15
+    [header]S.No | [header]Description   one row; cells separated by |
+    1 | Cement | =C7*D7                  numbers become numbers, =... is a formula
+
+Cell styles in ``[...]`` are named styles from XLSX_STYLES. Every value
+substituted by ``{{ ... }}`` is escaped, so data can never inject markup,
+styles or spreadsheet formulas.
+"""
+import hashlib
+import io
+import logging
+import os
+import re
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import openpyxl
+from docx import Document
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.shared import Pt
+from jinja2 import ChainableUndefined, Environment, FileSystemLoader, Template
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Font, NamedStyle, PatternFill
+from openpyxl.utils import get_column_letter
+
+logger = logging.getLogger(__name__)
+
+XLSX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+DOCX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+CURRENCY_FORMAT = '₹#,##0.00'
+
+# Markup characters in substituted values are swapped for private-use code
+# points while the markup is parsed, then swapped back
+_MARKUP_CHARS = "|*=-!@[#\\"
+_ESCAPE = {ord(c): 0xE000 + i for i, c in enumerate(_MARKUP_CHARS)}
+_UNESCAPE = {0xE000 + i: c for i, c in enumerate(_MARKUP_CHARS)}
+_NUMBER = re.compile(r'-?(?:0|[1-9]\d*)(?:\.\d+)?')
+
+
+def _escape(value: Any) -> str:
+    if value is None:
+        return ""
+    return str(value).replace("\r", " ").replace("\n", " ").translate(_ESCAPE)
+
+
+def _text(fragment: str) -> str:
+    return fragment.translate(_UNESCAPE)
+
+
+def safe_name(value: Any) -> str:
+    """File-name-safe form of a value (GeM bid numbers contain slashes)"""
+    return re.sub(r'[^A-Za-z0-9._-]+', '_', str(value)).strip('_') or 'document'
+
+
+def rendered_document(stem: Any, extension: str, content_type: str, save_to: Callable[[io.BytesIO], None]) -> Dict[str, Any]:
+    """
+    Save a document into memory
+
+    Args:
+        stem: File name without date or extension
+        extension: ".docx" or ".xlsx"
+        content_type: MIME type
+        save_to: The document's save method
+
+    Returns:
+        Dictionary with filename, content_type and content (bytes)
+    """
+    buffer = io.BytesIO()
+    save_to(buffer)
+    return {
+        "filename": f"{safe_name(stem)}_{datetime.now().strftime('%Y%m%d')}{extension}",
+        "content_type": content_type,
+        "content": buffer.getvalue(),
+    }
+
+
+def format_inr(value: Any) -> str:
+    """Jinja filter: ₹ amount with two decimals"""
+    try:
+        return f"₹{float(value):,.2f}"
+    except (TypeError, ValueError):
+        return "₹0.00"
+
+
+def xlsx_styles() -> List[NamedStyle]:
+    """Named styles available to xlsx templates as [name]"""
+    return [
+        NamedStyle(name="title", font=Font(bold=True, size=14)),
+        NamedStyle(
+            name="header",
+            font=Font(color="FFFFFF", bold=True, size=12),
+            fill=PatternFill(start_color="366092", end_color="366092", fill_type="solid"),
+            alignment=Alignment(horizontal='center', vertical='center'),
+        ),
+        NamedStyle(name="bold", font=Font(bold=True)),
+        NamedStyle(name="currency", number_format=CURRENCY_FORMAT),
+        NamedStyle(name="total", font=Font(bold=True), number_format=CURRENCY_FORMAT),
+        NamedStyle(name="grand_total_label", font=Font(bold=True, size=12)),
+        NamedStyle(name="grand_total", font=Font(bold=True, size=12), number_format=CURRENCY_FORMAT),
+    ]
+
+
+XLSX_STYLES = frozenset(style.name for style in xlsx_styles())
+
+
+def _directive(line: str) -> Tuple[str, str]:
+    name, _, value = line[1:].partition(" ")
+    return name, _text(value.strip())
+
+
+def build_docx(markup: str) -> Tuple[str, Document]:
+    """
+    Build a Word document from rendered docx markup
+
+    Args:
+        markup: Rendered template text
+
+    Returns:
+        (file name stem, python-docx Document)
+    """
+    doc = Document()
+    stem = "document"
+    table_style = None
+    table = None
+
+    for line in markup.split("\n"):
+        line = line.rstrip()
+        if line.startswith("|"):
+            cells = [_text(c.strip()) for c in line.strip("|").split("|")]
+            if table is None:
+                table = doc.add_table(rows=1, cols=len(cells))
+                if table_style:
+                    table.style = table_style
+                row_cells = table.rows[0].cells
+            else:
+                row_cells = table.add_row().cells
+            for cell, value in zip(row_cells, cells):
+                cell.text = value
+            continue
+        table = None
+
+        if line.startswith("@"):
+            name, value = _directive(line)
+            if name == "filename":
+                stem = value
+            elif name == "table-style":
+                table_style = value
+            elif name == "header":
+                header_para = doc.sections[0].header.paragraphs[0]
+                header_para.text = value
+                header_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+                if header_para.runs:
+                    header_para.runs[0].font.size = Pt(16)
+                    header_para.runs[0].font.bold = True
+            else:
+                raise ValueError(f"Unknown docx directive @{name}")
+        elif line.startswith("="):
+            level = len(line) - len(line.lstrip("="))
+            heading = doc.add_heading(_text(line[level:].strip()), level - 1)
+            if level == 1:
+                heading.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        elif line.startswith("- "):
+            doc.add_paragraph(_text(line[2:]), style='List Bullet')
+        elif not line:
+            doc.add_paragraph()
+        else:
+            paragraph = doc.add_paragraph()
+            for i, fragment in enumerate(line.split("**")):
+                if fragment:
+                    paragraph.add_run(_text(fragment)).bold = i % 2 == 1
+    return stem, doc
+
+
+def _xlsx_cell(ws, raw: str):
+    style = None
+    if raw.startswith("["):
+        style, _, raw = raw[1:].partition("]")
+        if style not in XLSX_STYLES:
+            raise ValueError(f"Unknown xlsx style [{style}]")
+
+    # Only a "=" written in the template itself starts a formula
+    formula = raw.startswith("=")
+    value: Any = _text(raw) or None
+    if value and not formula and _NUMBER.fullmatch(value):
+        value = float(value) if "." in value else int(value)
+    literal_equals = not formula and isinstance(value, str) and value.startswith("=")
+
+    if style is None and not literal_equals:
+        return value
+    cell = WriteOnlyCell(ws, value=value)
+    if style:
+        cell.style = style
+    if literal_equals:
+        cell.data_type = "s"
+    return cell
+
+
+def build_xlsx(markup: str) -> Tuple[str, openpyxl.Workbook]:
+    """
+    Build a workbook from rendered xlsx markup
+
+    Args:
+        markup: Rendered template text
+
+    Returns:
+        (file name stem, write-only openpyxl Workbook)
+    """
+    wb = openpyxl.Workbook(write_only=True)
+    for style in xlsx_styles():
+        wb.add_named_style(style)
+    stem = "document"
+    ws = None
+    sheet_title = "Sheet1"
+
+    for line in markup.split("\n"):
+        line = line.rstrip()
+        if line.startswith("@"):
+            name, value = _directive(line)
+            if name == "filename":
+                stem = value
+            elif name == "sheet":
+                sheet_title = value[:31]
+                ws = None
+            elif name == "widths":
+                if ws is None:
+                    ws = wb.create_sheet(sheet_title)
+                for index, width in enumerate(value.split()):
+                    ws.column_dimensions[get_column_letter(index + 1)].width = float(width)
+            else:
+                raise ValueError(f"Unknown xlsx directive @{name}")
+            continue
+        if ws is None:
+            ws = wb.create_sheet(sheet_title)
+        ws.append([_xlsx_cell(ws, c.strip()) for c in line.split("|")] if line else [])
+    if ws is None:
+        wb.create_sheet(sheet_title)
+    return stem, wb
+
+
+BACKENDS = {
+    "docx": (build_docx, ".docx", DOCX_CONTENT_TYPE),
+    "xlsx": (build_xlsx, ".xlsx", XLSX_CONTENT_TYPE),
+}
+
+
+class TemplateEngine:
+    """Compiled document templates, one per document type
+
+    The Jinja environment and every template in it are built once, when the
+    engine is created; templates are not re-read afterwards (restart, or
+    create a new engine, to pick up edits). ``version(kind)`` is a hash of
+    the template source, so render caches keyed on it drop stale documents
+    on their own when a template changes.
+    """
+
+    def __init__(self, templates_dir: Optional[str] = None):
+        self.templates_dir = templates_dir or os.getenv(
+            'DOCUMENT_TEMPLATES_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates'))
+        self.env = Environment(
+            loader=FileSystemLoader(self.templates_dir),
+            auto_reload=False,
+            trim_blocks=True,
+            lstrip_blocks=True,
+            keep_trailing_newline=False,
+            finalize=_escape,
+            # Missing company or tender fields render empty, like dict.get() did
+            undefined=ChainableUndefined,
+        )
+        self.env.filters["inr"] = format_inr
+        self._templates: Dict[str, Tuple[Template, str]] = {}
+        self._versions: Dict[str, str] = {}
+        for name in sorted(self.env.list_templates(extensions=["j2"])):
+            kind, _, rest = name.partition(".")
+            fmt = rest[:-len(".j2")]
+            if fmt not in BACKENDS or "/" in kind:
+                continue
+            source, _, _ = self.env.loader.get_source(self.env, name)
+            self._templates[kind] = (self.env.get_template(name), fmt)
+            self._versions[kind] = hashlib.sha1(source.encode("utf-8")).hexdigest()[:12]
+        logger.info(f"Compiled {len(self._templates)} document templates from {self.templates_dir}")
+
+    def kinds(self) -> List[str]:
+        """Document types with a template"""
+        return list(self._templates)
+
+    def has(self, kind: str) -> bool:
+        return kind in self._templates
+
+    def version(self, kind: str) -> str:
+        """Hash of a type's template source"""
+        return self._versions[kind]
+
+    def render(self, kind: str, context: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Render a document type
+
+        Args:
+            kind: Document type (template name without extensions)
+            context: Template variables; ``today`` is added
+
+        Returns:
+            Dictionary with filename, content_type and content (bytes)
+        """
+        template, fmt = self._templates[kind]
+        build, extension, content_type = BACKENDS[fmt]
+        markup = template.render(today=datetime.now().strftime('%d-%m-%Y'), **context)
+        stem, document = build(markup)
+        return rendered_document(stem, extension, content_type, document.save)
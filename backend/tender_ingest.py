@@ -0,0 +1,254 @@
+"""Tender Ingestion - Bulk upsert pipeline for tenders from any source"""
+import asyncio
+import csv
+import hashlib
+import io
+import json
+import logging
+import uuid
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Any, AsyncIterator, Dict, IO, Iterable, Iterator, List, Optional, Union
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from persistence import DATE_FIELDS, coerce_dates
+from threat_scoring import THREAT_FIELDS, annotate_threat
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 5000
+DUPLICATE_KEY_ERROR = 11000
+
+# Fields only written when a tender is first inserted
+INSERT_ONLY_FIELDS = ("id", "created_at")
+NUMERIC_FIELDS = ("estimated_value", "emd_amount")
+# Fields the Tender model requires; records missing any are rejected rather
+# than stored in a shape the API can't read back
+REQUIRED_FIELDS = ("tender_id", "title", "organization", "category", "location", "estimated_value",
+                   "published_date", "submission_deadline")
+TEXT_FIELDS = ("tender_id", "title", "organization", "description", "category", "location")
+# Bookkeeping fields that don't describe the tender itself
+UNHASHED_FIELDS = ("_id", "id", "created_at", "updated_at", "content_hash") + THREAT_FIELDS
+
+
+def normalize_tender(raw: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Normalize a raw tender record for storage
+
+    Args:
+        raw: Tender dict from the scraper, a CSV row or a JSON line
+
+    Returns:
+        Normalized tender, or None if a required field is missing or a date can't be parsed
+    """
+    tender = {k: v for k, v in raw.items() if k != "_id" and v is not None and v != ""}
+    for field in TEXT_FIELDS:
+        if field in tender:
+            tender[field] = str(tender[field]).strip()
+            if not tender[field]:
+                del tender[field]
+    if any(field not in tender for field in REQUIRED_FIELDS):
+        return None
+
+    for field in NUMERIC_FIELDS:
+        if field in tender:
+            try:
+                tender[field] = float(str(tender[field]).replace(",", "").replace("₹", ""))
+            except ValueError:
+                tender[field] = 0.0
+
+    # CSV cells carry lists as "a; b; c" and dicts as JSON
+    criteria = tender.get("eligibility_criteria")
+    if isinstance(criteria, str):
+        tender["eligibility_criteria"] = [c.strip() for c in criteria.split(";") if c.strip()]
+    specs = tender.get("technical_specs")
+    if isinstance(specs, str):
+        try:
+            tender["technical_specs"] = json.loads(specs)
+        except ValueError:
+            tender["technical_specs"] = {"notes": specs}
+
+    tender.setdefault("description", "")
+    tender.setdefault("emd_amount", 0.0)
+    tender.setdefault("status", "active")
+    tender.setdefault("source", "GeM")
+    coerce_dates(tender, DATE_FIELDS["tenders"])
+    if not all(isinstance(tender[field], datetime) for field in ("published_date", "submission_deadline")):
+        return None
+    return tender
+
+
+def tender_content_hash(tender: Dict[str, Any]) -> str:
+    """
+    Stable hash of a normalized tender's source fields
+
+    Args:
+        tender: Normalized tender
+
+    Returns:
+        Hex digest that changes only when the tender's content changes
+    """
+    content = {k: v for k, v in tender.items() if k not in UNHASHED_FIELDS}
+    payload = json.dumps(content, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def chunked(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Yield lists of at most ``size`` items"""
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+async def achunked(items: Union[Iterable[Any], AsyncIterator[Any]], size: int) -> AsyncIterator[List[Any]]:
+    """Like chunked(), but also accepts async iterables such as a live scrape"""
+    if not hasattr(items, "__aiter__"):
+        for chunk in chunked(items, size):
+            yield chunk
+        return
+    chunk = []
+    async for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+async def iter_in_thread(records: Iterable[Any], size: int = DEFAULT_BATCH_SIZE) -> AsyncIterator[Any]:
+    """Drain a blocking iterator (file reads, parsing) in a worker thread, ``size`` items at a time"""
+    iterator = iter(records)
+    while True:
+        chunk = await asyncio.to_thread(lambda: list(islice(iterator, size)))
+        if not chunk:
+            return
+        for item in chunk:
+            yield item
+
+
+def iter_csv(fileobj: IO[bytes]) -> Iterator[Dict[str, Any]]:
+    """Stream tender dicts from a CSV file with a header row"""
+    text = io.TextIOWrapper(fileobj, encoding="utf-8-sig", newline="")
+    yield from csv.DictReader(text)
+
+
+def iter_jsonl(fileobj: IO[bytes]) -> Iterator[Dict[str, Any]]:
+    """Stream tender dicts from a JSON-lines file"""
+    for line in io.TextIOWrapper(fileobj, encoding="utf-8"):
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def _upsert_operation(tender: Dict[str, Any], now: datetime) -> UpdateOne:
+    fields = {k: v for k, v in tender.items() if k not in INSERT_ONLY_FIELDS}
+    on_insert = {
+        "id": tender.get("id") or str(uuid.uuid4()),
+        "created_at": tender.get("created_at") or now,
+    }
+    return UpdateOne(
+        {"tender_id": tender["tender_id"]},
+        {"$set": fields, "$setOnInsert": on_insert},
+        upsert=True,
+    )
+
+
+async def _write_batch(collection, operations: List[UpdateOne], result: Dict[str, int]) -> None:
+    try:
+        bulk = await collection.bulk_write(operations, ordered=False)
+        details = bulk.bulk_api_result
+    except BulkWriteError as e:
+        details = e.details
+        # Two concurrent upserts of a new tender_id race on the unique index;
+        # the loser just needs to be replayed as an update
+        retry = [operations[err["index"]] for err in details.get("writeErrors", [])
+                 if err.get("code") == DUPLICATE_KEY_ERROR]
+        other_errors = len(details.get("writeErrors", [])) - len(retry)
+        result["errors"] += other_errors
+        if other_errors:
+            logger.error(f"Tender bulk upsert had {other_errors} failed writes")
+        if retry:
+            retried = await collection.bulk_write(retry, ordered=False)
+            result["updated"] += retried.modified_count
+            result["unchanged"] += retried.matched_count - retried.modified_count
+
+    result["inserted"] += details.get("nUpserted", 0)
+    result["updated"] += details.get("nModified", 0)
+    result["unchanged"] += details.get("nMatched", 0) - details.get("nModified", 0)
+
+
+async def _drop_unchanged(collection, unique: Dict[str, Dict[str, Any]]) -> int:
+    """Remove tenders whose stored content_hash matches; returns how many"""
+    stored = collection.find(
+        {"tender_id": {"$in": list(unique)}},
+        {"_id": 0, "tender_id": 1, "content_hash": 1},
+    )
+    dropped = 0
+    async for doc in stored:
+        tender = unique.get(doc["tender_id"])
+        if tender is not None and tender["content_hash"] == doc.get("content_hash"):
+            del unique[doc["tender_id"]]
+            dropped += 1
+    return dropped
+
+
+async def bulk_upsert_tenders(db, tenders: Union[Iterable[Dict[str, Any]], AsyncIterator[Dict[str, Any]]],
+                              batch_size: int = DEFAULT_BATCH_SIZE,
+                              skip_unchanged: bool = False, threat_model=None) -> Dict[str, int]:
+    """
+    Upsert tenders keyed on tender_id with unordered bulk writes
+
+    Records are normalized and de-duplicated in memory per batch (the last
+    occurrence of a tender_id wins), then written with a single unordered
+    ``bulk_write`` per batch. Existing tenders keep their ``id`` and
+    ``created_at``. Every written tender carries a ``content_hash`` of its
+    source fields; with ``skip_unchanged`` the stored hashes are read first
+    and tenders whose content hasn't changed are not written at all. With a
+    ``threat_model`` the written tenders are stamped with threat_score and
+    threat_level in one vectorized pass per batch.
+
+    Args:
+        db: Motor database
+        tenders: Any iterable or async iterable of raw tender dicts (scraper, CSV, JSON lines)
+        batch_size: Tenders per bulk_write
+        skip_unchanged: Skip writes for tenders whose content_hash matches
+        threat_model: Optional SimpleCompetitorModel for ingest-time threat scoring
+
+    Returns:
+        Counts of inserted, updated, unchanged, duplicate, invalid and errored records
+    """
+    result = {"received": 0, "inserted": 0, "updated": 0, "unchanged": 0,
+              "duplicates": 0, "invalid": 0, "errors": 0}
+    now = datetime.now(timezone.utc)
+
+    async for chunk in achunked(tenders, batch_size):
+        result["received"] += len(chunk)
+        unique: Dict[str, Dict[str, Any]] = {}
+        for raw in chunk:
+            tender = normalize_tender(raw)
+            if tender is None:
+                result["invalid"] += 1
+                continue
+            if tender["tender_id"] in unique:
+                result["duplicates"] += 1
+            tender["content_hash"] = tender_content_hash(tender)
+            unique[tender["tender_id"]] = tender
+
+        if unique and skip_unchanged:
+            result["unchanged"] += await _drop_unchanged(db.tenders, unique)
+
+        if unique and threat_model is not None:
+            annotate_threat(list(unique.values()), threat_model)
+
+        if unique:
+            operations = [_upsert_operation(t, now) for t in unique.values()]
+            await _write_batch(db.tenders, operations, result)
+
+    logger.info(f"Tender ingest: {result}")
+    return result
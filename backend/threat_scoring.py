@@ -0,0 +1,103 @@
+"""Threat Scoring - Competitor threat materialized on tender documents"""
+import logging
+from typing import Any, Dict, List, Optional
+
+from pymongo import UpdateOne
+
+from persistence import coerce_dates
+
+logger = logging.getLogger(__name__)
+
+# Derived fields written onto tenders; not part of a tender's content hash
+THREAT_FIELDS = ("threat_score", "threat_level", "threat_model_version")
+
+# Tender fields the competitor model reads
+THREAT_INPUT_PROJECTION = {
+    "_id": 0, "id": 1, "estimated_value": 1, "emd_amount": 1, "category": 1,
+    "location": 1, "published_date": 1, "submission_deadline": 1,
+}
+
+THREAT_LEVELS = ("Low", "Medium", "High")
+
+
+def threat_level(score: float) -> str:
+    """Same bands as SimpleCompetitorModel.predict, capitalized like CompetitorAnalysis.threat_level"""
+    if score >= 0.66:
+        return "High"
+    if score >= 0.4:
+        return "Medium"
+    return "Low"
+
+
+def annotate_threat(tenders: List[Dict[str, Any]], model) -> List[Dict[str, Any]]:
+    """
+    Set threat_score/threat_level on tenders in place
+
+    The score is the highest competitor threat for the tender, computed for
+    the whole list in one vectorized pass.
+
+    Args:
+        tenders: Normalized tenders (dates as datetimes)
+        model: SimpleCompetitorModel
+
+    Returns:
+        The same list
+    """
+    if not tenders:
+        return tenders
+    try:
+        scores = model.score_batch(model.featurize_batch(tenders)).max(axis=1).tolist()
+    except Exception as e:
+        # Scoring is an enrichment; never fail an ingest over it
+        logger.error(f"Threat scoring failed for {len(tenders)} tenders: {e}")
+        return tenders
+    for tender, score in zip(tenders, scores):
+        # Band the raw score, as predict does; rounding first would move
+        # scores just under a boundary (0.6596) into the band above
+        tender["threat_score"] = round(score, 3)
+        tender["threat_level"] = threat_level(score)
+        tender["threat_model_version"] = model.version
+    return tenders
+
+
+async def rescore_tenders(db, model, query: Optional[Dict[str, Any]] = None,
+                          batch_size: int = 1000) -> int:
+    """
+    Recompute threat fields for tenders scored by another model version
+
+    Args:
+        db: Motor database
+        model: SimpleCompetitorModel
+        query: Optional extra filter
+        batch_size: Tenders per bulk_write
+
+    Returns:
+        Number of tenders updated
+    """
+    stale = {"threat_model_version": {"$ne": model.version}}
+    cursor = db.tenders.find({"$and": [query, stale]} if query else stale, THREAT_INPUT_PROJECTION)
+    updated = 0
+    batch: List[Dict[str, Any]] = []
+
+    async def flush():
+        nonlocal updated
+        annotate_threat(batch, model)
+        operations = [
+            UpdateOne({"id": t["id"]}, {"$set": {f: t[f] for f in THREAT_FIELDS}})
+            for t in batch if "threat_score" in t
+        ]
+        if operations:
+            result = await db.tenders.bulk_write(operations, ordered=False)
+            updated += result.modified_count
+        batch.clear()
+
+    async for tender in cursor.batch_size(batch_size):
+        # Tenders not yet migrated may still hold ISO strings
+        batch.append(coerce_dates(tender, ("published_date", "submission_deadline")))
+        if len(batch) >= batch_size:
+            await flush()
+    if batch:
+        await flush()
+
+    logger.info(f"Rescored threat for {updated} tenders with model {model.version}")
+    return updated
@@ -0,0 +1,192 @@
+"""Train Win Model - Fit win-probability weights from past tender outcomes
+
+Labels come from two sources:
+
+* ``bid_outcomes``: outcomes recorded through the API for tenders we bid on
+  (``outcome`` is ``won`` or ``lost``)
+* ``tender_results``: scraped L1/L2/L3 results, for tenders where one of our
+  company names appears among the bidders (L1 = won)
+
+Recorded outcomes take precedence when a tender has both. Features are the
+tender's competitor-model features, fitted with NumPy logistic regression.
+The weights are written in the competitor_weights.json format for the win
+model registry to hot-reload, next to a calibration report measured on a
+held-out fifth of the tenders.
+
+Usage:
+    cd backend && python train_win_model.py --company "Acme Infra Pvt Ltd" [--output ai_models/win_weights.json]
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from ai_models.win_model import WinProbabilityModel, calibration_report, fit_logistic_regression
+from persistence import coerce_dates
+from threat_scoring import THREAT_INPUT_PROJECTION
+
+logger = logging.getLogger(__name__)
+
+TRAINING_PROJECTION = {**THREAT_INPUT_PROJECTION, "tender_id": 1}
+
+
+def _normalize_name(name: Optional[str]) -> str:
+    return " ".join((name or "").lower().split())
+
+
+def _in_holdout(tender_id: str, fraction: float) -> bool:
+    # Stable split so reruns on the same data report the same numbers
+    bucket = int(hashlib.sha1(tender_id.encode("utf-8")).hexdigest()[:8], 16) / 0xFFFFFFFF
+    return bucket < fraction
+
+
+async def load_training_set(db, company_names: Iterable[str]) -> List[Tuple[Dict[str, Any], int]]:
+    """
+    Collect (tender, label) pairs from recorded outcomes and scraped results
+
+    Args:
+        db: Motor database
+        company_names: Names our company bids under on GeM
+
+    Returns:
+        One (tender, 1 = won) pair per labeled tender
+    """
+    names = {_normalize_name(n) for n in company_names if n and n.strip()}
+    labels: Dict[str, int] = {}
+
+    if names:
+        # tender_results are keyed by the GeM bid number (tenders.tender_id)
+        by_bid_number: Dict[str, int] = {}
+        async for result in db.tender_results.find({}, {"_id": 0, "tender_id": 1, "l1_bidder": 1,
+                                                        "l2_bidder": 1, "l3_bidder": 1}):
+            bidders = [_normalize_name(result.get(k)) for k in ("l1_bidder", "l2_bidder", "l3_bidder")]
+            if names.intersection(bidders):
+                by_bid_number[result["tender_id"]] = int(bidders[0] in names)
+        bid_numbers = list(by_bid_number)
+        for start in range(0, len(bid_numbers), 1000):
+            chunk = bid_numbers[start:start + 1000]
+            async for tender in db.tenders.find({"tender_id": {"$in": chunk}}, {"_id": 0, "id": 1, "tender_id": 1}):
+                labels[tender["id"]] = by_bid_number[tender["tender_id"]]
+    from_results = len(labels)
+
+    async for outcome in db.bid_outcomes.find({}, {"_id": 0, "tender_id": 1, "outcome": 1}):
+        if outcome.get("outcome") in ("won", "lost"):
+            labels[outcome["tender_id"]] = int(outcome["outcome"] == "won")
+    logger.info(f"Labeled {len(labels)} tenders ({from_results} from tender_results, "
+                f"{len(labels) - from_results} more from bid_outcomes)")
+
+    samples = []
+    tender_ids = list(labels)
+    for start in range(0, len(tender_ids), 1000):
+        chunk = tender_ids[start:start + 1000]
+        async for tender in db.tenders.find({"id": {"$in": chunk}}, TRAINING_PROJECTION):
+            coerce_dates(tender, ("published_date", "submission_deadline"))
+            samples.append((tender, labels[tender["id"]]))
+    return samples
+
+
+def train(samples: List[Tuple[Dict[str, Any], int]], l2: float = 1.0,
+          holdout: float = 0.2) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Fit win-model weights and measure them on a held-out split
+
+    The report is computed from a fit on the training split; the returned
+    weights are then refitted on every sample.
+
+    Args:
+        samples: (tender, label) pairs
+        l2: Ridge penalty
+        holdout: Fraction of tenders held out for the report
+
+    Returns:
+        (weights file content, report)
+    """
+    featurizer = WinProbabilityModel()
+    tenders = [t for t, _ in samples]
+    features = featurizer.featurize_batch(tenders)
+    labels = np.array([y for _, y in samples], dtype=np.float64)
+    test = np.array([_in_holdout(t["id"], holdout) for t in tenders], dtype=bool)
+
+    report: Dict[str, Any] = {
+        "trained_at": datetime.now(timezone.utc).isoformat(),
+        "samples": len(samples),
+        "l2": l2,
+    }
+    if test.any() and (~test).any() and len(set(labels[~test].tolist())) == 2:
+        split_fit = fit_logistic_regression(features[~test], labels[~test], l2=l2)
+        split_model = WinProbabilityModel(weights=split_fit["weights"])
+        report["train"] = calibration_report(split_model.score_proba(features[~test]), labels[~test])
+        report["holdout"] = calibration_report(split_model.score_proba(features[test]), labels[test])
+
+    fit = fit_logistic_regression(features, labels, l2=l2)
+    weights = {**fit["weights"], "feature_means": fit["feature_means"]}
+    model = WinProbabilityModel(weights=dict(weights))
+    report.update({
+        "model_version": model.version,
+        "iterations": fit["iterations"],
+        "converged": fit["converged"],
+        "weights": fit["weights"],
+        "in_sample": calibration_report(model.score_proba(features), labels),
+    })
+    return weights, report
+
+
+def _write_json(path: Path, payload: Dict[str, Any]) -> None:
+    # The registry may read the file at any moment; never expose a partial write
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps(payload, indent=2))
+    os.replace(tmp, path)
+
+
+async def _main(args) -> int:
+    from dotenv import load_dotenv
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    load_dotenv(Path(__file__).parent / '.env')
+    client = AsyncIOMotorClient(os.environ['MONGO_URL'], tz_aware=True)
+    db = client[os.environ['DB_NAME']]
+    try:
+        companies = args.company or [n for n in os.getenv('OWN_COMPANY_NAMES', '').split(',') if n.strip()]
+        samples = await load_training_set(db, companies)
+    finally:
+        client.close()
+
+    wins = sum(y for _, y in samples)
+    if len(samples) < args.min_samples or wins == 0 or wins == len(samples):
+        logger.error(f"Not enough labeled tenders to train: {len(samples)} samples, {wins} wins "
+                     f"(need {args.min_samples} with both outcomes)")
+        return 1
+
+    weights, report = train(samples, l2=args.l2, holdout=args.holdout)
+    output = Path(args.output)
+    _write_json(output, weights)
+    _write_json(Path(args.report) if args.report else output.with_suffix(".report.json"), report)
+
+    holdout = report.get("holdout", {})
+    print(f"model {report['model_version']}: {len(samples)} tenders, {wins} wins")
+    print(f"holdout log loss {holdout.get('log_loss')} (baseline {holdout.get('baseline_log_loss')}), "
+          f"brier {holdout.get('brier')}, auc {holdout.get('auc')}, ece {holdout.get('ece')}")
+    print(f"weights written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fit win-probability weights from past tender outcomes")
+    parser.add_argument("--company", action="append",
+                        help="our company name as it appears in GeM results (repeatable; "
+                             "defaults to OWN_COMPANY_NAMES)")
+    parser.add_argument("--output", default=os.getenv(
+        'WIN_MODEL_WEIGHTS_PATH', str(Path(__file__).parent / 'ai_models' / 'win_weights.json')))
+    parser.add_argument("--report", help="calibration report path (defaults to <output>.report.json)")
+    parser.add_argument("--l2", type=float, default=1.0)
+    parser.add_argument("--holdout", type=float, default=0.2)
+    parser.add_argument("--min-samples", type=int, default=50)
+    logging.basicConfig(level=logging.INFO)
+    raise SystemExit(asyncio.run(_main(parser.parse_args())))